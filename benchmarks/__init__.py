@@ -0,0 +1 @@
+# Package marker for benchmarks (run with `python -m benchmarks.<modulo>`).
@@ -0,0 +1,64 @@
+"""
+Compara o client por teste (antigo) com o pool da sessão contra o stand-in local.
+
+Uso: python -m benchmarks.bench_api_pool --tests 200 --handshake-delay-ms 30
+`--handshake-delay-ms` simula o custo do TLS a cada conexão nova (0 = só TCP local).
+O custo por teste do modelo antigo inclui criar o SSLContext do httpx.Client (bundle de CAs),
+abrir a conexão e perdê-la no close(); o pool paga isso uma vez por sessão.
+"""
+import argparse
+import time
+
+import httpx
+
+from tests.utils.api_client import ApiClientPool
+from tests.utils.sf_stub import run_stub_server
+
+LIMITS_PATH = "/services/data/v61.0/limits"
+
+
+def _per_test_clients(base_url: str, tests: int, calls: int) -> None:
+    for _ in range(tests):
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            for _ in range(calls):
+                client.get(LIMITS_PATH)
+
+
+def _pooled_views(base_url: str, tests: int, calls: int) -> None:
+    pool = ApiClientPool(base_url=base_url, timeout=30.0)
+    try:
+        for _ in range(tests):
+            with pool.view(lambda req: None, lambda res: None) as client:
+                for _ in range(calls):
+                    client.get(LIMITS_PATH)
+    finally:
+        pool.close()
+
+
+def _run(label: str, runner, tests: int, calls: int, delay_ms: float) -> float:
+    with run_stub_server(handshake_delay_ms=delay_ms) as server:
+        start = time.perf_counter()
+        runner(server.base_url, tests, calls)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        connections = server.connections
+    print(
+        f"{label:<18} total={elapsed_ms:9.1f} ms  por teste={elapsed_ms / tests:7.3f} ms  "
+        f"conexoes={connections}"
+    )
+    return elapsed_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=200)
+    parser.add_argument("--calls-per-test", type=int, default=2)
+    parser.add_argument("--handshake-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    baseline = _run("client por teste", _per_test_clients, args.tests, args.calls_per_test, args.handshake_delay_ms)
+    pooled = _run("pool da sessao", _pooled_views, args.tests, args.calls_per_test, args.handshake_delay_ms)
+    print(f"economia por teste: {(baseline - pooled) / args.tests:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compara a sanitização antiga do conftest (3 passadas de regex no texto inteiro, depois corte;
+recursão) com o motor de tests/utils/sanitizer.py em payloads grandes e aninhados.
+
+Uso: python -m benchmarks.bench_sanitizer --records 2000 --text-kb 5120 --repeat 5
+"""
+import argparse
+import json
+import time
+from typing import Any
+
+from tests.utils.sanitizer import PII_PATTERNS, Sanitizer
+
+SENSITIVE_KEYS = {"password", "token", "authorization", "session", "secret"}
+MAX_PREVIEW_CHARS = 4000
+
+
+def _legacy_mask_text(value: str) -> str:
+    for pattern in PII_PATTERNS.values():
+        value = pattern.sub("[redacted]", value)
+    return value
+
+
+def _legacy_sanitize(data: Any) -> Any:
+    if data is None or isinstance(data, (bool, int, float)):
+        return data
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="replace")
+    if isinstance(data, str):
+        return _legacy_mask_text(data)[:MAX_PREVIEW_CHARS]
+    if isinstance(data, dict):
+        return {k: "[redacted]" if k.lower() in SENSITIVE_KEYS else _legacy_sanitize(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_legacy_sanitize(item) for item in data]
+    return _legacy_mask_text(str(data))[:MAX_PREVIEW_CHARS]
+
+
+def _nested_records(count: int) -> dict:
+    return {
+        "totalSize": count,
+        "records": [
+            {
+                "attributes": {"type": "Contact", "url": f"/services/data/v61.0/sobjects/Contact/003{i:015d}"},
+                "Id": f"003{i:015d}",
+                "Name": f"Contato {i}",
+                "Email": f"contato{i}@example.com.br",
+                "Phone": "(11) 98765-4321",
+                "Description": "Cliente com CPF 123.456.789-09 " * 4,
+                "Account": {"Name": "ACME", "Owner": {"Name": "Fulano", "token": "abc"}},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def _time(label: str, func, payload: Any, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    print(f"{label:<28} {elapsed_ms:10.2f} ms/chamada")
+    return elapsed_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--text-kb", type=int, default=5120, help="tamanho do body em texto (KB)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = Sanitizer(SENSITIVE_KEYS, max_chars=MAX_PREVIEW_CHARS)
+    nested = _nested_records(args.records)
+    text = json.dumps(nested)
+    text = (text * (args.text_kb * 1024 // len(text) + 1))[: args.text_kb * 1024]
+
+    print(f"payload aninhado: {args.records} registros | texto: {len(text) // 1024} KB")
+    for name, payload in (("aninhado", nested), ("texto grande", text)):
+        legacy = _time(f"{name} (antigo)", _legacy_sanitize, payload, args.repeat)
+        current = _time(f"{name} (motor unico)", engine.sanitize, payload, args.repeat)
+        print(f"{name}: {legacy / current:.1f}x mais rápido\n")
+
+
+if __name__ == "__main__":
+    main()
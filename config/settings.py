@@ -16,6 +16,49 @@ class Settings:
     sf_api_base_url: str
     sf_api_version: str
     headless: bool
+    api_http2: bool = False
+    api_max_connections: int = 10
+    api_fan_out_limit: int = 10
+    api_cache_enabled: bool = False
+    api_cache_ttl: float = 60.0
+    api_cache_max_entries: int = 256
+    api_cassette_mode: str = "passthrough"
+    api_cassette_path: str = "tests/cassettes/salesforce-api.jsonl"
+    api_throttle_enabled: bool = False
+    api_throttle_max_rps: float = 0.0
+    api_throttle_soft_limit: float = 0.8
+    api_throttle_hard_limit: float = 0.95
+    api_throttle_refresh_s: float = 60.0
+    api_timeout: float = 30.0
+    api_retry_max_attempts: int = 3
+    api_retry_backoff_base: float = 0.5
+    api_retry_backoff_max: float = 8.0
+    api_circuit_failures: int = 5
+    api_circuit_reset_s: float = 30.0
+    sf_oauth_flow: str = ""
+    sf_oauth_url: str = ""
+    sf_client_id: str = ""
+    sf_client_secret: str = ""
+    sf_jwt_key_file: str = ""
+    sf_oauth_token_ttl: float = 7200.0
+    sf_oauth_refresh_margin: float = 300.0
+    sf_oauth_cache_path: str = ".auth/sf-token.json"
+    auth_state_max_age: float = 7200.0
+    auth_state_refresh_margin: float = 600.0
+    sf_lightning_url: str = ""
+    ui_context_pool_size: int = 2
+    artifact_capture: str = "on-failure"
+    artifact_sample_rate: float = 0.1
+    screenshot_format: str = "jpeg"
+    screenshot_quality: int = 70
+    screenshot_max_width: int = 0
+    locator_cache_path: str = ".cache/locator-winners.json"
+    metadata_cache_dir: str = ".cache/sobject-metadata"
+    data_seed: str = ""
+    data_pool_batch_size: int = 4
+    data_pool_cache_dir: str = ""
+    data_registry_path: str = "test-results/data-registry.sqlite"
+    data_lease_ttl: float = 900.0
 
     @property
     def api_limits_endpoint(self) -> str:
@@ -32,4 +75,83 @@ def get_settings() -> Settings:
         sf_api_base_url=os.getenv("SF_API_BASE_URL", ""),
         sf_api_version=os.getenv("SF_API_VERSION", "v61.0"),
         headless=os.getenv("HEADLESS", "true").lower() == "true",
+        api_http2=os.getenv("API_HTTP2", "false").lower() == "true",
+        api_max_connections=int(os.getenv("API_MAX_CONNECTIONS", "10")),
+        api_fan_out_limit=int(os.getenv("API_FAN_OUT_LIMIT", "10")),
+        api_cache_enabled=(
+            os.getenv("API_CACHE_ENABLED", "false").lower() == "true"
+        ),
+        api_cache_ttl=float(os.getenv("API_CACHE_TTL", "60")),
+        api_cache_max_entries=int(os.getenv("API_CACHE_MAX_ENTRIES", "256")),
+        api_cassette_mode=(
+            os.getenv("API_CASSETTE_MODE", "passthrough").strip().lower()
+        ),
+        api_cassette_path=os.getenv(
+            "API_CASSETTE_PATH", "tests/cassettes/salesforce-api.jsonl"
+        ),
+        api_throttle_enabled=(
+            os.getenv("API_THROTTLE_ENABLED", "false").lower() == "true"
+        ),
+        api_throttle_max_rps=float(os.getenv("API_THROTTLE_MAX_RPS", "0")),
+        api_throttle_soft_limit=float(
+            os.getenv("API_THROTTLE_SOFT_LIMIT", "0.8")
+        ),
+        api_throttle_hard_limit=float(
+            os.getenv("API_THROTTLE_HARD_LIMIT", "0.95")
+        ),
+        api_throttle_refresh_s=float(
+            os.getenv("API_THROTTLE_REFRESH_S", "60")
+        ),
+        api_timeout=float(os.getenv("API_TIMEOUT", "30")),
+        api_retry_max_attempts=int(
+            os.getenv("API_RETRY_MAX_ATTEMPTS", "3")
+        ),
+        api_retry_backoff_base=float(
+            os.getenv("API_RETRY_BACKOFF_BASE", "0.5")
+        ),
+        api_retry_backoff_max=float(
+            os.getenv("API_RETRY_BACKOFF_MAX", "8")
+        ),
+        api_circuit_failures=int(os.getenv("API_CIRCUIT_FAILURES", "5")),
+        api_circuit_reset_s=float(os.getenv("API_CIRCUIT_RESET_S", "30")),
+        sf_oauth_flow=os.getenv("SF_OAUTH_FLOW", "").strip().lower(),
+        sf_oauth_url=os.getenv(
+            "SF_OAUTH_URL", os.getenv("SF_URL", "https://login.salesforce.com")
+        ),
+        sf_client_id=os.getenv("SF_CLIENT_ID", ""),
+        sf_client_secret=os.getenv("SF_CLIENT_SECRET", ""),
+        sf_jwt_key_file=os.getenv("SF_JWT_KEY_FILE", ""),
+        sf_oauth_token_ttl=float(os.getenv("SF_OAUTH_TOKEN_TTL", "7200")),
+        sf_oauth_refresh_margin=float(
+            os.getenv("SF_OAUTH_REFRESH_MARGIN", "300")
+        ),
+        sf_oauth_cache_path=os.getenv(
+            "SF_OAUTH_CACHE_PATH", ".auth/sf-token.json"
+        ),
+        auth_state_max_age=float(os.getenv("AUTH_STATE_MAX_AGE", "7200")),
+        auth_state_refresh_margin=float(
+            os.getenv("AUTH_STATE_REFRESH_MARGIN", "600")
+        ),
+        sf_lightning_url=os.getenv(
+            "SF_LIGHTNING_URL", os.getenv("SF_API_BASE_URL", "")
+        ),
+        ui_context_pool_size=int(os.getenv("UI_CONTEXT_POOL_SIZE", "2")),
+        artifact_capture=os.getenv("ARTIFACT_CAPTURE", "on-failure"),
+        artifact_sample_rate=float(os.getenv("ARTIFACT_SAMPLE_RATE", "0.1")),
+        screenshot_format=os.getenv("SCREENSHOT_FORMAT", "jpeg"),
+        screenshot_quality=int(os.getenv("SCREENSHOT_QUALITY", "70")),
+        screenshot_max_width=int(os.getenv("SCREENSHOT_MAX_WIDTH", "0")),
+        locator_cache_path=os.getenv(
+            "LOCATOR_CACHE_PATH", ".cache/locator-winners.json"
+        ),
+        metadata_cache_dir=os.getenv(
+            "METADATA_CACHE_DIR", ".cache/sobject-metadata"
+        ),
+        data_seed=os.getenv("DATA_SEED", "").strip(),
+        data_pool_batch_size=int(os.getenv("DATA_POOL_BATCH_SIZE", "4")),
+        data_pool_cache_dir=os.getenv("DATA_POOL_CACHE_DIR", ""),
+        data_registry_path=os.getenv(
+            "DATA_REGISTRY_PATH", "test-results/data-registry.sqlite"
+        ),
+        data_lease_ttl=float(os.getenv("DATA_LEASE_TTL", "900")),
     )
@@ -0,0 +1,24 @@
+import allure
+import pytest
+
+CORE_RESOURCES = ("limits", "sobjects", "recent", "tooling/sobjects")
+
+
+@allure.feature("API Contrato REST")
+@allure.story("Consultar recursos principais em paralelo")
+@allure.severity(allure.severity_level.NORMAL)
+@pytest.mark.api
+def test_core_resources_respond_concurrently(async_api_client, settings):
+    base = f"/services/data/{settings.sf_api_version}"
+
+    with allure.step("When consulto os recursos principais em paralelo"):
+        responses = async_api_client.run_fan_out(
+            [("GET", f"{base}/{resource}") for resource in CORE_RESOURCES]
+        )
+
+    with allure.step("Then todos devem responder 200"):
+        statuses = {
+            resource: response.status_code
+            for resource, response in zip(CORE_RESOURCES, responses)
+        }
+        assert all(status == 200 for status in statuses.values()), statuses
@@ -1,14 +1,21 @@
+import inspect
 import json
 import os
 import platform
+import random
 import re
 import shutil
 import subprocess
 import sys
 import time
+import warnings
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
 import allure
 import httpx
@@ -19,7 +26,28 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from tests.utils.api_cache import CachingTransport, ResponseCache
+from tests.utils.api_client import ApiClientPool, AsyncApiClient
+from tests.ui.playwright.context_pool import BrowserContextPool
+from tests.ui.playwright.locators import LocatorResolver, LocatorWinnerCache
+from tests.ui.playwright.waits import LightningWaits
+from tests.utils.artifacts import ArtifactPolicy, begin_trace, end_trace, finish_videos
+from tests.utils.auth_state import AuthStateBootstrap
+from tests.utils.cassette import AsyncCassetteTransport, Cassette, CassetteTransport
+from tests.utils.data_builder import RecordGraphBuilder
+from tests.utils.data_factory import DataFactory
+from tests.utils.data_registry import DataRegistry
+from tests.utils.event_sink import ApiEventSink
+from tests.utils.load import LoadConfig, LoadResult, run_load, summarize as summarize_load
 from tests.utils.logger import create_logger_for_test, setup_page_listeners
+from tests.utils.metrics import MetricStore
+from tests.utils.oauth import TOKEN_PATH, OAuthAuth, TokenProvider, client_credentials_form, fetch_token, jwt_bearer_form
+from tests.utils.record_locator import RecordLocator
+from tests.utils.retry import AsyncRetryTransport, CircuitBreaker, RetryPolicy, RetryTransport
+from tests.utils.sanitizer import Sanitizer
+from tests.utils.screenshots import ScreenshotService
+from tests.utils.sobject_metadata import SObjectMetadata
+from tests.utils.throttle import AdaptiveThrottle, AsyncThrottleTransport, ThrottleTransport
 
 #Garante que a raiz do projeto entra no PYTHONPATH. ssim o pytest consegue importar config.settings sem erro.
 ROOT_DIR = Path(__file__).resolve().parents[1]
@@ -36,8 +64,8 @@ REPORTS_DIR = Path("reports")
 API_LOG_DIR = REPORTS_DIR / "api-logs"
 AUTH_STATE_PATH = Path(__file__).resolve().parents[1] / "auth-state.json"
 HISTORY_DIR = ARTIFACT_ROOT / "history"
+REPLAY_BASE_URL = "https://replay.invalid"
 # chaves e headers que nunca podem aparecer (token, cookie, senha etc.).
-# regex para esconder PII (e-mail, telefone, CPF). Isso evita vazar dados em logs, relatórios e CI.
 SENSITIVE_HEADERS = {"authorization", "cookie", "set-cookie", "sf_token"}
 SENSITIVE_KEYS = {
     "password",
@@ -54,15 +82,24 @@ SENSITIVE_KEYS = {
     "refresh",
     "client_secret",
 }
-# regex para esconder PII (e-mail, telefone, CPF). Isso evita vazar dados em logs, relatórios e CI.
-PII_PATTERNS = {
-    "email": re.compile(r"[\w\.-]+@[\w\.-]+\.\w+", re.IGNORECASE),
-    "phone": re.compile(r"\+?\d{0,3}\s*\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4}"),
-    "cpf": re.compile(r"\b\d{3}\.?\d{3}\.?\d{3}-?\d{2}\b"),
-}
 CORRELATION_HEADERS = ("x-correlation-id", "x-request-id", "traceparent", "x-amzn-trace-id")
 MAX_PREVIEW_CHARS = 4000
-API_METRICS: List[Dict[str, Any]] = []
+# Regex de PII (e-mail, telefone, CPF) e percurso do body ficam em tests/utils/sanitizer.py.
+SANITIZER = Sanitizer(SENSITIVE_KEYS, SENSITIVE_HEADERS, redaction="[redacted]", max_chars=MAX_PREVIEW_CHARS)
+# Quantos eventos de API por teste ficam em memória para o resumo (o log completo vai para o .jsonl).
+API_LOG_TAIL_SIZE = int(os.environ.get("API_LOG_TAIL_SIZE", "50"))
+# Métricas agregadas por endpoint/classe de status (memória fixa, percentis por histograma).
+API_METRICS = MetricStore()
+# Resultados do modo carga (--load-duration), um por teste @pytest.mark.api.
+LOAD_RESULTS: List[LoadResult] = []
+# Com pytest-xdist cada worker grava aqui suas métricas; o controller junta tudo num relatório só.
+API_METRICS_SPOOL_DIR = REPORTS_DIR / ".api-metrics-spool"
+# Custo por teste da captura de trace/vídeo (ARTIFACT_CAPTURE), somado entre workers pelo mesmo spool.
+ARTIFACT_METRICS = MetricStore()
+# Esperas do fixture waits (orçamento x espera real), para o total de sleep removido em reports/ui-waits.json.
+UI_WAIT_METRICS = MetricStore()
+# Buscas do fixture locators: idas ao browser feitas x as do padrão antigo (count + is_visible por candidato).
+LOCATOR_METRICS = MetricStore()
 
 #transforma texto em nome “seguro” para arquivo.
 def _slugify(value: str) -> str:
@@ -80,40 +117,15 @@ def _safe_git_cmd(args: List[str]) -> str:
 
 #troca PII por [redacted].
 def _mask_text(value: str) -> str:
-    masked = value
-    for pattern in PII_PATTERNS.values():
-        masked = pattern.sub("[redacted]", masked)
-    return masked
+    return SANITIZER.mask_text(value)
 
 #limpa request/response antes de salvar.
 def _sanitize_body(data: Any) -> Any:
-    if data is None:
-        return None
-    if isinstance(data, (bool, int, float)):
-        return data
-    if isinstance(data, bytes):
-        data = data.decode("utf-8", errors="replace")
-    if isinstance(data, str):
-        return _mask_text(data)[:MAX_PREVIEW_CHARS]
-    if isinstance(data, dict):
-        return {
-            key: "[redacted]" if key.lower() in SENSITIVE_KEYS else _sanitize_body(value)
-            for key, value in data.items()
-        }
-    if isinstance(data, list):
-        return [_sanitize_body(item) for item in data]
-    return _mask_text(str(data))[:MAX_PREVIEW_CHARS]
+    return SANITIZER.sanitize(data)
 
 #limpa request/response antes de salvar.
 def _sanitize_headers(headers: httpx._types.HeaderTypes) -> Dict[str, str]:
-    clean: Dict[str, str] = {}
-    for key, value in headers.items():
-        key_lower = str(key).lower()
-        if key_lower in SENSITIVE_HEADERS:
-            clean[str(key)] = "[redacted]"
-        else:
-            clean[str(key)] = _mask_text(str(value))
-    return clean
+    return SANITIZER.sanitize_headers(headers)
 
 #tenta capturar IDs úteis (x-request-id etc.) para rastrear erros.
 def _extract_correlation_id(headers: Dict[str, str]) -> str:
@@ -122,18 +134,6 @@ def _extract_correlation_id(headers: Dict[str, str]) -> str:
             return f"{header}: {headers[header]}"
     return ""
 
-#métrica de performance
-def _percentile(values: List[float], percentile: float) -> Optional[float]:
-    if not values:
-        return None
-    values_sorted = sorted(values)
-    k = (len(values_sorted) - 1) * percentile
-    f = int(k)
-    c = min(f + 1, len(values_sorted) - 1)
-    if f == c:
-        return values_sorted[int(k)]
-    return values_sorted[f] + (values_sorted[c] - values_sorted[f]) * (k - f)
-
 #interpreta env var tipo true/1/yes.
 def _is_truthy(value: str) -> bool:
     return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
@@ -206,28 +206,39 @@ def allure_environment(browser_name, settings):
             file.write(f"{key}={value}\n")
 
 
-# Cria um httpx.Client com base_url e token.
-#   Usa event_hooks para capturar automaticamente:
+# Monta os hooks de request/response de um teste.
 #   request: método, URL, headers/body sanitizados, start_time
 #   response: status, tempo, headers/body sanitizados, tamanho, correlation id
-# Salva:
-#   logs por teste em reports/api-logs/<teste>.json
-#   métricas globais em API_METRICS para gerar resumo no final
-@pytest.fixture()
-def api_client(settings, request):
-    if not settings.sf_api_base_url or not settings.sf_token:
-        pytest.skip("Defina SF_API_BASE_URL e SF_TOKEN no .env para rodar testes de API.")
-
-    test_id = request.node.nodeid
-    events: List[Dict[str, Any]] = []
-
-    default_headers = {
-        "Authorization": f"Bearer {settings.sf_token}",
-        "Content-Type": "application/json",
-    }
+#   attempt: cada tentativa que a camada de retry vai repetir (status/erro, tempo, espera)
+# Os eventos vão para `events` (log por teste) e as métricas para API_METRICS.
+def _build_api_event_hooks(test_id: str, events: List[Dict[str, Any]]):
+    def _on_attempt(req: httpx.Request, attempt, response, error, elapsed_ms, retry_in_ms):
+        event = {
+            "type": "attempt",
+            "test": test_id,
+            "method": req.method,
+            "url": str(req.url),
+            "attempt": attempt,
+            "elapsed_ms": round(elapsed_ms, 2),
+            "retry_in_ms": round(retry_in_ms, 2),
+        }
+        size_bytes = 0
+        if response is not None:
+            size_bytes = len(response.content or b"")
+            event["status"] = response.status_code
+            event["body"] = _sanitize_body(response.text)
+        else:
+            event["error"] = _mask_text(f"{type(error).__name__}: {error}")
+        events.append(event)
+        # Status 0 = falha de rede/timeout (classe "error" nas métricas).
+        status = response.status_code if response is not None else 0
+        API_METRICS.record(req.method, req.url.path, status, elapsed_ms, size_bytes)
+        API_METRICS.increment("retry", "retried")
+        API_METRICS.observe("retry_backoff_ms", retry_in_ms)
 
     def _on_request(req: httpx.Request):
         req.extensions["start_time"] = time.perf_counter()
+        req.extensions["api_attempt_hook"] = _on_attempt
         events.append(
             {
                 "type": "request",
@@ -243,6 +254,8 @@ def api_client(settings, request):
         start = res.request.extensions.get("start_time")
         elapsed_ms = (time.perf_counter() - start) * 1000 if start else None
 
+        # Em conexões reais o hook roda antes do corpo ser lido.
+        res.read()
         try:
             body = res.json()
         except Exception:
@@ -266,35 +279,372 @@ def api_client(settings, request):
         }
         if correlation:
             event["correlation_id"] = correlation
+        cache_outcome = res.extensions.get("api_cache")
+        if cache_outcome:
+            event["cache"] = cache_outcome
+        throttle_wait_ms = res.extensions.get("throttle_wait_ms")
+        if throttle_wait_ms:
+            event["throttle_wait_ms"] = throttle_wait_ms
+        # elapsed_ms da resposta final inclui as tentativas anteriores e o backoff.
+        attempts = res.extensions.get("api_attempts", 1)
+        if attempts > 1:
+            event["attempts"] = attempts
 
         events.append(event)
-        API_METRICS.append(
-            {
-                "test": test_id,
-                "endpoint": res.request.url.path,
-                "method": res.request.method,
-                "status": res.status_code,
-                "elapsed_ms": elapsed_ms or 0.0,
-                "ok": res.is_success,
-                "size_bytes": size_bytes,
-                "correlation_id": correlation,
-            }
-        )
+        API_METRICS.record(res.request.method, res.request.url.path, res.status_code, elapsed_ms or 0.0, size_bytes)
+        if cache_outcome:
+            API_METRICS.increment("cache", cache_outcome)
+        if throttle_wait_ms is not None:
+            API_METRICS.observe("throttle_wait_ms", throttle_wait_ms)
+        if attempts > 1:
+            API_METRICS.increment("retry", "recovered" if res.status_code < 400 else "exhausted")
+
+    return _on_request, _on_response
+
+
+# Sink de eventos do teste (compartilhado se o teste usar os clients sync e async).
+# Grava reports/api-logs/<teste>.jsonl enquanto o teste roda; em memória fica só a cauda.
+def _api_events_for(node) -> ApiEventSink:
+    if not hasattr(node, "api_events"):
+        node.api_events = ApiEventSink(API_LOG_DIR / f"{_slugify(node.nodeid)}.jsonl", tail_size=API_LOG_TAIL_SIZE)
+    return node.api_events
 
-    client = httpx.Client(
-        base_url=settings.sf_api_base_url,
-        headers=default_headers,
-        timeout=30.0,
-        event_hooks={"request": [_on_request], "response": [_on_response]},
+
+# Cache opcional (API_CACHE_ENABLED=true) de GETs idempotentes como /limits, por sessão.
+# TTL + LRU + revalidação por ETag/Last-Modified; economiza chamadas da cota DailyApiRequests.
+@pytest.fixture(scope="session")
+def api_response_cache(settings):
+    if not settings.api_cache_enabled:
+        return None
+    return ResponseCache(ttl=settings.api_cache_ttl, max_entries=settings.api_cache_max_entries)
+
+
+# Cassette de gravação/reprodução da API, escolhido por API_CASSETTE_MODE=passthrough|record|replay.
+#   record: regrava API_CASSETTE_PATH com request/response já sanitizados (zerado uma vez, no pytest_configure)
+#   replay: responde só do cassette (testes de API offline, sem SF_TOKEN)
+@pytest.fixture(scope="session")
+def api_cassette(settings):
+    if settings.api_cassette_mode == "passthrough":
+        return None
+
+    cassette = Cassette(Path(settings.api_cassette_path), _sanitize_headers, _sanitize_body)
+    if settings.api_cassette_mode != "record":
+        cassette.load()
+    return cassette
+
+
+def _oauth_fetcher(settings):
+    token_url = f"{settings.sf_oauth_url.rstrip('/')}{TOKEN_PATH}"
+    if settings.sf_oauth_flow == "client_credentials":
+        form = partial(client_credentials_form, settings.sf_client_id, settings.sf_client_secret)
+    elif settings.sf_oauth_flow == "jwt":
+        private_key = Path(settings.sf_jwt_key_file).read_text(encoding="utf-8")
+        form = partial(jwt_bearer_form, settings.sf_client_id, settings.sf_username, settings.sf_oauth_url, private_key)
+    else:
+        raise pytest.UsageError(f"SF_OAUTH_FLOW={settings.sf_oauth_flow!r} inválido; use client_credentials ou jwt.")
+    return partial(fetch_token, token_url, form, ttl=settings.sf_oauth_token_ttl, timeout=settings.api_timeout)
+
+
+# Token OAuth (SF_OAUTH_FLOW=client_credentials|jwt) no lugar do SF_TOKEN estático.
+# Cache em disco (SF_OAUTH_CACHE_PATH) com lock entre processos: workers e execuções paralelas
+# reaproveitam o mesmo token; uma thread renova antes de expirar.
+@pytest.fixture(scope="session")
+def sf_token_provider(settings, api_cassette):
+    if not settings.sf_oauth_flow or (api_cassette is not None and settings.api_cassette_mode == "replay"):
+        yield None
+        return
+    provider = TokenProvider(
+        _oauth_fetcher(settings),
+        Path(settings.sf_oauth_cache_path),
+        refresh_margin=settings.sf_oauth_refresh_margin,
+    )
+    provider.token()
+    provider.start()
+    yield provider
+    provider.stop()
+
+
+# URL base, headers e auth dos clients de API.
+# Em replay não há org: usa uma URL/token fictícios, já que nada sai para a rede.
+# Com OAuth a URL vem do instance_url do token (SF_API_BASE_URL continua tendo prioridade).
+def _api_connection(settings, api_cassette, sf_token_provider):
+    headers = {"Content-Type": "application/json"}
+    if api_cassette is not None and settings.api_cassette_mode == "replay":
+        headers["Authorization"] = f"Bearer {settings.sf_token or 'replay'}"
+        return settings.sf_api_base_url or REPLAY_BASE_URL, headers, None
+    if sf_token_provider is not None:
+        base_url = settings.sf_api_base_url or sf_token_provider.token().instance_url
+        return base_url, headers, OAuthAuth(sf_token_provider)
+    if not settings.sf_api_base_url or not settings.sf_token:
+        return None
+    headers["Authorization"] = f"Bearer {settings.sf_token}"
+    return settings.sf_api_base_url, headers, None
+
+
+# Throttle adaptativo compartilhado pelos clients sync e async (API_THROTTLE_ENABLED=true).
+# Lê o uso da org no header Sforce-Limit-Info e em /limits; desacelera perto do limite diário.
+# No replay do cassette não há org do outro lado, então fica desligado.
+@pytest.fixture(scope="session")
+def api_throttle(settings, api_cassette):
+    if not settings.api_throttle_enabled or (api_cassette is not None and settings.api_cassette_mode == "replay"):
+        return None
+    return AdaptiveThrottle(
+        max_concurrency=max(settings.api_max_connections, settings.api_fan_out_limit),
+        max_rps=settings.api_throttle_max_rps,
+        soft_limit=settings.api_throttle_soft_limit,
+        hard_limit=settings.api_throttle_hard_limit,
+        refresh_interval=settings.api_throttle_refresh_s,
+    )
+
+
+# Retentativas com backoff + circuit breaker por endpoint, compartilhados pelos clients sync e async.
+# API_RETRY_MAX_ATTEMPTS=1 desliga as retentativas; o circuit breaker continua protegendo a suíte.
+# No replay do cassette a resposta gravada não muda, então não há o que retentar.
+@pytest.fixture(scope="session")
+def api_retry(settings, api_cassette):
+    if api_cassette is not None and settings.api_cassette_mode == "replay":
+        return None
+    policy = RetryPolicy(
+        max_attempts=max(1, settings.api_retry_max_attempts),
+        backoff_base=settings.api_retry_backoff_base,
+        backoff_max=settings.api_retry_backoff_max,
     )
-    request.node.api_events = events
+    breaker = None
+    if settings.api_circuit_failures > 0:
+        breaker = CircuitBreaker(settings.api_circuit_failures, settings.api_circuit_reset_s)
+    return policy, breaker
+
+
+def _limits_path(settings) -> str:
+    return f"/services/data/{settings.sf_api_version}/limits"
+
+
+# Um único httpx.Client por sessão (keep-alive; HTTP/2 com API_HTTP2=true).
+# Evita um handshake TCP+TLS com a instância a cada teste.
+@pytest.fixture(scope="session")
+def api_pool(settings, api_response_cache, api_cassette, api_throttle, api_retry, sf_token_provider):
+    connection = _api_connection(settings, api_cassette, sf_token_provider)
+    if connection is None:
+        yield None
+        return
+    base_url, headers, auth = connection
+
+    wrappers = []
+    if api_cassette is not None:
+        wrappers.append(lambda inner: CassetteTransport(inner, api_cassette, settings.api_cassette_mode))
+    if api_throttle is not None:
+        # Abaixo do cache: hits do cache não gastam orçamento nem esperam o throttle.
+        wrappers.append(lambda inner: ThrottleTransport(inner, api_throttle, _limits_path(settings)))
+    if api_retry is not None:
+        # Acima do throttle: cada tentativa passa pelo orçamento; hits do cache nunca retentam.
+        wrappers.append(lambda inner: RetryTransport(inner, *api_retry))
+    if api_response_cache is not None:
+        wrappers.append(lambda inner: CachingTransport(inner, api_response_cache))
+
+    pool = ApiClientPool(
+        base_url=base_url,
+        headers=headers,
+        auth=auth,
+        timeout=settings.api_timeout,
+        http2=settings.api_http2,
+        max_connections=settings.api_max_connections,
+        wrappers=wrappers,
+    )
+    yield pool
+    pool.close()
+
+
+# Visão por teste do pool da sessão, com captura própria de eventos.
+# Salva:
+#   logs por teste em reports/api-logs/<teste>.jsonl
+#   métricas globais em API_METRICS para gerar resumo no final
+# Com o marker no_api_cache o teste sempre vai à rede, mesmo com o cache ligado.
+@pytest.fixture()
+def api_client(api_pool, api_response_cache, request):
+    if api_pool is None:
+        pytest.skip("Defina SF_API_BASE_URL e SF_TOKEN (ou SF_OAUTH_FLOW) no .env para rodar testes de API.")
+
+    test_id = request.node.nodeid
+    events = _api_events_for(request.node)
+    on_request, on_response = _build_api_event_hooks(test_id, events)
+    bypass_cache = request.node.get_closest_marker("no_api_cache") is not None
+
+    with api_pool.view(on_request, on_response) as client:
+        if api_response_cache is None:
+            yield client
+        else:
+            with api_response_cache.bypassed(bypass_cache):
+                yield client
+
+    events.close()
+
+
+# Cria registros relacionados (Account -> Contact -> Opportunity) numa única chamada Composite Graph,
+# em vez de montar a massa clicando no modal do Lightning. Remove o que criou no teardown.
+# Retorna None sem SF_API_BASE_URL/SF_TOKEN, para o teste cair no fluxo antigo.
+@pytest.fixture()
+def record_builder(api_pool, settings, request):
+    if api_pool is None:
+        yield None
+        return
+
+    builder = RecordGraphBuilder(request.getfixturevalue("api_client"), settings.sf_api_version)
+    yield builder
+
+    try:
+        failures = builder.cleanup()
+    except Exception as exc:
+        failures = {"*": f"{type(exc).__name__}: {exc}"}
+    if failures:
+        leaked = ", ".join(f"{record_id} ({reason})" for record_id, reason in failures.items())
+        warnings.warn(f"record_builder não removeu da org: {leaked}", stacklevel=1)
+
+
+# Ids já resolvidos por nome ficam aqui durante a sessão inteira (ver record_locator).
+@pytest.fixture(scope="session")
+def record_id_cache():
+    return {}
+
+
+# Resolve nome -> Id com uma consulta SOQL, para o teste UI abrir /lightning/r/<Objeto>/<Id>/view direto
+# em vez de rolar ou pesquisar a list view. Retorna None sem API configurada (o teste usa a lista).
+@pytest.fixture()
+def record_locator(api_pool, settings, record_id_cache, request):
+    if api_pool is None:
+        return None
+    return RecordLocator(request.getfixturevalue("api_client"), settings.sf_api_version, cache=record_id_cache)
+
+
+# Describe/object-info já carregados na sessão; revalidados uma vez por sessão contra a cópia em disco.
+@pytest.fixture(scope="session")
+def sobject_metadata_memory():
+    return {}
+
+
+# Nomes de campos, picklists e obrigatórios vindos da API (cache em METADATA_CACHE_DIR, por org e versão),
+# sem raspar o DOM do modal. Retorna None sem API configurada.
+@pytest.fixture()
+def sobject_metadata(api_pool, settings, sobject_metadata_memory, request):
+    if api_pool is None:
+        return None
+    return SObjectMetadata(
+        request.getfixturevalue("api_client"),
+        settings.sf_api_version,
+        Path(settings.metadata_cache_dir),
+        memory=sobject_metadata_memory,
+    )
+
+
+# DATA_SEED fixa a massa da execução; sem ele, uma semente por execução, a mesma em todos os workers
+# do xdist (derivada do testrunuid), para os testes não repetirem nomes entre execuções.
+def _data_run_seed(config, settings) -> int:
+    if settings.data_seed:
+        try:
+            return int(settings.data_seed)
+        except ValueError:
+            raise pytest.UsageError(f"DATA_SEED={settings.data_seed!r} inválido; use um inteiro.") from None
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput and workerinput.get("testrunuid"):
+        return zlib.crc32(workerinput["testrunuid"].encode("utf-8"))
+    return random.SystemRandom().randrange(2 ** 31)
+
+
+# Massa Faker determinística por teste. Os primeiros lotes dos testes coletados que usam test_data
+# são gerados numa thread à parte logo no início da sessão, fora do tempo de cada teste.
+@pytest.fixture(scope="session")
+def data_factory(settings, request):
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="test-data")
+    factory = DataFactory(
+        _data_run_seed(request.config, settings),
+        batch_size=settings.data_pool_batch_size,
+        executor=executor,
+        cache_dir=Path(settings.data_pool_cache_dir) if settings.data_pool_cache_dir else None,
+    )
+    for item in request.session.items:
+        if "test_data" in getattr(item, "fixturenames", ()):
+            factory.prefetch(item.nodeid)
+    yield factory
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+# test_data.contact().as_form() no lugar de Faker("pt_BR") solto no módulo do teste.
+# A semente vai para o junit (propriedade data_seed) e para o log do teste, para reproduzir uma falha.
+@pytest.fixture()
+def test_data(data_factory, request):
+    stream = data_factory.stream(request.node.nodeid)
+    request.node.user_properties.append(("data_seed", data_factory.run_seed))
+    yield stream
+
+    logger = getattr(request.node, "_logger", None)
+    if logger:
+        logger.step("Massa de teste", stream.summary())
+    data_factory.release(stream.seed)
+
 
+# Registro SQLite (WAL) compartilhado por testes, workers e execuções; substitui o last_contact.json.
+# No fim, reports/data-registry.json traz o que está livre/emprestado por tipo e os órfãos para limpeza.
+@pytest.fixture(scope="session")
+def _data_registry_db(settings):
+    org = urlsplit(settings.sf_lightning_url or settings.sf_api_base_url).hostname or "-"
+    registry = DataRegistry(Path(settings.data_registry_path), org=org, lease_ttl=settings.data_lease_ttl)
+    yield registry
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    report_file = REPORTS_DIR / "data-registry.json"
+    # Com xdist cada worker grava o mesmo resumo; a troca atômica evita arquivo pela metade.
+    tmp_file = report_file.with_name(f"{report_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(registry.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_file, report_file)
+    registry.close()
+
+
+# data_registry.register("Contact", dados) ao criar; data_registry.lease("Contact") para pegar um registro
+# livre de outro teste. Empréstimos que o teste não devolveu voltam a ficar livres no teardown,
+# ou viram órfãos se o teste falhou (o registro pode ter ficado pela metade).
+@pytest.fixture()
+def data_registry(_data_registry_db, request):
+    registry = _data_registry_db.for_owner(f"{request.node.nodeid}@{os.getpid()}")
+    yield registry
+    registry.settle_owner(failed=_test_failed(request.node))
+
+
+# Mesmo contrato do api_client sobre httpx.AsyncClient, para checagens em paralelo:
+#   responses = async_api_client.run_fan_out([("GET", url1), ("GET", url2)], limit=5)
+# Hooks, sanitização, API_METRICS e formato do log por teste são os mesmos do fluxo síncrono.
+@pytest.fixture()
+def async_api_client(settings, api_cassette, api_throttle, api_retry, sf_token_provider, request):
+    connection = _api_connection(settings, api_cassette, sf_token_provider)
+    if connection is None:
+        pytest.skip("Defina SF_API_BASE_URL e SF_TOKEN (ou SF_OAUTH_FLOW) no .env para rodar testes de API.")
+    base_url, headers, auth = connection
+
+    test_id = request.node.nodeid
+    events = _api_events_for(request.node)
+    on_request, on_response = _build_api_event_hooks(test_id, events)
+
+    wrappers = []
+    if api_cassette is not None:
+        wrappers.append(lambda inner: AsyncCassetteTransport(inner, api_cassette, settings.api_cassette_mode))
+    if api_throttle is not None:
+        wrappers.append(lambda inner: AsyncThrottleTransport(inner, api_throttle, _limits_path(settings)))
+    if api_retry is not None:
+        wrappers.append(lambda inner: AsyncRetryTransport(inner, *api_retry))
+
+    client = AsyncApiClient(
+        base_url=base_url,
+        on_request=on_request,
+        on_response=on_response,
+        headers=headers,
+        auth=auth,
+        timeout=settings.api_timeout,
+        http2=settings.api_http2,
+        max_concurrency=settings.api_fan_out_limit,
+        wrappers=wrappers,
+    )
     yield client
 
     client.close()
-    if events:
-        log_file = API_LOG_DIR / f"{_slugify(test_id)}.json"
-        log_file.write_text(json.dumps(events, ensure_ascii=False, indent=2), encoding="utf-8")
+    events.close()
 
 
 #seta headless de acordo com .env.
@@ -304,72 +654,272 @@ def browser_type_launch_args(browser_type_launch_args, settings):
     launch_args.setdefault("headless", settings.headless)
     return launch_args
 
-#ativa gravação de vídeo em videos/.
+# ARTIFACT_CAPTURE=off|on-failure|sampled|always (padrão on-failure, como o retain-on-failure do pytest.ini).
+@pytest.fixture(scope="session")
+def artifact_policy(settings):
+    return ArtifactPolicy(settings.artifact_capture, settings.artifact_sample_rate)
+
+
+#ativa gravação de vídeo em videos/ (exceto com ARTIFACT_CAPTURE=off).
 @pytest.fixture(scope="session")
-def browser_context_args(browser_context_args):
+def browser_context_args(browser_context_args, artifact_policy):
+    if not artifact_policy.enabled:
+        return dict(browser_context_args)
     return {**browser_context_args, "record_video_dir": str(VIDEO_DIR)}
 
-#cria contexto e reutiliza auth-state.json se existir (evita refazer login/MFA).
-@pytest.fixture()
-def context(browser, browser_context_args, request):
+
+def _test_failed(node) -> bool:
+    return any(getattr(getattr(node, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
+
+# Login num contexto limpo e sem vídeo; devolve o storage state para o bootstrap gravar.
+def _login_storage_state(browser, settings) -> Dict[str, Any]:
+    from tests.ui.playwright.utils import login_with_credentials
+
+    login_context = browser.new_context()
+    try:
+        page = login_context.new_page()
+        login_with_credentials(page, settings.sf_url, settings.sf_username, settings.sf_password)
+        return login_context.storage_state()
+    finally:
+        login_context.close()
+
+
+# auth-state.json compartilhado por todos os processos (workers do xdist inclusive):
+# um só faz login sob o lock e grava o estado; os outros esperam e reaproveitam.
+# O estado é renovado quando o cookie de sessão está a menos de AUTH_STATE_REFRESH_MARGIN de vencer.
+# Sem SF_USERNAME/SF_PASSWORD fica None e o context usa o auth-state.json existente, se houver.
+@pytest.fixture(scope="session")
+def auth_state(browser, settings):
+    if not settings.sf_username or not settings.sf_password:
+        return None
+    return AuthStateBootstrap(
+        AUTH_STATE_PATH,
+        partial(_login_storage_state, browser, settings),
+        max_age=settings.auth_state_max_age,
+        refresh_margin=settings.auth_state_refresh_margin,
+    )
+
+
+def _authenticated_context_args(browser_context_args, bootstrap) -> Dict[str, Any]:
     context_args = dict(browser_context_args)
+    state_path = bootstrap.ensure() if bootstrap is not None else AUTH_STATE_PATH
+    if state_path.exists():
+        context_args["storage_state"] = str(state_path)
+    return context_args
 
-    # Reutiliza o estado autenticado salvo (gerado pelo teste de login) para manter a sessão.
-    if AUTH_STATE_PATH.exists():
-        context_args["storage_state"] = str(AUTH_STATE_PATH)
 
-    context = browser.new_context(**context_args)
-    yield context
+# Pool de contextos autenticados com o Lightning já carregado (UI_CONTEXT_POOL_SIZE=2; 0 desliga).
+# Precisa de sessão salva e de SF_LIGHTNING_URL (padrão: SF_API_BASE_URL) para abrir a home.
+# Grava reports/ui-context-pool.json com o tempo economizado por teste.
+@pytest.fixture(scope="session")
+def context_pool(browser, browser_context_args, settings, request):
+    if settings.ui_context_pool_size <= 0 or not settings.sf_lightning_url:
+        yield None
+        return
+    bootstrap = request.getfixturevalue("auth_state")
+    if "storage_state" not in _authenticated_context_args(browser_context_args, bootstrap):
+        yield None
+        return
 
-    recorded_videos = [page.video for page in context.pages if page.video]
-    context.close()
+    # Cada contexto novo relê o auth-state.json (que o bootstrap renova perto de expirar).
+    pool = BrowserContextPool(
+        lambda: browser.new_context(**_authenticated_context_args(browser_context_args, bootstrap)),
+        f"{settings.sf_lightning_url.rstrip('/')}/lightning/page/home",
+        size=settings.ui_context_pool_size,
+    )
+    pool.start()
+    yield pool
+    pool.close()
 
-    for index, video in enumerate(recorded_videos, start=1):
-        try:
-            video_path = Path(video.path())
-        except Exception:
-            continue
+    worker_id = _xdist_worker_id(request.config)
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    report_name = f"ui-context-pool-{worker_id}.json" if worker_id else "ui-context-pool.json"
+    (REPORTS_DIR / report_name).write_text(json.dumps(pool.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
 
-        if video_path.exists():
-            allure.attach.file(
-                str(video_path),
-                name=f"video-{index}",
-                attachment_type=allure.attachment_type.WEBM,
-            )
+
+#cria contexto com a sessão do auth-state.json (evita refazer login/MFA a cada teste).
+# Com o pool ligado o contexto vem emprestado, já com a home do Lightning aberta (request.node._warm_page).
+# Com o marker no_auth_state o contexto abre deslogado e fora do pool (ex.: o próprio teste de login).
+@pytest.fixture()
+def context(browser, browser_context_args, artifact_policy, request):
+    if request.node.get_closest_marker("no_auth_state") is not None:
+        pool = None
+        context = browser.new_context(**browser_context_args)
+    else:
+        pool = request.getfixturevalue("context_pool")
+        if pool is not None:
+            slot = pool.lease(request.node.nodeid)
+            context = slot.context
+            request.node._warm_page = slot.page
+            request.node._pool_lease = pool.records[-1]
+        else:
+            bootstrap = request.getfixturevalue("auth_state")
+            context = browser.new_context(**_authenticated_context_args(browser_context_args, bootstrap))
+    yield context
+
+    if pool is not None:
+        # Devolve ao pool: fecha as páginas (finalizando os vídeos) e já recarrega a home em segundo plano.
+        recorded_videos = pool.release(slot)
+    else:
+        recorded_videos = [page.video for page in context.pages if page.video]
+        context.close()
+
+    if not artifact_policy.enabled:
+        return
+    # O vídeo só fica pronto com a página fechada: anexa se a política mandar guardar, senão apaga o arquivo.
+    start = time.perf_counter()
+    keep = artifact_policy.keep(request.node.nodeid, _test_failed(request.node))
+    for index, video_path in enumerate(finish_videos(recorded_videos, keep), start=1):
+        allure.attach.file(
+            str(video_path),
+            name=f"video-{index}",
+            attachment_type=allure.attachment_type.WEBM,
+        )
+    ARTIFACT_METRICS.observe("video_ms", (time.perf_counter() - start) * 1000)
 
 
 @pytest.fixture()
-def page(context, request) -> Page:
+def page(context, artifact_policy, request) -> Page:
     test_slug = _slugify(request.node.nodeid)
-    # No fim do teste, para o trace e salva traces/<teste>.zip. Anexa o zip no Allure (ótimo para debug no Trace Viewer).
-    context.tracing.start(screenshots=True, snapshots=True, sources=False)
-    page = context.new_page()
+    # Cada teste grava um chunk do trace do contexto; no fim salva traces/<teste>.zip e anexa no Allure
+    # (ótimo para debug no Trace Viewer) só se a política mandar guardar. Senão o chunk é descartado.
+    capture_ms = 0.0
+    if artifact_policy.enabled:
+        start = time.perf_counter()
+        begin_trace(context)
+        capture_ms = (time.perf_counter() - start) * 1000
+    page = getattr(request.node, "_warm_page", None) or context.new_page()
     logger = create_logger_for_test(test_slug)
     request.node._logger = logger
     logger.step("Página criada", {"url": page.url})
+    lease = getattr(request.node, "_pool_lease", None)
+    if lease is not None:
+        logger.step("Contexto do pool", {"lease_ms": lease.lease_ms, "saved_ms": lease.saved_ms, "warm": lease.warm})
     setup_page_listeners(page, logger)
     yield page
 
-    trace_path = TRACE_DIR / f"{test_slug}.zip"
+    if not artifact_policy.enabled:
+        return
+    start = time.perf_counter()
+    keep = artifact_policy.keep(request.node.nodeid, _test_failed(request.node))
     try:
-        context.tracing.stop(path=str(trace_path))
+        trace_path = end_trace(context, TRACE_DIR / f"{test_slug}.zip" if keep else None)
     except Exception:
         trace_path = None
 
-    if trace_path and trace_path.exists():
+    if trace_path:
         allure.attach.file(
             str(trace_path),
             name="trace",
             attachment_type=allure.attachment_type.ZIP,
         )
+    capture_ms += (time.perf_counter() - start) * 1000
+    ARTIFACT_METRICS.observe("trace_ms", capture_ms)
+    ARTIFACT_METRICS.increment("artifacts", "kept" if keep else "discarded")
+    logger.step("Captura de artefatos", {"mode": artifact_policy.mode, "kept": keep, "trace_ms": round(capture_ms, 1)})
+
+
+# Uma thread de fundo por sessão para hash/encode/gravação dos screenshots de todos os testes.
+@pytest.fixture(scope="session")
+def _screenshot_executor():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshots")
+    yield executor
+    executor.shutdown(wait=True)
+
 
+# screenshots.capture(page, "nome") no lugar de allure.attach(page.screenshot(full_page=True), ...).
+# Os anexos entram no fim do teste (pytest_runtest_call), na ordem de captura, sem quadros repetidos.
+@pytest.fixture()
+def screenshots(_screenshot_executor, settings, request):
+    service = ScreenshotService(
+        SCREENSHOT_DIR,
+        _screenshot_executor,
+        image_format=settings.screenshot_format,
+        quality=settings.screenshot_quality,
+        max_width=settings.screenshot_max_width,
+        prefix=f"{_slugify(request.node.nodeid)}-",
+    )
+    request.node._screenshots = service
+    yield service
+
+    # Se a fase call nem rodou (erro no setup), o que ficou pendente é anexado aqui.
+    stats = service.flush()
+    if not stats.captured:
+        return
+    ARTIFACT_METRICS.observe("screenshot_capture_ms", stats.capture_ms / stats.captured)
+    for label in ("captured", "attached", "duplicates", "raw_bytes", "attached_bytes"):
+        ARTIFACT_METRICS.increment("screenshots", label, getattr(stats, label))
+    logger = getattr(request.node, "_logger", None)
+    if logger:
+        logger.step("Screenshots", {
+            "captured": stats.captured,
+            "attached": stats.attached,
+            "duplicates": stats.duplicates,
+            "attached_kb": round(stats.attached_bytes / 1024, 1),
+            "capture_ms": round(stats.capture_ms, 1),
+            "flush_wait_ms": round(stats.flush_wait_ms, 1),
+        })
+
+
+# waits.settle("rótulo", budget_ms=N) no lugar de page.wait_for_timeout(N): segue assim que o Lightning
+# assenta (sem XHR pendente, sem spinner, DOM parado) e nunca passa de N.
+@pytest.fixture()
+def waits(page, request):
+    engine = LightningWaits(page)
+    engine.install()
+    yield engine
 
-def _summarize_api_events(events: List[Dict[str, Any]]) -> str:
+    if not engine.records:
+        return
+    for record in engine.records:
+        UI_WAIT_METRICS.observe(record.label, record.waited_ms)
+        UI_WAIT_METRICS.increment("waits", "count")
+        UI_WAIT_METRICS.increment("waits", "budget_ms", round(record.budget_ms))
+        UI_WAIT_METRICS.increment("waits", "waited_ms", round(record.waited_ms))
+        UI_WAIT_METRICS.increment("waits", "sleep_removed_ms", round(record.saved_ms))
+        UI_WAIT_METRICS.increment("waits", "over_budget", int(not record.settled))
+    summary = engine.summary()
+    logger = getattr(request.node, "_logger", None)
+    if logger:
+        logger.step("Esperas", {key: value for key, value in summary.items() if key != "by_wait"})
+    allure.attach(json.dumps(summary, ensure_ascii=False, indent=2), name="waits", attachment_type=allure.attachment_type.JSON)
+
+
+# Vencedor de cada busca com fallback, por org e idioma, persistido entre execuções (LOCATOR_CACHE_PATH).
+@pytest.fixture(scope="session")
+def locator_cache(settings):
+    cache = LocatorWinnerCache(Path(settings.locator_cache_path))
+    yield cache
+    cache.save()
+
+
+# locators.resolve("busca", {"estrategia": locator, ...}) no lugar do laço count()/is_visible() por candidato.
+@pytest.fixture()
+def locators(page, locator_cache, request):
+    resolver = LocatorResolver(page, locator_cache)
+    yield resolver
+
+    if not resolver.records:
+        return
+    for record in resolver.records:
+        LOCATOR_METRICS.increment(record.lookup, "lookups")
+        LOCATOR_METRICS.increment(record.lookup, "cache_hits", int(record.cached))
+        LOCATOR_METRICS.increment(record.lookup, "round_trips", record.round_trips)
+        LOCATOR_METRICS.increment(record.lookup, "legacy_round_trips", record.legacy_round_trips)
+    summary = resolver.summary()
+    logger = getattr(request.node, "_logger", None)
+    if logger:
+        logger.step("Locators", {key: value for key, value in summary.items() if key != "by_lookup"})
+    allure.attach(json.dumps(summary, ensure_ascii=False, indent=2), name="locators", attachment_type=allure.attachment_type.JSON)
+
+
+def _summarize_api_events(events: ApiEventSink) -> str:
     responses = [evt for evt in events if evt["type"] == "response"]
     if not responses:
         return "Sem respostas registradas."
     last = responses[-1]
     parts = [
+        f"Eventos registrados: {len(events)}",
         f"Metodo: {last.get('method')}",
         f"URL: {last.get('url')}",
         f"Status: {last.get('status')}",
@@ -381,6 +931,55 @@ def _summarize_api_events(events: List[Dict[str, Any]]) -> str:
     return "\n".join(parts)
 
 
+# Modo carga: repete os testes @pytest.mark.api por --load-duration segundos cada.
+def pytest_addoption(parser):
+    group = parser.getgroup("load", "modo carga dos testes de API")
+    group.addoption("--load-duration", type=float, default=0.0, help="segundos de carga por teste @api (0 = desligado)")
+    group.addoption("--load-concurrency", type=int, default=1, help="workers simultâneos no modo carga")
+    group.addoption("--load-rps", type=float, default=0.0, help="iterações por segundo (open loop); 0 = closed loop")
+
+
+def _load_config(config) -> LoadConfig:
+    return LoadConfig(
+        duration=config.getoption("--load-duration"),
+        concurrency=config.getoption("--load-concurrency"),
+        rps=config.getoption("--load-rps"),
+    )
+
+
+# Roda o teste uma vez normalmente (falha aqui = teste falha) e depois o repete
+# com os mesmos fixtures em threads; requisições entram em API_METRICS como sempre.
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    load = _load_config(pyfuncitem.config)
+    if not load.enabled or pyfuncitem.get_closest_marker("api") is None:
+        return None
+
+    # Só os argumentos da função: funcargs também traz os fixtures autouse.
+    params = inspect.signature(pyfuncitem.obj).parameters
+    testargs = {arg: value for arg, value in pyfuncitem.funcargs.items() if arg in params}
+    scenario = partial(pyfuncitem.obj, **testargs)
+    scenario()
+    result = run_load(pyfuncitem.nodeid, scenario, load)
+    LOAD_RESULTS.append(result)
+    allure.attach(
+        json.dumps(result.summary(), ensure_ascii=False, indent=2),
+        name="load-summary",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    return True
+
+
+# Anexa os screenshots logo depois do corpo do teste, ainda dentro dele no Allure (fixture teardown
+# ficaria na seção de tear down).
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    service = getattr(item, "_screenshots", None)
+    if service is not None:
+        service.flush()
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -390,10 +989,12 @@ def pytest_runtest_makereport(item, call):
     if rep.when == "call":
         events = getattr(item, "api_events", None)
         if events:
-            allure.attach(
-                json.dumps(events, ensure_ascii=False, indent=2),
+            # O anexo sai do próprio .jsonl já gravado, sem serializar os eventos de novo.
+            events.flush()
+            allure.attach.file(
+                str(events.path),
                 name="api-request-response",
-                attachment_type=allure.attachment_type.JSON,
+                attachment_type=allure.attachment_type.TEXT,
             )
             allure.attach(
                 _summarize_api_events(events),
@@ -421,54 +1022,190 @@ def pytest_runtest_makereport(item, call):
                     pass
 
 
+# id do worker do pytest-xdist ("gw0", "gw1"...); None no processo principal/controller.
+def _xdist_worker_id(config) -> Optional[str]:
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+
+def pytest_configure(config):
+    # O controller limpa o spool antes dos workers subirem (nada de sobras de execuções anteriores).
+    if _xdist_worker_id(config) is None:
+        shutil.rmtree(API_METRICS_SPOOL_DIR, ignore_errors=True)
+        # Idem para o cassette em modo record: um worker que sobe depois não apaga o que os outros gravaram.
+        settings = get_settings()
+        if settings.api_cassette_mode == "record" and not config.option.collectonly:
+            Cassette(Path(settings.api_cassette_path), _sanitize_headers, _sanitize_body).reset()
+
+
+# Worker: grava histogramas/contadores (mescláveis) em <spool>/<worker>.json, de forma atômica.
+def _spool_worker_metrics(worker_id: str) -> None:
+    API_METRICS_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "metrics": API_METRICS.to_dict(),
+        "load": [result.to_dict() for result in LOAD_RESULTS],
+        "artifacts": ARTIFACT_METRICS.to_dict(),
+        "waits": UI_WAIT_METRICS.to_dict(),
+        "locators": LOCATOR_METRICS.to_dict(),
+    }
+    tmp_file = API_METRICS_SPOOL_DIR / f"{worker_id}.json.tmp"
+    tmp_file.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_file, API_METRICS_SPOOL_DIR / f"{worker_id}.json")
+
+
+# Controller: soma o que cada worker gravou em API_METRICS/LOAD_RESULTS e apaga o spool.
+def _merge_spooled_metrics() -> None:
+    for spool_file in sorted(API_METRICS_SPOOL_DIR.glob("*.json")):
+        data = json.loads(spool_file.read_text(encoding="utf-8"))
+        API_METRICS.merge(MetricStore.from_dict(data["metrics"]))
+        LOAD_RESULTS.extend(LoadResult.from_dict(item) for item in data.get("load", []))
+        ARTIFACT_METRICS.merge(MetricStore.from_dict(data.get("artifacts", {})))
+        UI_WAIT_METRICS.merge(MetricStore.from_dict(data.get("waits", {})))
+        LOCATOR_METRICS.merge(MetricStore.from_dict(data.get("locators", {})))
+    shutil.rmtree(API_METRICS_SPOOL_DIR, ignore_errors=True)
+
+
+# reports/artifact-capture.json: custo por teste da captura no modo da execução (rodar com cada
+# ARTIFACT_CAPTURE e comparar). trace_ms = start_chunk + stop_chunk/gravação do zip + anexo;
+# video_ms = anexar ou apagar o vídeo. A codificação do vídeo roda no browser e aparece só na duração dos testes.
+def _write_artifact_report() -> None:
+    settings = get_settings()
+    observations = {name: hist.summary() for name, hist in ARTIFACT_METRICS.observations.items()}
+    per_test = sum(observations[name]["avg_ms"] for name in ("trace_ms", "video_ms") if name in observations)
+    counts = ARTIFACT_METRICS.counters.get("artifacts", {})
+    report = {
+        "mode": settings.artifact_capture,
+        "sample_rate": settings.artifact_sample_rate,
+        "tests": counts.get("kept", 0) + counts.get("discarded", 0),
+        "kept": counts.get("kept", 0),
+        "discarded": counts.get("discarded", 0),
+        "avg_overhead_ms_per_test": round(per_test, 2),
+        **observations,
+    }
+    if "screenshots" in ARTIFACT_METRICS.counters:
+        report["screenshots"] = ARTIFACT_METRICS.counters["screenshots"]
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    (REPORTS_DIR / "artifact-capture.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+# reports/ui-waits.json: quanto do orçamento (os antigos sleeps fixos) as esperas realmente usaram.
+def _write_waits_report() -> None:
+    totals = UI_WAIT_METRICS.counters.get("waits", {})
+    report = {
+        "waits": totals.get("count", 0),
+        "budget_ms": totals.get("budget_ms", 0),
+        "waited_ms": totals.get("waited_ms", 0),
+        "sleep_removed_ms": totals.get("sleep_removed_ms", 0),
+        "over_budget": totals.get("over_budget", 0),
+        "by_label": {label: hist.summary() for label, hist in sorted(UI_WAIT_METRICS.observations.items())},
+    }
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    (REPORTS_DIR / "ui-waits.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+# reports/ui-locators.json: por busca, idas ao browser feitas x as do padrão antigo e quantas foram economizadas.
+def _write_locators_report() -> None:
+    by_lookup = {}
+    for lookup, counts in sorted(LOCATOR_METRICS.counters.items()):
+        by_lookup[lookup] = {**counts, "saved_round_trips": counts.get("legacy_round_trips", 0) - counts.get("round_trips", 0)}
+    report = {
+        "lookups": sum(item.get("lookups", 0) for item in by_lookup.values()),
+        "cache_hits": sum(item.get("cache_hits", 0) for item in by_lookup.values()),
+        "round_trips": sum(item.get("round_trips", 0) for item in by_lookup.values()),
+        "legacy_round_trips": sum(item.get("legacy_round_trips", 0) for item in by_lookup.values()),
+        "saved_round_trips": sum(item["saved_round_trips"] for item in by_lookup.values()),
+        "by_lookup": by_lookup,
+    }
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    (REPORTS_DIR / "ui-locators.json").write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
 @pytest.hookimpl(trylast=True)
-# gera reports/api-metrics.json com total, sucesso, falhas, taxa, p95 por endpoint
+# gera reports/api-metrics.json com total, sucesso, falhas, taxa, p50/p90/p95/p99 por endpoint e classe de status
 #gera reports/api-metrics.txt (resumido)
+# Com pytest-xdist só o controller gera relatórios e rotaciona o histórico; os workers entregam o spool.
 def pytest_sessionfinish(session, exitstatus):
-    if API_METRICS:
+    worker_id = _xdist_worker_id(session.config)
+    if worker_id is not None:
+        ui_metrics = ARTIFACT_METRICS.observations or UI_WAIT_METRICS.observations or LOCATOR_METRICS.counters
+        if len(API_METRICS) or LOAD_RESULTS or ui_metrics:
+            _spool_worker_metrics(worker_id)
+        return
+
+    _merge_spooled_metrics()
+    if ARTIFACT_METRICS.observations:
+        _write_artifact_report()
+    if UI_WAIT_METRICS.observations:
+        _write_waits_report()
+    if LOCATOR_METRICS.counters:
+        _write_locators_report()
+    if len(API_METRICS):
         REPORTS_DIR.mkdir(parents=True, exist_ok=True)
         metrics_file = REPORTS_DIR / "api-metrics.json"
 
-        total = len(API_METRICS)
-        success = sum(1 for m in API_METRICS if 200 <= m["status"] < 400)
-        fail = total - success
-
-        by_endpoint: Dict[str, Dict[str, Any]] = {}
-        for metric in API_METRICS:
-            key = f"{metric['method']} {metric['endpoint']}"
-            by_endpoint.setdefault(key, {"times": [], "statuses": []})
-            by_endpoint[key]["times"].append(metric["elapsed_ms"])
-            by_endpoint[key]["statuses"].append(metric["status"])
-
-        endpoint_summaries = []
-        for endpoint, data in by_endpoint.items():
-            endpoint_summaries.append(
-                {
-                    "endpoint": endpoint,
-                    "count": len(data["times"]),
-                    "avg_ms": round(sum(data["times"]) / len(data["times"]), 2),
-                    "p95_ms": round(_percentile(data["times"], 0.95) or 0, 2),
-                    "min_ms": round(min(data["times"]), 2),
-                    "max_ms": round(max(data["times"]), 2),
-                }
-            )
+        summary = API_METRICS.summary()
+        cache_counts = API_METRICS.counters.get("cache", {})
+        if cache_counts:
+            # hits não chegam à org, então não consomem DailyApiRequests.
+            summary["cache"] = {
+                "hit": cache_counts.get("hit", 0),
+                "miss": cache_counts.get("miss", 0),
+                "revalidated": cache_counts.get("revalidated", 0),
+                "bypass": cache_counts.get("bypass", 0),
+                "api_calls_saved": cache_counts.get("hit", 0),
+            }
 
-        summary = {
-            "total_requests": total,
-            "success": success,
-            "failed": fail,
-            "success_rate": round((success / total) * 100, 2) if total else 0,
-            "by_endpoint": endpoint_summaries,
-        }
+        retry_counts = API_METRICS.counters.get("retry", {})
+        if retry_counts:
+            backoff = summary.get("observations", {}).get("retry_backoff_ms", {})
+            summary["retry"] = {
+                "retried_attempts": retry_counts.get("retried", 0),
+                "recovered": retry_counts.get("recovered", 0),
+                "exhausted": retry_counts.get("exhausted", 0),
+                "backoff_total_ms": round(backoff.get("avg_ms", 0) * backoff.get("count", 0), 2),
+            }
+
+        if LOAD_RESULTS:
+            summary["load"] = summarize_load(LOAD_RESULTS)
 
         metrics_file.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
 
         txt_summary_lines = [
-            f"Total: {total}",
-            f"Sucesso: {success}",
-            f"Falha: {fail}",
+            f"Total: {summary['total_requests']}",
+            f"Sucesso: {summary['success']}",
+            f"Falha: {summary['failed']}",
             f"Taxa de sucesso: {summary['success_rate']}%",
         ]
+        if "cache" in summary:
+            txt_summary_lines.append(
+                f"Cache: {summary['cache']['hit']} hits, {summary['cache']['miss']} misses, "
+                f"{summary['cache']['revalidated']} revalidados"
+            )
+        throttle = summary.get("observations", {}).get("throttle_wait_ms")
+        if throttle:
+            txt_summary_lines.append(
+                f"Throttle: {throttle['count']} requisições, espera média {throttle['avg_ms']} ms, "
+                f"p95 {throttle['p95_ms']} ms, max {throttle['max_ms']} ms"
+            )
+        if "retry" in summary:
+            retry = summary["retry"]
+            txt_summary_lines.append(
+                f"Retentativas: {retry['retried_attempts']} tentativas repetidas, {retry['recovered']} recuperadas, "
+                f"{retry['exhausted']} esgotadas, {retry['backoff_total_ms']} ms em backoff"
+            )
+        if "load" in summary:
+            load = summary["load"]
+            txt_summary_lines.append(
+                f"Carga ({load['mode']} loop, {load['concurrency']} workers): {load['iterations']} iterações, "
+                f"{load['throughput_rps']} it/s, erro {load['error_rate']}%, "
+                f"p95 {load['latency']['p95_ms']} ms, p99 {load['latency']['p99_ms']} ms"
+            )
+        for endpoint in summary["by_endpoint"]:
+            txt_summary_lines.append(
+                f"{endpoint['endpoint']}: {endpoint['count']} chamadas, p50 {endpoint['p50_ms']} ms, "
+                f"p90 {endpoint['p90_ms']} ms, p95 {endpoint['p95_ms']} ms, p99 {endpoint['p99_ms']} ms, "
+                f"max {endpoint['max_ms']} ms"
+            )
         report_txt = REPORTS_DIR / "api-metrics.txt"
         report_txt.write_text("\n".join(txt_summary_lines), encoding="utf-8")
 
@@ -493,19 +1230,3 @@ def selenium_driver(settings):
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
     yield driver
     driver.quit()
-
-
-def pytest_collection_modifyitems(items):
-    """
-    Garante que o teste de login Playwright rode primeiro para (re)gerar o auth-state.json
-    antes dos demais cenários UI que reutilizam a sessão.
-    """
-    if not items:
-        return
-
-    login_indices = [i for i, item in enumerate(items) if "test_login_playwright.py::test_can_fill_login_form_with_env_credentials" in item.nodeid]
-    if not login_indices:
-        return
-
-    first_login_index = login_indices[0]
-    items.insert(0, items.pop(first_login_index))
@@ -0,0 +1,162 @@
+"""
+Pool de browser contexts autenticados e "quentes" (Lightning já carregado) por sessão.
+
+Cada teste UI pega um contexto emprestado (lease) em vez de criar um novo e abrir o Lightning a frio.
+Na devolução (release) o contexto é resetado: localStorage/sessionStorage limpos nas páginas do
+teste (ainda na origem da org), páginas fechadas, rotas e permissões limpas, cookies removidos
+(exceto os de sessão do Salesforce, SESSION_COOKIES), e uma página nova já começa a carregar a
+home em segundo plano. Com 2+ contextos, enquanto um teste roda o próximo contexto termina de
+carregar, então o teste seguinte recebe a página pronta.
+
+Tempo economizado por teste = custo a frio (medido no aquecimento inicial: new_context + home pronta)
+menos a espera no lease. O resumo vai para reports/ui-context-pool.json.
+"""
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, FrozenSet, List
+
+from playwright.sync_api import BrowserContext, Page
+
+# Casca do Lightning desenhada: barra de navegação do app ou header global.
+LIGHTNING_READY_SELECTOR = "one-appnav, .slds-global-header"
+# Cookies que mantêm o login (sessão, org, instância, dispositivo verificado); o resto é do teste.
+SESSION_COOKIES = frozenset(
+    {"sid", "sid_Client", "oid", "inst", "clientSrc", "disco", "BrowserId", "BrowserId_sec",
+     "__Secure-has-sid"}
+)
+CLEAR_STORAGE_SCRIPT = "() => { localStorage.clear(); sessionStorage.clear(); }"
+
+
+@dataclass
+class PooledContext:
+    context: BrowserContext
+    page: Page
+    leases: int = 0
+
+
+@dataclass
+class LeaseRecord:
+    test: str
+    lease_ms: float
+    saved_ms: float
+    warm: bool
+
+
+class BrowserContextPool:
+    def __init__(
+        self,
+        new_context: Callable[[], BrowserContext],
+        home_url: str,
+        size: int = 2,
+        ready_selector: str = LIGHTNING_READY_SELECTOR,
+        ready_timeout_ms: float = 60000,
+        session_cookies: FrozenSet[str] = SESSION_COOKIES,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.new_context = new_context
+        self.home_url = home_url
+        self.size = max(1, size)
+        self.ready_selector = ready_selector
+        self.ready_timeout_ms = ready_timeout_ms
+        self.session_cookies = session_cookies
+        self.records: List[LeaseRecord] = []
+        self.cold_samples: List[float] = []
+        self._clock = clock
+        self._idle: Deque[PooledContext] = deque()
+
+    def start(self) -> None:
+        # Aquece um por vez: é também a medição do custo a frio que o pool evita.
+        for _ in range(self.size):
+            self._idle.append(self._cold_start())
+
+    @property
+    def cold_ms(self) -> float:
+        return sum(self.cold_samples) / len(self.cold_samples) if self.cold_samples else 0.0
+
+    def _open_home(self, context: BrowserContext) -> Page:
+        page = context.new_page()
+        # Só espera o commit: o resto da carga corre no browser enquanto outro teste usa outro contexto.
+        page.goto(self.home_url, wait_until="commit")
+        return page
+
+    def _wait_ready(self, page: Page) -> None:
+        page.wait_for_selector(self.ready_selector, state="attached", timeout=self.ready_timeout_ms)
+
+    def _cold_start(self) -> PooledContext:
+        start = self._clock()
+        context = self.new_context()
+        page = self._open_home(context)
+        self._wait_ready(page)
+        self.cold_samples.append((self._clock() - start) * 1000)
+        return PooledContext(context, page)
+
+    def lease(self, test_id: str) -> PooledContext:
+        start = self._clock()
+        slot, warm = (self._idle.popleft(), True) if self._idle else (None, False)
+        if slot is not None:
+            try:
+                self._wait_ready(slot.page)
+            except Exception:
+                # A home não carregou em segundo plano (sessão caiu, aba travou): recomeça a frio.
+                self._discard(slot)
+                slot, warm = None, False
+        if slot is None:
+            slot = self._cold_start()
+        lease_ms = (self._clock() - start) * 1000
+        saved_ms = max(0.0, self.cold_ms - lease_ms) if warm else 0.0
+        self.records.append(LeaseRecord(test_id, round(lease_ms, 1), round(saved_ms, 1), warm))
+        slot.leases += 1
+        return slot
+
+    def release(self, slot: PooledContext) -> List[Any]:
+        """Reseta o contexto, devolve ao fim da fila e retorna os vídeos das páginas fechadas."""
+        videos = [page.video for page in slot.context.pages if page.video]
+        try:
+            for page in list(slot.context.pages):
+                self._clear_storage(page)
+                page.close()
+            slot.context.unroute_all(behavior="ignoreErrors")
+            slot.context.clear_permissions()
+            slot.context.set_extra_http_headers({})
+            cookies = slot.context.cookies()
+            session = [cookie for cookie in cookies if cookie["name"] in self.session_cookies]
+            slot.context.clear_cookies()
+            slot.context.add_cookies(session)
+            slot.page = self._open_home(slot.context)
+        except Exception:
+            # Contexto quebrado (ex.: browser crashou a aba): descarta e repõe com um novo.
+            self._discard(slot)
+            slot = self._cold_start()
+        self._idle.append(slot)
+        return videos
+
+    @staticmethod
+    def _clear_storage(page: Page) -> None:
+        # Por página: aba em about:blank ou no meio de uma navegação não derruba o contexto.
+        try:
+            page.evaluate(CLEAR_STORAGE_SCRIPT)
+        except Exception:
+            pass
+
+    def _discard(self, slot: PooledContext) -> None:
+        try:
+            slot.context.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        while self._idle:
+            self._discard(self._idle.popleft())
+
+    def summary(self) -> Dict[str, Any]:
+        warm = [record for record in self.records if record.warm]
+        return {
+            "size": self.size,
+            "cold_start_ms": round(self.cold_ms, 1),
+            "tests": len(self.records),
+            "warm_leases": len(warm),
+            "avg_lease_ms": round(sum(r.lease_ms for r in warm) / len(warm), 1) if warm else None,
+            "saved_ms_total": round(sum(r.saved_ms for r in self.records), 1),
+            "by_test": [asdict(record) for record in self.records],
+        }
@@ -0,0 +1,170 @@
+"""
+Resolução de locators com candidatos de fallback que lembra qual candidato funcionou.
+
+Os testes do Lightning procuram o mesmo elemento por vários caminhos (data-target-selection-name,
+title traduzido, papel acessível...), porque o DOM muda por org, idioma e release. O padrão antigo era
+count() + is_visible() em cada candidato, em ordem: até duas idas ao browser por candidato.
+
+    edit = locators.resolve("contato.editar", {
+        "record-edit": page.locator("[data-target-selection-name='standard__recordPage-RecordEdit']"),
+        "title-editar": page.locator("button[title='Editar']"),
+    })
+
+  - Com vencedor conhecido para (org, idioma, busca): uma verificação só do vencedor.
+  - Sem vencedor (ou ele sumiu): uma espera única pela união dos candidatos (Locator.or_), feita
+    no browser, e depois a identificação de qual candidato casou, na ordem de prioridade.
+
+Os locators do Playwright (get_by_role, get_by_label...) não podem ser avaliados por JS da página,
+então a identificação do vencedor é por candidato, mas só na primeira vez: o vencedor vai para um
+cache em disco (LOCATOR_CACHE_PATH), compartilhado entre execuções e workers.
+
+Cada busca registra as idas ao browser feitas e as que o padrão antigo faria (estimadas em duas por
+candidato testado até o vencedor).
+"""
+import json
+import os
+from dataclasses import asdict, dataclass
+from functools import reduce
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Locator, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+from tests.utils.filelock import FileLock
+
+LOCATOR_STATES = ("visible", "attached")
+
+
+@dataclass
+class LookupRecord:
+    lookup: str
+    winner: Optional[str]
+    cached: bool
+    round_trips: int
+    legacy_round_trips: int
+
+    @property
+    def saved_round_trips(self) -> int:
+        return self.legacy_round_trips - self.round_trips
+
+
+class LocatorWinnerCache:
+    """Vencedores por "<org>|<idioma>|<busca>" num JSON; save() mescla com o que outros processos gravaram."""
+
+    def __init__(self, path: Path, lock_timeout: float = 30.0) -> None:
+        self.path = path
+        self.lock_timeout = lock_timeout
+        self.winners: Dict[str, str] = self._read()
+        self._updates: Dict[str, str] = {}
+
+    def _read(self) -> Dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self.winners.get(key)
+
+    def put(self, key: str, winner: str) -> None:
+        if self.winners.get(key) != winner:
+            self.winners[key] = winner
+            self._updates[key] = winner
+
+    def save(self) -> None:
+        if not self._updates:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.path.with_name(f"{self.path.name}.lock"), timeout=self.lock_timeout):
+            merged = {**self._read(), **self._updates}
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(merged, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        self.winners.update(merged)
+        self._updates = {}
+
+
+class LocatorResolver:
+    def __init__(self, page: Page, cache: LocatorWinnerCache) -> None:
+        self.page = page
+        self.cache = cache
+        self.records: List[LookupRecord] = []
+        self._locale: Optional[str] = None
+
+    def _scope(self) -> str:
+        # Org pelo host da página; idioma pelo lang do documento (uma ida ao browser por teste).
+        if self._locale is None:
+            try:
+                self._locale = self.page.evaluate("() => document.documentElement.lang || navigator.language") or "-"
+            except PlaywrightError:
+                self._locale = "-"
+        return f"{urlsplit(self.page.url).hostname or '-'}|{self._locale}"
+
+    @staticmethod
+    def _narrow(locator: Locator, state: str) -> Locator:
+        return locator.filter(visible=True) if state == "visible" else locator
+
+    def _present(self, locator: Locator, state: str) -> bool:
+        try:
+            return self._narrow(locator, state).count() > 0
+        except PlaywrightError:
+            return False
+
+    def resolve(
+        self,
+        lookup: str,
+        candidates: Dict[str, Locator],
+        state: str = "visible",
+        timeout_ms: float = 5000,
+    ) -> Optional[Locator]:
+        """Primeiro candidato (na ordem do dict) visível/presente; None se nenhum aparecer em `timeout_ms`."""
+        if state not in LOCATOR_STATES:
+            raise ValueError(f"state={state!r} inválido; use um de {', '.join(LOCATOR_STATES)}.")
+        names = list(candidates)
+        key = f"{self._scope()}|{lookup}"
+        trips = 0
+
+        cached = self.cache.get(key)
+        if cached in candidates:
+            trips += 1
+            if self._present(candidates[cached], state):
+                return self._found(lookup, names, cached, True, trips, candidates[cached], state)
+
+        union = self._narrow(reduce(lambda combined, locator: combined.or_(locator), candidates.values()), state).first
+        trips += 1
+        try:
+            union.wait_for(state=state, timeout=timeout_ms)
+        except PlaywrightTimeout:
+            self.records.append(LookupRecord(lookup, None, False, trips, 2 * len(names)))
+            return None
+        for name in names:
+            trips += 1
+            if self._present(candidates[name], state):
+                self.cache.put(key, name)
+                return self._found(lookup, names, name, False, trips, candidates[name], state)
+        # A união casou mas o elemento sumiu antes da identificação: devolve a união, sem cache.
+        self.records.append(LookupRecord(lookup, None, False, trips, 2 * len(names)))
+        return union
+
+    def _found(
+        self, lookup: str, names: List[str], winner: str, cached: bool, trips: int, locator: Locator, state: str
+    ) -> Locator:
+        legacy = 2 * (names.index(winner) + 1)
+        self.records.append(LookupRecord(lookup, winner, cached, trips, legacy))
+        return self._narrow(locator, state).first
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "lookups": len(self.records),
+            # + 1 ida por teste para ler o idioma da página (chave do cache).
+            "scope_round_trips": int(self._locale is not None),
+            "cache_hits": sum(1 for r in self.records if r.cached),
+            "round_trips": sum(r.round_trips for r in self.records),
+            "legacy_round_trips": sum(r.legacy_round_trips for r in self.records),
+            "saved_round_trips": sum(r.saved_round_trips for r in self.records),
+            "by_lookup": [{**asdict(r), "saved_round_trips": r.saved_round_trips} for r in self.records],
+        }
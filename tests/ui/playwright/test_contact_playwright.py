@@ -2,67 +2,177 @@ import json
 import re
 import allure
 import pytest
-from pathlib import Path
-from faker import Faker
+from dataclasses import asdict
 from playwright.sync_api import Page, expect, TimeoutError as PlaywrightTimeout
-from typing import Optional, Any
+from typing import Optional, Any, Tuple
 
+from tests.utils.data_registry import RegistryRecord
+from tests.utils.record_locator import RecordLocator
 from tests.ui.playwright.utils import (
     attach_fields_snapshot,
     extractCreateContactFields,
-    fillContactFieldByApi,
+    fill_record_form,
+    goto_lightning,
 )
 
-fake = Faker("pt_BR")
-LAST_CONTACT_PATH = Path("test-results/last_contact.json")
+LIGHTNING_BASE_URL = "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com"
+CONTACT_LIST_URL = f"{LIGHTNING_BASE_URL}/lightning/o/Contact/list?filterName=Recent"
+
+
+def _build_contact_data(test_data) -> dict:
+    # Massa determinística por teste (tests/utils/data_factory.py), já gerada em segundo plano.
+    return test_data.contact().as_form()
+
+
+def _seed_contact(record_builder, test_data) -> Optional[dict]:
+    """Cria Account + Contact via Composite Graph; None se a API não estiver configurada."""
+    if record_builder is None:
+        return None
+    contact = _build_contact_data(test_data)
+    record_builder.add_account_contact_opportunity(
+        {"Name": f"{contact['lastName']} Ltda"},
+        contact,
+    )
+    ids = record_builder.build()
+    return {
+        "id": ids["contact"],
+        "firstName": contact["firstName"],
+        "lastName": contact["lastName"],
+        "fullName": f'{contact["firstName"]} {contact["lastName"]}',
+        "editCount": 0,
+    }
+
+
+def _search_list(page: Page, waits, locators, text: str) -> bool:
+    """Digita `text` na busca da list view; False se o campo de busca não aparecer."""
+    # Campo de busca pode estar traduzido; tentamos variações comuns.
+    search_box = locators.resolve("lista.busca", {
+        "placeholder-pt": page.get_by_placeholder("Pesquisar esta lista...", exact=False),
+        "placeholder-en": page.get_by_placeholder("Search this list...", exact=False),
+        "input-search": page.locator("input[type='search']"),
+    })
+    if search_box is None:
+        return False
+
+    search_box.fill(text)
+    search_box.press("Enter")
+    waits.settle("busca-lista", budget_ms=7000)
+    return True
+
+
+def _seed_or_lease_contact(record_builder, test_data, data_registry) -> Tuple[dict, Optional[RegistryRecord]]:
+    """Massa via API quando configurada; sem ela, empresta um contato cadastrado pelo cenário de criação."""
+    contact_data = _seed_contact(record_builder, test_data)
+    if contact_data is not None:
+        return contact_data, None
+    lease = data_registry.lease("Contact")
+    if lease is None:
+        pytest.skip("Nenhum contato livre no registro de massa. Execute o cenário de criação de contato primeiro.")
+    return lease.data, lease
+
+
+def _open_contact_from_list(page: Page, waits, screenshots, locators, full_name: str) -> None:
+    with allure.step("Given estou na lista de contatos autenticado"):
+        goto_lightning(page, CONTACT_LIST_URL, timeout=90000)
+        expect(page).to_have_url(re.compile("Contact/list"), timeout=30000)
+        waits.settle("lista-contatos", budget_ms=7000)
+        screenshots.capture(page, "lista-contatos")
+
+    with allure.step("When abro o contato salvo pela lista"):
+        row = page.locator("tbody tr").filter(has_text=full_name).first
+        if row.count() == 0 or not row.is_visible():
+            _search_list(page, waits, locators, full_name)
+            row = page.locator("tbody tr").filter(has_text=full_name).first
+
+        if row.count() == 0 or not row.is_visible():
+            pytest.skip("Contato não encontrado na lista mesmo após buscar.")
+
+        try:
+            row.scroll_into_view_if_needed(timeout=3000)
+        except Exception:
+            pass
+
+        # abre o registro clicando no link do nome
+        open_link = locators.resolve("lista.link-registro", {
+            "role-link": row.get_by_role("link", name=full_name, exact=True),
+            "refid": row.locator("a[data-refid='recordId']"),
+            "link-texto": row.locator("a").filter(has_text=full_name),
+        }, state="attached", timeout_ms=3000)
+        if open_link is None:
+            pytest.skip("Link do contato não encontrado na lista.")
+
+        open_link.click()
+        page.wait_for_url("**/lightning/r/Contact/**", timeout=20000)
+        page.wait_for_load_state("domcontentloaded")
+        waits.settle("detalhe-contato", budget_ms=5500)
+        screenshots.capture(page, "detalhe-contato")
+
+
+def _open_record_by_id(page: Page, waits, screenshots, sobject: str, record_id: str, label: str) -> bool:
+    """Abre /lightning/r/<Objeto>/<Id>/view direto; False se o registro não carregar (ex.: já excluído)."""
+    goto_lightning(page, RecordLocator.record_url(LIGHTNING_BASE_URL, sobject, record_id), timeout=90000)
+    try:
+        page.wait_for_url(f"**/lightning/r/{sobject}/{record_id}/**", timeout=20000)
+        expect(page.locator("lightning-formatted-name").first).to_be_visible(timeout=15000)
+    except Exception:
+        return False
+    waits.settle(label, budget_ms=5500)
+    screenshots.capture(page, label)
+    return True
+
+
+def _open_contact(
+    page: Page, waits, screenshots, locators, record_locator, contact_data: dict, full_name: str
+) -> Optional[str]:
+    """
+    Abre a página do contato: pelo Id (da massa criada via API ou resolvido por SOQL) direto na URL
+    do registro; sem Id, ou se a página não carregar, pela list view (rolagem/busca).
+    """
+    record_id = contact_data.get("id")
+    if record_id is None and record_locator is not None:
+        record_id = record_locator.find_id("Contact", full_name)
+    if record_id:
+        with allure.step("Given abro o contato direto pelo Id"):
+            if _open_record_by_id(page, waits, screenshots, "Contact", record_id, "detalhe-contato"):
+                return record_id
+        if record_locator is not None:
+            record_locator.forget(record_id)
+    _open_contact_from_list(page, waits, screenshots, locators, full_name)
+    return None
+
+
+def _open_record_actions_menu(page: Page, locators) -> bool:
+    """Abre o menu de ações do registro; False se o botão não existir."""
+    # :not(...) evita pegar controles de exibição de lista
+    not_list_view = ":not([title*='exibição de lista' i])"
+    actions_dropdown = locators.resolve("registro.menu-acoes", {
+        "highlights-panel": page.locator(f"records-lwc-highlights-panel lightning-button-menu button{not_list_view}"),
+        "flexipage": page.locator(f"one-record-home-flexipage2 lightning-button-menu button{not_list_view}"),
+        "title-mais-acoes": page.locator("button[title='Mostrar mais ações'], button[aria-label='Mostrar mais ações']"),
+        "button-menu": page.locator(f"lightning-button-menu button{not_list_view}"),
+    }, timeout_ms=3000)
+    if actions_dropdown is None:
+        return False
+    expect(actions_dropdown).to_be_enabled(timeout=5000)
+    actions_dropdown.click()
+    return True
 
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_create_contact_full_form(page: Page, settings):
+def test_create_contact_full_form(
+    page: Page, settings, screenshots, sobject_metadata, test_data, data_registry
+):
     """Cria um contato preenchendo campos obrigatórios e opcionais."""
     from tests import conftest as conf
     auth_state = conf.AUTH_STATE_PATH
     if not auth_state.exists():
         pytest.skip("auth-state.json não encontrado. Rode o teste de login para gerar a sessão.")
 
-    contact = {
-        "salutation": "Sr.",
-        "firstName": fake.first_name(),
-        "lastName": fake.last_name(),
-        "phone": fake.phone_number(),
-        "mobile": fake.phone_number(),
-        "home": fake.phone_number(),
-        "other_phone": fake.phone_number(),
-        "title": fake.job(),
-        "department": "Vendas",
-        "fax": fake.msisdn()[0:10],
-        "birthdate": fake.date_of_birth(minimum_age=25, maximum_age=50).strftime("%d/%m/%Y"),
-        "email": fake.email(),
-        "assistant": fake.name(),
-        "assistant_phone": fake.phone_number(),
-        "lead_source": "Web",
-        "languages": "Português, Inglês",
-        "level": "Primary",
-        "description": fake.text(max_nb_chars=120),
-        "mailing_street": fake.street_address(),
-        "mailing_city": fake.city(),
-        "mailing_state": "SP",
-        "mailing_postal": fake.postcode(),
-        "mailing_country": "Brasil",
-        "other_street": fake.street_address(),
-        "other_city": fake.city(),
-        "other_state": "SP",
-        "other_postal": fake.postcode(),
-        "other_country": "Brasil",
-    }
+    contact = _build_contact_data(test_data)
 
     with allure.step("Given estou na home autenticado"):
-        page.goto(
-            "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/page/home",
-            timeout=90000,
-            wait_until="domcontentloaded",
-        )
+        goto_lightning(page, f"{LIGHTNING_BASE_URL}/lightning/page/home", timeout=90000)
         page.wait_for_url("**/lightning/**", timeout=60000)
         expect(page).to_have_url(re.compile("lightning\\.force\\.com|lightning/page/home|my\\.salesforce\\.com"), timeout=15000)
 
@@ -80,11 +190,12 @@ def test_create_contact_full_form(page: Page, settings):
         header = modal.get_by_role("heading", name="Criar contato")
         header.wait_for(timeout=15000)
         expect(header).to_be_visible()
-        allure.attach(page.screenshot(full_page=True), "modal-criar-contato", allure.attachment_type.PNG)
+        screenshots.capture(page, "modal-criar-contato")
 
     with allure.step("And mapeio os campos disponíveis"):
-        fields = extractCreateContactFields(page)
-        attach_fields_snapshot(allure, fields)
+        # Com API, os campos vêm do describe em cache; sem ela, do DOM do modal.
+        fields = sobject_metadata.form_fields("Contact") if sobject_metadata is not None else None
+        attach_fields_snapshot(allure, fields or extractCreateContactFields(page))
 
     with allure.step("And preencho o formulário completo"):
 
@@ -95,20 +206,37 @@ def test_create_contact_full_form(page: Page, settings):
         except PlaywrightTimeout:
             pass
 
-        fillContactFieldByApi(modal, "firstName", contact["firstName"])
-        fillContactFieldByApi(modal, "lastName", contact["lastName"])
-        fillContactFieldByApi(modal, "Phone", contact["phone"])
-        fillContactFieldByApi(modal, "HomePhone", contact["home"])
-        fillContactFieldByApi(modal, "MobilePhone", contact["mobile"])
-        fillContactFieldByApi(modal, "OtherPhone", contact["other_phone"])
-        fillContactFieldByApi(modal, "Title", contact["title"])
-        fillContactFieldByApi(modal, "Department", contact["department"])
-        fillContactFieldByApi(modal, "Fax", contact["fax"])
-        fillContactFieldByApi(modal, "Birthdate", contact["birthdate"])
-        fillContactFieldByApi(modal, "Email", contact["email"])
-        fillContactFieldByApi(modal, "AssistantName", contact["assistant"])
-        fillContactFieldByApi(modal, "AssistantPhone", contact["assistant_phone"])
-        fillContactFieldByApi(modal, "Languages__c", contact["languages"])
+        # Campos de texto e os dois endereços (correspondência e outro) numa chamada só.
+        filled = fill_record_form(modal, {
+            "firstName": contact["firstName"],
+            "lastName": contact["lastName"],
+            "Phone": contact["phone"],
+            "HomePhone": contact["home"],
+            "MobilePhone": contact["mobile"],
+            "OtherPhone": contact["other_phone"],
+            "Title": contact["title"],
+            "Department": contact["department"],
+            "Fax": contact["fax"],
+            "Birthdate": contact["birthdate"],
+            "Email": contact["email"],
+            "AssistantName": contact["assistant"],
+            "AssistantPhone": contact["assistant_phone"],
+            "Languages__c": contact["languages"],
+            "street": [contact["mailing_street"], contact["other_street"]],
+            "city": [contact["mailing_city"], contact["other_city"]],
+            "province": [contact["mailing_state"], contact["other_state"]],
+            "postalCode": [contact["mailing_postal"], contact["other_postal"]],
+            "country": [contact["mailing_country"], contact["other_country"]],
+        })
+        allure.attach(
+            json.dumps(asdict(filled), ensure_ascii=False, indent=2),
+            name="form-fill",
+            attachment_type=allure.attachment_type.JSON,
+        )
+        # O endereço "outro" é opcional no layout; os demais campos precisam existir.
+        missing = [key for key in filled.unresolved if not key.endswith("[1]")]
+        if missing:
+            pytest.fail(f"Campos não encontrados no modal: {', '.join(missing)}")
 
         # Level picklist: seleciona a segunda opção (nth=1)
         try:
@@ -132,24 +260,9 @@ def test_create_contact_full_form(page: Page, settings):
         except Exception:
             pass
 
-        fillContactFieldByApi(modal, "street", contact["mailing_street"])
-        fillContactFieldByApi(modal, "city", contact["mailing_city"])
-        fillContactFieldByApi(modal, "province", contact["mailing_state"])
-        fillContactFieldByApi(modal, "postalCode", contact["mailing_postal"])
-        fillContactFieldByApi(modal, "country", contact["mailing_country"])
-
-        try:
-            fillContactFieldByApi(modal, "street", contact["other_street"], nth=1)
-            fillContactFieldByApi(modal, "city", contact["other_city"], nth=1)
-            fillContactFieldByApi(modal, "province", contact["other_state"], nth=1)
-            fillContactFieldByApi(modal, "postalCode", contact["other_postal"], nth=1)
-            fillContactFieldByApi(modal, "country", contact["other_country"], nth=1)
-        except PlaywrightTimeout:
-            pass
-
         modal.get_by_label("Descrição").fill(contact["description"])
 
-        allure.attach(page.screenshot(full_page=True), "form-preenchido", allure.attachment_type.PNG)
+        screenshots.capture(page, "form-preenchido")
 
     with allure.step("And salvo o contato"):
         save_button = modal.locator("li[data-target-selection-name='sfdc:StandardButton.Contact.SaveEdit'] button[name='SaveEdit']").first
@@ -164,200 +277,87 @@ def test_create_contact_full_form(page: Page, settings):
         header_name = page.locator("lightning-formatted-name").first
         expect(header_name).to_have_text(f'{contact["firstName"]} {contact["lastName"]}', timeout=15000)
 
-        allure.attach(page.screenshot(full_page=True), "contato-salvo", allure.attachment_type.PNG)
-
-    # guarda o nome para o cenario de edicao
-    LAST_CONTACT_PATH.write_text(
-        json.dumps(
-            {
-                "firstName": contact["firstName"],
-                "lastName": contact["lastName"],
-                "fullName": f'{contact["firstName"]} {contact["lastName"]}',
-                "editCount": 0,
-            },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+        screenshots.capture(page, "contato-salvo")
+
+    # cadastra o contato para os cenarios de edicao/exclusao sem API (data_registry.lease)
+    data_registry.register(
+        "Contact",
+        {
+            "firstName": contact["firstName"],
+            "lastName": contact["lastName"],
+            "fullName": f'{contact["firstName"]} {contact["lastName"]}',
+            "editCount": 0,
+        },
     )
 
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_edit_contact_updates_name(page: Page, settings):
+def test_edit_contact_updates_name(
+    page: Page, settings, record_builder, record_locator, screenshots, waits, locators, test_data, data_registry
+):
     """Abre contato salvo e edita o nome via menu de ações da lista."""
     from tests import conftest as conf
     auth_state = conf.AUTH_STATE_PATH
     if not auth_state.exists():
         pytest.skip("auth-state.json não encontrado. Rode o teste de login para gerar a sessão.")
 
-    if not LAST_CONTACT_PATH.exists():
-        pytest.skip("last_contact.json não encontrado. Execute o cenário de criação de contato primeiro.")
-
-    contact_data = json.loads(LAST_CONTACT_PATH.read_text(encoding="utf-8"))
+    # Com API configurada, a massa vem de uma chamada Composite Graph; sem ela, do cenário de criação.
+    contact_data, lease = _seed_or_lease_contact(record_builder, test_data, data_registry)
     first = contact_data.get("firstName", "").strip()
     last = contact_data.get("lastName", "").strip()
     old_full = contact_data.get("fullName") or f"{first} {last}".strip()
     if not old_full.strip():
-        pytest.skip("Nome do contato ausente em last_contact.json.")
+        pytest.skip("Nome do contato ausente no registro de massa.")
 
     edit_count = int(contact_data.get("editCount", 0)) + 1
     suffix = f"EDITADO {edit_count}"
     new_last = f"{suffix} {last}".strip() if last else suffix
     new_full = f"{first} {new_last}".strip()
 
-    with allure.step("Given estou na lista de contatos autenticado"):
-        page.goto(
-            "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/o/Contact/list?filterName=Recent",
-            timeout=90000,
-            wait_until="domcontentloaded",
-        )
-        expect(page).to_have_url(re.compile("Contact/list"), timeout=30000)
-        page.wait_for_timeout(7000)
-        allure.attach(page.screenshot(full_page=True), "lista-contatos", allure.attachment_type.PNG)
-
-    with allure.step("When abro o contato salvo pela lista"):
-        row = page.locator("tbody tr").filter(has_text=old_full).first
-        
-        def _try_search():
-            # Campo de busca pode estar traduzido; tentamos variações comuns.
-            search_box = None
-            for candidate in [
-                page.get_by_placeholder("Pesquisar esta lista...", exact=False),
-                page.get_by_placeholder("Search this list...", exact=False),
-                page.locator("input[type='search']").first,
-            ]:
-                if candidate.count() > 0:
-                    search_box = candidate
-                    break
-            if not search_box or search_box.count() == 0:
-                return False
-
-            try:
-                search_box.wait_for(state="visible", timeout=5000)
-            except Exception:
-                return False
-
-            search_box.fill(old_full)
-            search_box.press("Enter")
-            page.wait_for_timeout(7000)
-            return True
-
-        if row.count() == 0 or not row.is_visible():
-            _try_search()
-            row = page.locator("tbody tr").filter(has_text=old_full).first
-
-        if row.count() == 0 or not row.is_visible():
-            pytest.skip("Contato não encontrado na lista mesmo após buscar.")
-
-        try:
-            row.scroll_into_view_if_needed(timeout=3000)
-        except Exception:
-            pass
-
-        # abre o registro clicando no link do nome
-        open_link = None
-        for candidate in [
-            row.get_by_role("link", name=old_full, exact=True),
-            row.locator("a[data-refid='recordId']").first,
-            row.locator("a").filter(has_text=old_full).first,
-        ]:
-            if candidate.count() > 0:
-                open_link = candidate
-                break
-
-        if not open_link or open_link.count() == 0:
-            pytest.skip("Link do contato não encontrado na lista.")
-
-        open_link.click()
-        page.wait_for_url("**/lightning/r/Contact/**", timeout=20000)
-        page.wait_for_load_state("domcontentloaded")
-        page.wait_for_timeout(500)
-        allure.attach(page.screenshot(full_page=True), "detalhe-contato", allure.attachment_type.PNG)
+    _open_contact(page, waits, screenshots, locators, record_locator, contact_data, old_full)
 
     with allure.step("And clico em Editar e altero o nome"):
-        page.wait_for_timeout(5000)
-        edit_button = None
-        for candidate in [
-            page.locator("[data-target-selection-name='standard__recordPage-RecordEdit']").first,
-            page.locator("button[title='Editar']").first,
-            page.locator("button[aria-label='Editar']").first,
-            page.get_by_role("button", name="Editar", exact=True),
-            page.locator("button[name='Edit']").first,
-        ]:
-            if candidate.count() > 0 and candidate.is_visible():
-                edit_button = candidate
-                break
-
-        if edit_button and edit_button.count() > 0:
+        edit_button = locators.resolve("contato.editar", {
+            "record-edit": page.locator("[data-target-selection-name='standard__recordPage-RecordEdit']"),
+            "title-editar": page.locator("button[title='Editar']"),
+            "aria-editar": page.locator("button[aria-label='Editar']"),
+            "role-editar": page.get_by_role("button", name="Editar", exact=True),
+            "name-edit": page.locator("button[name='Edit']"),
+        })
+
+        if edit_button is not None:
             expect(edit_button).to_be_enabled(timeout=5000)
             edit_button.click()
         else:
-            actions_dropdown = None
-            for cand in [
-                page.locator("records-lwc-highlights-panel lightning-button-menu button").first,
-                page.locator("one-record-home-flexipage2 lightning-button-menu button").first,
-                page.locator("button[title='Mostrar mais ações'], button[aria-label='Mostrar mais ações']").first,
-                page.locator("lightning-button-menu button").first,
-            ]:
-                if cand.count() > 0:
-                    try:
-                        cand.wait_for(state="visible", timeout=3000)
-                        # evita pegar controles de exibição de lista
-                        if "exibição de lista" in (cand.get_attribute("title") or "").lower():
-                            continue
-                        actions_dropdown = cand
-                        break
-                    except Exception:
-                        continue
-
-            if not actions_dropdown or actions_dropdown.count() == 0:
+            if not _open_record_actions_menu(page, locators):
                 pytest.skip("Botão Editar não encontrado na página do contato.")
 
-            expect(actions_dropdown).to_be_enabled(timeout=5000)
-            actions_dropdown.click()
-
             menu_edit = page.get_by_role("menuitem", name=re.compile("Editar contato|Editar|Edit", re.IGNORECASE))
             expect(menu_edit).to_be_visible(timeout=5000)
             menu_edit.click()
-            page.wait_for_timeout(400)
 
     with allure.step("And altero o nome e salvo"):
         page.wait_for_url("**/edit**", timeout=20000)
 
         modal = page.locator("records-modal-lwc-detail-panel-wrapper").first
         expect(modal).to_be_visible(timeout=10000)
-        page.wait_for_timeout(900)
-        allure.attach(page.screenshot(full_page=True), "modal-edicao", allure.attachment_type.PNG)
-
-        last_input_candidates = [
-            modal.locator("lightning-input[data-field='lastName'] input").first,
-            modal.locator("input[name='lastName']").first,
-            modal.locator("input[id^='input-'][name='lastName']").first,
-            modal.locator("input[aria-label*='Sobrenome'], input[aria-label*='Last Name']").first,
-            modal.get_by_label(re.compile("Sobrenome|Last Name", re.IGNORECASE)),
-            modal.get_by_placeholder(re.compile("Sobrenome|Last Name", re.IGNORECASE)),
-            page.locator("input[name='lastName']").first,
-        ]
-
-        last_input = None
-        # tenta por até 20s aguardando o campo ficar visível
-        for _ in range(10):
-            for candidate in last_input_candidates:
-                if candidate.count() == 0:
-                    continue
-                try:
-                    candidate.wait_for(state="visible", timeout=1500)
-                    last_input = candidate
-                    break
-                except Exception:
-                    continue
-            if last_input:
-                break
-            page.wait_for_timeout(1000)
-
-        if not last_input:
-            allure.attach(page.screenshot(full_page=True), "sem-campo-sobrenome", allure.attachment_type.PNG)
+        waits.settle("modal-edicao", budget_ms=900)
+        screenshots.capture(page, "modal-edicao")
+
+        # espera por até 20s o primeiro candidato que ficar visível
+        last_input = locators.resolve("contato.sobrenome", {
+            "lightning-input": modal.locator("lightning-input[data-field='lastName'] input"),
+            "name": modal.locator("input[name='lastName']"),
+            "id-name": modal.locator("input[id^='input-'][name='lastName']"),
+            "aria-label": modal.locator("input[aria-label*='Sobrenome'], input[aria-label*='Last Name']"),
+            "label": modal.get_by_label(re.compile("Sobrenome|Last Name", re.IGNORECASE)),
+            "placeholder": modal.get_by_placeholder(re.compile("Sobrenome|Last Name", re.IGNORECASE)),
+            "page-name": page.locator("input[name='lastName']"),
+        }, timeout_ms=20000)
+
+        if last_input is None:
+            screenshots.capture(page, "sem-campo-sobrenome")
             pytest.fail("Campo de sobrenome não encontrado na tela de edição (modal).")
 
         last_input.click()
@@ -366,19 +366,15 @@ def test_edit_contact_updates_name(page: Page, settings):
             last_input.press("Tab")
         except Exception:
             pass
-        page.wait_for_timeout(300)
-        allure.attach(page.screenshot(full_page=True), "sobrenome-editado", allure.attachment_type.PNG)
-
-        save_button = None
-        for candidate in [
-            page.locator("button[name='SaveEdit']").first,  # botão Salvar padrão
-            page.get_by_role("button", name=re.compile("^Salvar$", re.IGNORECASE)).first,
-            page.get_by_role("button", name=re.compile("^Save$", re.IGNORECASE)).first,
-        ]:
-            if candidate.count() > 0:
-                save_button = candidate
-                break
-        if not save_button or save_button.count() == 0:
+        waits.settle("sobrenome-editado", budget_ms=300)
+        screenshots.capture(page, "sobrenome-editado")
+
+        save_button = locators.resolve("contato.salvar", {
+            "save-edit": page.locator("button[name='SaveEdit']"),  # botão Salvar padrão
+            "role-salvar": page.get_by_role("button", name=re.compile("^Salvar$", re.IGNORECASE)),
+            "role-save": page.get_by_role("button", name=re.compile("^Save$", re.IGNORECASE)),
+        }, state="attached")
+        if save_button is None:
             pytest.skip("Botão de salvar não encontrado na tela de edição.")
 
         expect(save_button).to_be_enabled(timeout=5000)
@@ -388,7 +384,6 @@ def test_edit_contact_updates_name(page: Page, settings):
             page.wait_for_selector("records-modal-lwc-detail-panel-wrapper", state="detached", timeout=10000)
         except Exception:
             pass
-        page.wait_for_timeout(500)
 
     with allure.step("Then o nome atualizado deve aparecer"):
         toast = page.locator("span.toastMessage")
@@ -397,7 +392,7 @@ def test_edit_contact_updates_name(page: Page, settings):
             expect(toast).to_contain_text(new_full, timeout=5000)
         except Exception:
             pass  # alguns toasts mostram apenas o nome antigo; seguimos validando no header
-        allure.attach(page.screenshot(full_page=True), "toast-e-header", allure.attachment_type.PNG)
+        screenshots.capture(page, "toast-e-header")
 
         # fecha o alerta para limpar a tela antes da evidência final
         toast_close = page.locator("button[title='Fechar'], button[aria-label='Fechar'], button.slds-notify__close").first
@@ -406,167 +401,69 @@ def test_edit_contact_updates_name(page: Page, settings):
                 toast_close.click(timeout=2000)
             except Exception:
                 pass
-        page.wait_for_timeout(300)
 
         header_name = page.locator("lightning-formatted-name").first
         expect(header_name).to_have_text(new_full, timeout=15000)
 
-        allure.attach(page.screenshot(full_page=True), "contato-editado", allure.attachment_type.PNG)
+        screenshots.capture(page, "contato-editado")
 
-    LAST_CONTACT_PATH.write_text(
-        json.dumps(
-            {"firstName": first, "lastName": new_last, "fullName": new_full, "editCount": edit_count},
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
-    )
+    # Contato criado via API é removido no teardown; o emprestado do registro volta com o nome novo.
+    if lease is not None:
+        data_registry.release(
+            lease.key,
+            data={"firstName": first, "lastName": new_last, "fullName": new_full, "editCount": edit_count},
+        )
 
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_delete_contact_from_record(page: Page, settings):
+def test_delete_contact_from_record(
+    page: Page, settings, record_builder, record_locator, screenshots, waits, locators, test_data, data_registry
+):
     """Abre o contato salvo e o exclui confirmando o modal."""
     from tests import conftest as conf
     auth_state = conf.AUTH_STATE_PATH
     if not auth_state.exists():
         pytest.skip("auth-state.json não encontrado. Rode o teste de login para gerar a sessão.")
 
-    if not LAST_CONTACT_PATH.exists():
-        pytest.skip("last_contact.json não encontrado. Execute o cenário de criação de contato primeiro.")
-
-    contact_data = json.loads(LAST_CONTACT_PATH.read_text(encoding="utf-8"))
+    contact_data, lease = _seed_or_lease_contact(record_builder, test_data, data_registry)
     first = contact_data.get("firstName", "").strip()
     last = contact_data.get("lastName", "").strip()
     old_full = contact_data.get("fullName") or f"{first} {last}".strip()
     if not old_full.strip():
-        pytest.skip("Nome do contato ausente em last_contact.json.")
-
-    with allure.step("Given estou na lista de contatos autenticado"):
-        page.goto(
-            "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/o/Contact/list?filterName=Recent",
-            timeout=90000,
-            wait_until="domcontentloaded",
-        )
-        expect(page).to_have_url(re.compile("Contact/list"), timeout=30000)
-        page.wait_for_timeout(7000)
-        allure.attach(page.screenshot(full_page=True), "lista-contatos", allure.attachment_type.PNG)
-
-    with allure.step("When abro o contato salvo pela lista"):
-        row = page.locator("tbody tr").filter(has_text=old_full).first
-
-        def _try_search():
-            search_box = None
-            for candidate in [
-                page.get_by_placeholder("Pesquisar esta lista...", exact=False),
-                page.get_by_placeholder("Search this list...", exact=False),
-                page.locator("input[type='search']").first,
-            ]:
-                if candidate.count() > 0:
-                    search_box = candidate
-                    break
-            if not search_box or search_box.count() == 0:
-                return False
-
-            try:
-                search_box.wait_for(state="visible", timeout=5000)
-            except Exception:
-                return False
-
-            search_box.fill(old_full)
-            search_box.press("Enter")
-            page.wait_for_timeout(7000)
-            return True
-
-        if row.count() == 0 or not row.is_visible():
-            _try_search()
-            row = page.locator("tbody tr").filter(has_text=old_full).first
+        pytest.skip("Nome do contato ausente no registro de massa.")
 
-        if row.count() == 0 or not row.is_visible():
-            pytest.skip("Contato não encontrado na lista mesmo após buscar.")
-
-        try:
-            row.scroll_into_view_if_needed(timeout=3000)
-        except Exception:
-            pass
-
-        open_link = None
-        for candidate in [
-            row.get_by_role("link", name=old_full, exact=True),
-            row.locator("a[data-refid='recordId']").first,
-            row.locator("a").filter(has_text=old_full).first,
-        ]:
-            if candidate.count() > 0:
-                open_link = candidate
-                break
-
-        if not open_link or open_link.count() == 0:
-            pytest.skip("Link do contato não encontrado na lista.")
-
-        open_link.click()
-        page.wait_for_url("**/lightning/r/Contact/**", timeout=20000)
-        page.wait_for_load_state("domcontentloaded")
-        page.wait_for_timeout(500)
-        allure.attach(page.screenshot(full_page=True), "detalhe-contato", allure.attachment_type.PNG)
+    record_id = _open_contact(page, waits, screenshots, locators, record_locator, contact_data, old_full)
 
     with allure.step("And clico em Excluir"):
-        page.wait_for_timeout(4000)
-        delete_button = None
-        for candidate in [
-            page.locator("[data-target-selection-name='standard__recordPage-RecordDelete']").first,
-            page.locator("button[title='Excluir']").first,
-            page.locator("button[aria-label='Excluir']").first,
-            page.locator("button[name='Delete']").first,
-            page.get_by_role("button", name=re.compile("Excluir|Delete", re.IGNORECASE)).first,
-        ]:
-            if candidate.count() > 0 and candidate.is_visible():
-                delete_button = candidate
-                break
-
-        if delete_button and delete_button.count() > 0:
+        delete_button = locators.resolve("contato.excluir", {
+            "record-delete": page.locator("[data-target-selection-name='standard__recordPage-RecordDelete']"),
+            "title-excluir": page.locator("button[title='Excluir']"),
+            "aria-excluir": page.locator("button[aria-label='Excluir']"),
+            "name-delete": page.locator("button[name='Delete']"),
+            "role-excluir": page.get_by_role("button", name=re.compile("Excluir|Delete", re.IGNORECASE)),
+        })
+
+        if delete_button is not None:
             expect(delete_button).to_be_enabled(timeout=5000)
             delete_button.click()
         else:
-            actions_dropdown = None
-            for cand in [
-                page.locator("records-lwc-highlights-panel lightning-button-menu button").first,
-                page.locator("one-record-home-flexipage2 lightning-button-menu button").first,
-                page.locator("button[title='Mostrar mais ações'], button[aria-label='Mostrar mais ações']").first,
-                page.locator("lightning-button-menu button").first,
-            ]:
-                if cand.count() > 0:
-                    try:
-                        cand.wait_for(state="visible", timeout=3000)
-                        if "exibição de lista" in (cand.get_attribute("title") or "").lower():
-                            continue
-                        actions_dropdown = cand
-                        break
-                    except Exception:
-                        continue
-
-            if not actions_dropdown or actions_dropdown.count() == 0:
+            if not _open_record_actions_menu(page, locators):
                 pytest.skip("Botão Excluir não encontrado na página do contato.")
 
-            expect(actions_dropdown).to_be_enabled(timeout=5000)
-            actions_dropdown.click()
-
             menu_delete = page.get_by_role("menuitem", name=re.compile("Excluir contato|Excluir|Delete", re.IGNORECASE))
             expect(menu_delete).to_be_visible(timeout=5000)
             menu_delete.click()
-            page.wait_for_timeout(400)
+            waits.settle("menu-excluir", budget_ms=400)
 
     with allure.step("And confirmo a exclusão no modal"):
-        modal = None
-        for candidate in [
-            page.locator("div.modal-container.slds-modal__container").first,
-            page.locator("records-modal-lwc-detail-panel-wrapper").first,
-            page.locator("div.slds-modal__container").first,
-        ]:
-            if candidate.count() > 0:
-                modal = candidate
-                break
+        modal = locators.resolve("contato.modal-exclusao", {
+            "modal-container": page.locator("div.modal-container.slds-modal__container"),
+            "detail-panel": page.locator("records-modal-lwc-detail-panel-wrapper"),
+            "slds-modal": page.locator("div.slds-modal__container"),
+        }, state="attached")
 
-        if not modal or modal.count() == 0:
+        if modal is None:
             pytest.fail("Modal de confirmação de exclusão não apareceu.")
 
         try:
@@ -574,17 +471,15 @@ def test_delete_contact_from_record(page: Page, settings):
         except Exception:
             pass
 
-        confirm_button = None
-        for candidate in [
-            modal.get_by_role("button", name=re.compile("^Excluir$", re.IGNORECASE)),
-            modal.get_by_role("button", name=re.compile("^Delete$", re.IGNORECASE)),
-            modal.locator("button.uiButton--brand, button.slds-button_brand").filter(has_text=re.compile("Excluir|Delete", re.IGNORECASE)).first,
-        ]:
-            if candidate.count() > 0:
-                confirm_button = candidate
-                break
+        confirm_button = locators.resolve("contato.confirmar-exclusao", {
+            "role-excluir": modal.get_by_role("button", name=re.compile("^Excluir$", re.IGNORECASE)),
+            "role-delete": modal.get_by_role("button", name=re.compile("^Delete$", re.IGNORECASE)),
+            "brand": modal.locator("button.uiButton--brand, button.slds-button_brand").filter(
+                has_text=re.compile("Excluir|Delete", re.IGNORECASE)
+            ),
+        }, state="attached")
 
-        if not confirm_button or confirm_button.count() == 0:
+        if confirm_button is None:
             pytest.fail("Botão de confirmação de exclusão não encontrado no modal.")
 
         expect(confirm_button).to_be_enabled(timeout=5000)
@@ -593,44 +488,51 @@ def test_delete_contact_from_record(page: Page, settings):
             modal.wait_for(state="hidden", timeout=10000)
         except Exception:
             pass
-        page.wait_for_timeout(700)
 
     with allure.step("Then devo ver a exclusão concluída e o contato some da lista"):
         toast = page.locator("span.toastMessage")
         expect(toast).to_contain_text(re.compile("foi exclu[ií]do|Exclusão concluída|excluído", re.IGNORECASE), timeout=15000)
-        allure.attach(page.screenshot(full_page=True), "toast-exclusao", allure.attachment_type.PNG)
+        screenshots.capture(page, "toast-exclusao")
+        if record_locator is not None and record_id:
+            record_locator.forget(record_id)
+        if lease is not None:
+            data_registry.consume(lease.key)
 
         page.goto(
-            "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/o/Contact/list?filterName=Recent",
+            CONTACT_LIST_URL,
             timeout=90000,
             wait_until="domcontentloaded",
         )
-        page.wait_for_timeout(5000)
-        _try_search()
+        waits.settle("lista-apos-excluir", budget_ms=5000)
+        _search_list(page, waits, locators, old_full)
         rows = page.locator("tbody tr").filter(has_text=old_full)
         try:
             expect(rows).to_have_count(0, timeout=12000)
         except Exception:
-            allure.attach(page.screenshot(full_page=True), "lista-apos-excluir", allure.attachment_type.PNG)
+            screenshots.capture(page, "lista-apos-excluir")
             pytest.fail(f"Contato '{old_full}' ainda aparece na lista após exclusão.")
 
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_find_contact_named_adff_in_list(page: Page, settings):
-    """Rola a lista inteira, abre o contato de nome 'adff' e exibe."""
+def test_find_contact_named_adff_in_list(page: Page, settings, record_locator, screenshots, waits, locators):
+    """Abre o contato de nome 'adff' (pelo Id via API ou rolando a lista inteira) e exibe."""
     from tests import conftest as conf
     if not conf.AUTH_STATE_PATH.exists():
         pytest.skip("auth-state.json não encontrado. Rode o teste de login para gerar a sessão.")
 
     target_name = "adff"
 
+    # Com API configurada, uma consulta SOQL acha o Id e a tela abre direto no registro, sem rolar a lista.
+    record_id = record_locator.find_id("Contact", target_name) if record_locator is not None else None
+    if record_id:
+        with allure.step("Given abro o contato 'adff' direto pelo Id"):
+            if _open_record_by_id(page, waits, screenshots, "Contact", record_id, "contato-adff-detalhe"):
+                return
+        record_locator.forget(record_id)
+
     with allure.step("Given estou na lista de contatos"):
-        page.goto(
-            "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/o/Contact/list?filterName=Recent",
-            timeout=90000,
-            wait_until="domcontentloaded",
-        )
+        goto_lightning(page, CONTACT_LIST_URL, timeout=90000)
         expect(page).to_have_url(re.compile("Contact/list"), timeout=30000)
 
     rows = page.locator("tbody tr")
@@ -642,29 +544,25 @@ def test_find_contact_named_adff_in_list(page: Page, settings):
                 found = True
                 break
             page.mouse.wheel(0, 1400)
-            page.wait_for_timeout(500)
+            waits.settle("scroll-lista", budget_ms=500, quiet_ms=150)
 
     if not found:
-        allure.attach(page.screenshot(full_page=True), "lista-apos-scroll", allure.attachment_type.PNG)
+        screenshots.capture(page, "lista-apos-scroll")
         pytest.fail("Contato 'adff' não encontrado após rolar a lista inteira.")
 
     with allure.step("Then o contato 'adff' aparece na lista"):
         target_row = rows.filter(has_text=target_name).first
         expect(target_row).to_be_visible(timeout=5000)
-        allure.attach(page.screenshot(full_page=True), "contato-adff-visivel", allure.attachment_type.PNG)
+        screenshots.capture(page, "contato-adff-visivel")
 
     with allure.step("And abro o contato 'adff' e mantenho a tela"):
-        open_link = None
-        for candidate in [
-            target_row.get_by_role("link", name=target_name, exact=True),
-            target_row.locator("a[data-refid='recordId']").first,
-            target_row.locator("a").filter(has_text=target_name).first,
-        ]:
-            if candidate.count() > 0:
-                open_link = candidate
-                break
+        open_link = locators.resolve("lista.link-registro", {
+            "role-link": target_row.get_by_role("link", name=target_name, exact=True),
+            "refid": target_row.locator("a[data-refid='recordId']"),
+            "link-texto": target_row.locator("a").filter(has_text=target_name),
+        }, state="attached", timeout_ms=3000)
 
-        if not open_link or open_link.count() == 0:
+        if open_link is None:
             pytest.skip("Link do contato 'adff' não encontrado na linha.")
 
         try:
@@ -679,24 +577,12 @@ def test_find_contact_named_adff_in_list(page: Page, settings):
 
         page.wait_for_load_state("domcontentloaded")
 
-        header_name = None
-        for candidate in [
-            page.locator("lightning-formatted-name").first,
-            page.get_by_role("heading", name=re.compile(target_name)),
-            page.locator("h1").filter(has_text=target_name).first,
-        ]:
-            if candidate.count() > 0:
-                header_name = candidate
-                break
-        if header_name and header_name.count() > 0:
-            try:
-                expect(header_name).to_be_visible(timeout=5000)
-            except Exception:
-                pass
+        # só confirma que o cabeçalho apareceu; sem ele o teste segue para o screenshot
+        locators.resolve("contato.cabecalho", {
+            "formatted-name": page.locator("lightning-formatted-name"),
+            "role-heading": page.get_by_role("heading", name=re.compile(target_name)),
+            "h1": page.locator("h1").filter(has_text=target_name),
+        })
 
-        allure.attach(page.screenshot(full_page=True), "contato-adff-detalhe", allure.attachment_type.PNG)
-        try:
-            page.wait_for_timeout(10000)
-        except Exception:
-            # se a página fechar/for redirecionada, ignoramos
-            pass
+        waits.settle("contato-adff-detalhe", budget_ms=10000)
+        screenshots.capture(page, "contato-adff-detalhe")
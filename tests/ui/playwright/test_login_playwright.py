@@ -3,12 +3,14 @@ import pytest
 import re
 from pathlib import Path
 from playwright.sync_api import Page, TimeoutError, expect
+from tests.utils.auth_state import write_storage_state
 from tests.utils.logger import step
 
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_can_fill_login_form_with_env_credentials(page: Page, settings, request):
+@pytest.mark.no_auth_state
+def test_can_fill_login_form_with_env_credentials(page: Page, settings, request, screenshots):
     if not settings.sf_username or not settings.sf_password:
         pytest.skip("Defina SF_USERNAME e SF_PASSWORD no .env")
 
@@ -22,11 +24,7 @@ def test_can_fill_login_form_with_env_credentials(page: Page, settings, request)
         username = page.locator("input#username")
         expect(username).to_be_visible()
 
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="01-login-page",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "01-login-page")
 
     with step(logger, "When preencho usuario e senha"):
         password = page.locator("input#password")
@@ -41,11 +39,7 @@ def test_can_fill_login_form_with_env_credentials(page: Page, settings, request)
         expect(username).to_have_value(settings.sf_username)
         expect(password).to_have_value(settings.sf_password)
 
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="02-form-filled",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "02-form-filled")
 
     with step(logger, "And clico em Login"):
         login_button = page.locator("input#Login")
@@ -71,11 +65,7 @@ def test_can_fill_login_form_with_env_credentials(page: Page, settings, request)
             except TimeoutError:
                 pytest.fail("Não apareceu tela de token nem navegou para o Lightning Home após o login.")
 
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="03-after-click-login",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "03-after-click-login")
 
     with step(logger, "Then aguardo a validação do token"):
         # Neste ponto podemos estar em dois caminhos:
@@ -88,19 +78,11 @@ def test_can_fill_login_form_with_env_credentials(page: Page, settings, request)
         else:
             try:
                 page.wait_for_selector("input#save", timeout=1000)
-                allure.attach(
-                    page.screenshot(full_page=True),
-                    name="04-token-page",
-                    attachment_type=allure.attachment_type.PNG,
-                )
+                screenshots.capture(page, "04-token-page")
                 try:
                     page.wait_for_url(home_url, timeout=180000)
                 except TimeoutError:
-                    allure.attach(
-                        page.screenshot(full_page=True),
-                        name="05-token-validation-failed",
-                        attachment_type=allure.attachment_type.PNG,
-                    )
+                    screenshots.capture(page, "05-token-validation-failed")
                     pytest.fail(
                         "Token não validado: a página não navegou para o Lightning Home em até 180s "
                         "após clicar manualmente em 'Verificar'."
@@ -126,16 +108,12 @@ def test_can_fill_login_form_with_env_credentials(page: Page, settings, request)
             name="page-title",
             attachment_type=allure.attachment_type.TEXT,
         )
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="06-home",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "06-home")
 
-    # Salva o estado autenticado para reutilizar a sessão em outros testes Playwright.
+    # Salva o estado autenticado (sob o lock do bootstrap) para reutilizar a sessão em outros testes Playwright.
     from tests import conftest as conf
 
-    page.context.storage_state(path=str(conf.AUTH_STATE_PATH))
+    write_storage_state(page.context, conf.AUTH_STATE_PATH)
     allure.attach.file(
         str(conf.AUTH_STATE_PATH),
         name="auth-storage-state",
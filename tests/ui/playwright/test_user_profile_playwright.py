@@ -3,10 +3,12 @@ import pytest
 from pathlib import Path
 from playwright.sync_api import Page, expect
 
+from tests.ui.playwright.utils import goto_lightning
+
 
 @pytest.mark.ui
 @pytest.mark.playwright
-def test_user_profile_shows_correct_user(page: Page, settings):
+def test_user_profile_shows_correct_user(page: Page, settings, screenshots):
     """Cenário separado para validar o usuário logado via header/profile."""
     from tests import conftest as conf
     auth_state = conf.AUTH_STATE_PATH
@@ -14,14 +16,10 @@ def test_user_profile_shows_correct_user(page: Page, settings):
         pytest.skip("auth-state.json não encontrado. Rode o teste de login primeiro para gerar o estado.")
 
     with allure.step("Given estou na home já autenticado"):
-        page.goto("https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/page/home")
+        goto_lightning(page, "https://orgfarm-1a5e0b208b-dev-ed.develop.lightning.force.com/lightning/page/home")
         page.wait_for_url("**/lightning/**", timeout=60000)
         page.wait_for_load_state("domcontentloaded")
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="01-home-authenticated",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "01-home-authenticated")
 
     with allure.step("When abro o menu do usuário"):
         profile_button = page.locator(
@@ -29,18 +27,10 @@ def test_user_profile_shows_correct_user(page: Page, settings):
         ).first
         expect(profile_button).to_be_visible(timeout=15000)
         profile_button.click()
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="02-profile-menu-opened",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "02-profile-menu-opened")
 
     with allure.step('Then o nome exibido deve ser "José Ailton Junior"'):
         profile_name = page.locator("h1.profile-card-name a.profile-link-label")
         expect(profile_name).to_be_visible()
         expect(profile_name).to_have_text("José Ailton Junior", timeout=10000)
-        allure.attach(
-            page.screenshot(full_page=True),
-            name="03-profile-name-validated",
-            attachment_type=allure.attachment_type.PNG,
-        )
+        screenshots.capture(page, "03-profile-name-validated")
@@ -1,6 +1,10 @@
 import json
-from typing import Any, Dict, List, Optional, Union
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
 
+from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import Locator, Page
 
 
@@ -54,6 +58,164 @@ def fillContactFieldByApi(page: Union[Page, Locator], api_name: str, value: str,
     _fill_text(target.first, value, timeout=timeout)
 
 
+# Resolve e preenche todos os campos numa passada só dentro da página. A busca atravessa shadow roots
+# abertos (querySelectorAll não atravessa; os locators CSS do Playwright sim) e segue as mesmas regras
+# de fillContactFieldByApi: [name=apiName] e, se não houver, input/textarea de
+# lightning-input-field[field-name=apiName]. Combobox, lookup e campo ainda não visível/editável não
+# são preenchidos aqui: voltam para o Python, que usa fill() do Playwright neles.
+FILL_RECORD_FORM_JS = """
+(root, fields) => {
+  const deepAll = (scope, selector, out = []) => {
+    for (const el of scope.querySelectorAll("*")) {
+      if (el.matches(selector)) out.push(el);
+      if (el.shadowRoot) deepAll(el.shadowRoot, selector, out);
+    }
+    return out;
+  };
+  const visible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+  const fallbackReason = (el) => {
+    if (el.getAttribute("role") === "combobox" || el.closest("lightning-base-combobox, lightning-combobox")) {
+      return "combobox";
+    }
+    if (el.closest("lightning-lookup, lightning-grouped-combobox, records-record-picker")) return "lookup";
+    if (!visible(el) || el.disabled || el.readOnly) return "not-ready";
+    return null;
+  };
+  const result = { filled: [], fallback: [], unresolved: [] };
+  for (const { key, apiName, nth, value } of fields) {
+    let rule = "name";
+    let target = deepAll(root, `[name="${CSS.escape(apiName)}"]`)[nth];
+    if (!target) {
+      rule = "field";
+      const wrapper = deepAll(root, `lightning-input-field[field-name="${CSS.escape(apiName)}"]`)[nth];
+      target = wrapper && deepAll(wrapper, "input, textarea")[0];
+    }
+    if (!target) {
+      result.unresolved.push(key);
+      continue;
+    }
+    const reason = fallbackReason(target);
+    if (reason) {
+      result.fallback.push({ key, rule, reason });
+      continue;
+    }
+    // Setter nativo + eventos compostos: é o que o lightning-input escuta para atualizar o valor do LWC.
+    const proto = target instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    target.focus();
+    Object.getOwnPropertyDescriptor(proto, "value").set.call(target, value);
+    target.dispatchEvent(new Event("input", { bubbles: true, composed: true }));
+    target.dispatchEvent(new Event("change", { bubbles: true, composed: true }));
+    target.dispatchEvent(new FocusEvent("focusout", { bubbles: true, composed: true }));
+    target.blur();
+    result.filled.push(key);
+  }
+  return result;
+}
+"""
+
+
+@dataclass
+class FormFillResult:
+    filled: List[str] = field(default_factory=list)
+    fallback: List[str] = field(default_factory=list)
+    unresolved: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    round_trips: int = 0
+
+
+def _field_key(api_name: str, nth: int) -> str:
+    return api_name if nth == 0 else f"{api_name}[{nth}]"
+
+
+def fill_record_form(
+    scope: Union[Page, Locator], values: Dict[str, Union[str, Sequence[str]]], timeout: int = 3000
+) -> FormFillResult:
+    """
+    Preenche vários campos do formulário pelo API name com uma única chamada evaluate.
+    Lista de valores preenche as ocorrências em ordem (ex.: {"street": [correspondência, outro]});
+    as ocorrências além da primeira aparecem como "street[1]" no resultado.
+    Campos não encontrados vão para `unresolved` em vez de levantar erro, como em fillContactFieldByApi.
+    """
+    start = time.perf_counter()
+    fields = []
+    for api_name, value in values.items():
+        for nth, item in enumerate([value] if isinstance(value, str) else value):
+            fields.append({"key": _field_key(api_name, nth), "apiName": api_name, "nth": nth, "value": item})
+    by_key = {item["key"]: item for item in fields}
+
+    # Page.evaluate recebe só o argumento; a raiz da busca vira o document.
+    if isinstance(scope, Locator):
+        plan = scope.evaluate(FILL_RECORD_FORM_JS, fields)
+    else:
+        plan = scope.evaluate(f"fields => ({FILL_RECORD_FORM_JS})(document, fields)", fields)
+    result = FormFillResult(filled=plan["filled"], unresolved=plan["unresolved"], round_trips=1)
+
+    for pending in plan["fallback"]:
+        item = by_key[pending["key"]]
+        if pending["rule"] == "name":
+            target = scope.locator(f"[name='{item['apiName']}']").nth(item["nth"])
+        else:
+            wrapper = scope.locator(f"lightning-input-field[field-name='{item['apiName']}']").nth(item["nth"])
+            target = wrapper.locator("input, textarea").first
+        # wait_for + fill: as duas idas ao browser do caminho antigo, só para estes campos.
+        result.round_trips += 2
+        try:
+            _fill_text(target, item["value"], timeout=timeout)
+        except PlaywrightError:
+            result.unresolved.append(item["key"])
+        else:
+            result.fallback.append(item["key"])
+
+    result.elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def login_with_credentials(page: Page, login_url: str, username: str, password: str, mfa_timeout_ms: int = 180000) -> None:
+    """
+    Faz login pelo formulário padrão e espera chegar ao Lightning.
+    Se a org pedir verificação (input#save), aguarda até `mfa_timeout_ms` a validação manual.
+    """
+    page.goto(login_url)
+    page.locator("input#username").fill(username)
+    page.locator("input#password").fill(password)
+    page.locator("input#Login").click()
+    page.wait_for_function(
+        "() => location.pathname.startsWith('/lightning') || !!document.querySelector('input#save')",
+        timeout=60000,
+    )
+    if "/lightning" not in page.url:
+        page.wait_for_url("**/lightning/**", timeout=mfa_timeout_ms)
+    page.wait_for_load_state("domcontentloaded")
+
+
+def goto_lightning(page: Page, url: str, timeout: int = 90000) -> None:
+    """
+    Navega para uma URL do Lightning aproveitando a página já carregada (ex.: contexto do pool).
+    Mesma URL não recarrega; outra rota no mesmo domínio usa a navegação interna do app
+    (force:navigateToURL), sem baixar o one.app de novo. Fora do Lightning cai no page.goto.
+    """
+    target = urlsplit(url)
+    current = urlsplit(page.url)
+    if current.netloc == target.netloc and current.path.startswith("/lightning"):
+        if (current.path, current.query) == (target.path, target.query):
+            return
+        relative = f"{target.path}?{target.query}" if target.query else target.path
+        navigated = page.evaluate(
+            """url => {
+                const event = window.$A && $A.get('e.force:navigateToURL');
+                if (!event) return false;
+                event.setParams({ url });
+                event.fire();
+                return true;
+            }""",
+            relative,
+        )
+        if navigated:
+            page.wait_for_url(lambda href: urlsplit(href).path == target.path, timeout=timeout)
+            return
+    page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+
+
 def select_combobox_option(modal: Union[Page, Locator], button_label: str, option_text: str) -> None:
     """
     Seleciona uma opção em um combobox (lightning-base-combobox) pelo label do botão.
@@ -0,0 +1,151 @@
+"""
+Espera orientada a eventos para o Lightning, no lugar de page.wait_for_timeout(N).
+
+Um script instalado na página (add_init_script + evaluate na página já aberta do pool) conta as
+requisições fetch/XHR em andamento e registra a última mutação do DOM. A tela está assentada quando:
+  - não há requisição pendente (o long-poll do CometD/Streaming API fica de fora, ele nunca termina);
+  - nenhum spinner visível;
+  - o DOM ficou `quiet_ms` sem mudar.
+
+A verificação roda dentro do browser (wait_for_function com polling), sem ida e volta por tentativa.
+Cada settle() tem um orçamento (budget_ms, em geral o sleep fixo que substitui): se a tela não assenta
+a tempo o teste segue, como seguiria depois do sleep, e o registro fica marcado como estourado.
+Tempo de sleep removido = orçamento - espera real, somado em reports/ui-waits.json.
+"""
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+LIGHTNING_SPINNER_SELECTOR = "lightning-spinner, .slds-spinner_container, .forceListViewManagerSpinner"
+# Conexões que ficam abertas por desenho e nunca zerariam o contador.
+IGNORED_REQUEST_PATTERN = r"/cometd/|/eventbus/"
+
+IDLE_MONITOR_JS = """
+(ignored) => {
+  if (window.__sfIdle) return;
+  const ignore = new RegExp(ignored);
+  let pending = 0;
+  let lastChange = performance.now();
+  const touch = () => { lastChange = performance.now(); };
+  const track = (url) => {
+    if (ignore.test(String(url || ""))) return () => {};
+    pending += 1;
+    touch();
+    let done = false;
+    return () => { if (!done) { done = true; pending -= 1; touch(); } };
+  };
+  const originalFetch = window.fetch;
+  if (originalFetch) {
+    window.fetch = function (input) {
+      const end = track(input && input.url ? input.url : input);
+      return originalFetch.apply(this, arguments).finally(end);
+    };
+  }
+  const originalOpen = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__sfIdleUrl = url;
+    return originalOpen.apply(this, arguments);
+  };
+  const originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    this.addEventListener("loadend", track(this.__sfIdleUrl));
+    return originalSend.apply(this, arguments);
+  };
+  new MutationObserver(touch).observe(document, { childList: true, subtree: true, characterData: true });
+  const visible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== "hidden";
+  window.__sfIdle = {
+    state: (spinners) => ({
+      pending,
+      quietMs: performance.now() - lastChange,
+      spinners: Array.from(document.querySelectorAll(spinners)).filter(visible).length,
+    }),
+  };
+}
+"""
+
+SETTLED_JS = """
+([quietMs, spinners]) => {
+  if (!window.__sfIdle || document.readyState === "loading") return false;
+  const state = window.__sfIdle.state(spinners);
+  return state.pending === 0 && state.spinners === 0 && state.quietMs >= quietMs;
+}
+"""
+
+
+@dataclass
+class WaitRecord:
+    label: str
+    budget_ms: float
+    waited_ms: float
+    settled: bool
+
+    @property
+    def saved_ms(self) -> float:
+        return max(0.0, self.budget_ms - self.waited_ms)
+
+
+class LightningWaits:
+    def __init__(
+        self,
+        page: Page,
+        quiet_ms: float = 300,
+        spinner_selector: str = LIGHTNING_SPINNER_SELECTOR,
+        ignored_requests: str = IGNORED_REQUEST_PATTERN,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.page = page
+        self.quiet_ms = quiet_ms
+        self.spinner_selector = spinner_selector
+        self.ignored_requests = ignored_requests
+        self.records: List[WaitRecord] = []
+        self._clock = clock
+
+    def install(self) -> None:
+        # Documentos novos (reload/goto) recebem o monitor pelo init script; a página atual, pelo evaluate.
+        self.page.add_init_script(f"({IDLE_MONITOR_JS})({json.dumps(self.ignored_requests)})")
+        try:
+            self.page.evaluate(IDLE_MONITOR_JS, self.ignored_requests)
+        except PlaywrightError:
+            pass
+
+    def settle(self, label: str, budget_ms: float, quiet_ms: Optional[float] = None) -> WaitRecord:
+        """Espera a tela assentar por até `budget_ms`; nunca falha o teste por estourar o orçamento."""
+        quiet = self.quiet_ms if quiet_ms is None else quiet_ms
+        start = self._clock()
+        settled = False
+        while True:
+            remaining = budget_ms - (self._clock() - start) * 1000
+            if remaining <= 0:
+                break
+            try:
+                self.page.wait_for_function(
+                    SETTLED_JS, arg=[quiet, self.spinner_selector], polling=100, timeout=remaining
+                )
+                settled = True
+                break
+            except PlaywrightTimeout:
+                break
+            except PlaywrightError:
+                # Contexto destruído por uma navegação no meio da espera: tenta de novo no documento novo.
+                try:
+                    self.page.wait_for_load_state("domcontentloaded", timeout=max(1, remaining))
+                except PlaywrightError:
+                    break
+        record = WaitRecord(label, budget_ms, round((self._clock() - start) * 1000, 1), settled)
+        self.records.append(record)
+        return record
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "waits": len(self.records),
+            "budget_ms": round(sum(r.budget_ms for r in self.records), 1),
+            "waited_ms": round(sum(r.waited_ms for r in self.records), 1),
+            "sleep_removed_ms": round(sum(r.saved_ms for r in self.records), 1),
+            "over_budget": sum(1 for r in self.records if not r.settled),
+            "by_wait": [asdict(record) for record in self.records],
+        }
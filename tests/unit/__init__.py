@@ -0,0 +1 @@
+# Package marker for unit tests of the test infrastructure.
@@ -0,0 +1,105 @@
+import httpx
+import pytest
+
+from tests.utils.api_cache import CachingTransport, ResponseCache
+
+LIMITS = "http://stub/services/data/v61.0/limits"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(cache, calls):
+    def handler(request):
+        calls.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"DailyApiRequests": {"Max": 1}}, headers={"ETag": '"v1"'})
+
+    return httpx.Client(transport=CachingTransport(httpx.MockTransport(handler), cache))
+
+
+@pytest.mark.unit
+def test_fresh_entry_is_served_without_network():
+    cache, calls = ResponseCache(ttl=60), []
+    with _client(cache, calls) as client:
+        first = client.get(LIMITS)
+        second = client.get(LIMITS)
+
+    assert len(calls) == 1
+    assert first.extensions["api_cache"] == "miss"
+    assert second.extensions["api_cache"] == "hit"
+    assert second.json() == first.json()
+
+
+@pytest.mark.unit
+def test_stale_entry_is_revalidated_with_etag():
+    clock = FakeClock()
+    cache, calls = ResponseCache(ttl=10, clock=clock), []
+    with _client(cache, calls) as client:
+        client.get(LIMITS)
+        clock.now = 11
+        revalidated = client.get(LIMITS)
+        again = client.get(LIMITS)
+
+    assert calls[1].headers["if-none-match"] == '"v1"'
+    assert revalidated.extensions["api_cache"] == "revalidated"
+    assert revalidated.json()["DailyApiRequests"]["Max"] == 1
+    assert again.extensions["api_cache"] == "hit"
+    assert cache.stats.as_dict()["revalidated"] == 1
+
+
+@pytest.mark.unit
+def test_lru_evicts_least_recently_used_entry():
+    cache, calls = ResponseCache(ttl=60, max_entries=2), []
+    with _client(cache, calls) as client:
+        client.get(f"{LIMITS}?a=1")
+        client.get(f"{LIMITS}?b=1")
+        client.get(f"{LIMITS}?a=1")
+        client.get(f"{LIMITS}?c=1")
+        client.get(f"{LIMITS}?b=1")
+
+    assert [c.url.query for c in calls] == [b"a=1", b"b=1", b"c=1", b"b=1"]
+    assert cache.stats.evicted == 2
+
+
+@pytest.mark.unit
+def test_bypass_and_writes_skip_the_cache():
+    cache, calls = ResponseCache(ttl=60), []
+    with _client(cache, calls) as client:
+        client.get(LIMITS)
+        with cache.bypassed():
+            assert client.get(LIMITS).extensions["api_cache"] == "bypass"
+        client.post(LIMITS, json={})
+        assert client.get(LIMITS).extensions["api_cache"] == "miss"
+
+    assert len(calls) == 4
+
+
+@pytest.mark.unit
+def test_only_allowlisted_paths_are_cached():
+    cache, calls = ResponseCache(ttl=60), []
+    query = "http://stub/services/data/v61.0/query?q=SELECT+Id+FROM+Contact"
+    describe = "http://stub/services/data/v61.0/sobjects/Contact/describe"
+
+    def handler(request):
+        calls.append(request)
+        if "/sobjects/Contact/003" in request.url.path:
+            return httpx.Response(404, json=[{"errorCode": "NOT_FOUND"}])
+        return httpx.Response(200, json={"records": []})
+
+    with httpx.Client(transport=CachingTransport(httpx.MockTransport(handler), cache)) as client:
+        for url in (query, query, describe, describe):
+            client.get(url)
+        record = "http://stub/services/data/v61.0/sobjects/Contact/003000000000001"
+        client.get(record)
+        missing = client.get(record)
+
+    assert [c.url.path for c in calls].count("/services/data/v61.0/query") == 2
+    assert "api_cache" not in missing.extensions and len(calls) == 5
+    assert cache.stats.as_dict()["hit"] == 1 and len(cache) == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from tests.utils.api_client import ApiClientPool
+from tests.utils.metrics import MetricStore
+from tests.utils.sf_stub import run_stub_server
+
+
+@pytest.mark.unit
+def test_pool_reuses_connection_across_test_views():
+    with run_stub_server() as server:
+        pool = ApiClientPool(base_url=server.base_url)
+        try:
+            for _ in range(3):
+                with pool.view(lambda req: None, lambda res: None) as client:
+                    assert client.get("/services/data/v61.0/limits").status_code == 200
+        finally:
+            pool.close()
+
+    assert len(server.requests) == 3
+    assert server.connections == 1
+
+
+@pytest.mark.unit
+def test_each_view_captures_only_its_own_events():
+    with run_stub_server() as server:
+        pool = ApiClientPool(base_url=server.base_url)
+        first, second = [], []
+        try:
+            with pool.view(first.append, lambda res: first.append(res.status_code)) as client:
+                client.get("/services/data/v61.0/limits")
+            with pool.view(second.append, lambda res: second.append(res.status_code)) as client:
+                client.get("/services/data/v61.0/limits")
+                client.get("/services/data/v61.0/missing")
+            # fora de uma visão, os hooks não registram nada
+            pool.client.get("/services/data/v61.0/limits")
+        finally:
+            pool.close()
+
+    assert first[1:] == [200]
+    assert [item for item in second if isinstance(item, int)] == [200, 404]
+
+
+@pytest.mark.unit
+def test_conftest_hooks_record_sanitized_events_over_real_connection(monkeypatch):
+    from tests import conftest as conf
+
+    monkeypatch.setattr(conf, "API_METRICS", MetricStore())
+    events = []
+    on_request, on_response = conf._build_api_event_hooks("unit::pool", events)
+    with run_stub_server() as server:
+        pool = ApiClientPool(base_url=server.base_url, headers={"Authorization": "Bearer secret"})
+        try:
+            with pool.view(on_request, on_response) as client:
+                client.get("/services/data/v61.0/limits")
+        finally:
+            pool.close()
+
+    request_evt, response_evt = events
+    assert request_evt["headers"]["authorization"] == "[redacted]"
+    assert response_evt["status"] == 200
+    assert "DailyApiRequests" in response_evt["body"]
+    endpoint = conf.API_METRICS.summary()["by_endpoint"][0]
+    assert endpoint["endpoint"] == "GET /services/data/v61.0/limits"
+    assert endpoint["by_status_class"]["2xx"]["count"] == 1
@@ -0,0 +1,43 @@
+import httpx
+import pytest
+
+from tests.utils import api_response
+from tests.utils.api_client import ApiClientPool
+from tests.utils.metrics import MetricStore
+
+
+@pytest.mark.unit
+def test_hook_and_test_share_one_decode(monkeypatch):
+    from tests import conftest as conf
+
+    monkeypatch.setattr(conf, "API_METRICS", MetricStore())
+    decodes = []
+
+    def _counting_loads(content):
+        decodes.append(len(content))
+        return {"DailyApiRequests": {"Max": 15000, "Remaining": 14999}}
+
+    monkeypatch.setattr(api_response, "json_loads", _counting_loads)
+    transport = httpx.MockTransport(lambda req: httpx.Response(200, json={"DailyApiRequests": {}}))
+    pool = ApiClientPool(base_url="http://stub", transport=transport)
+    events = []
+    try:
+        with pool.view(*conf._build_api_event_hooks("unit::decode", events)) as client:
+            response = client.get("/services/data/v61.0/limits")
+            assert response.json()["DailyApiRequests"]["Max"] == 15000
+            assert response.json() is response.json()
+    finally:
+        pool.close()
+
+    assert isinstance(response, api_response.ApiResponse)
+    assert events[-1]["body"]["DailyApiRequests"]["Remaining"] == 14999
+    assert len(decodes) == 1
+
+
+@pytest.mark.unit
+def test_invalid_json_raises_every_time_and_hook_logs_text():
+    response = api_response.decode_once(httpx.Response(200, content=b"<html>erro</html>"))
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            response.json()
+    assert response.text == "<html>erro</html>"
@@ -0,0 +1,71 @@
+import pytest
+
+from tests.utils.artifacts import ArtifactPolicy, begin_trace, end_trace, finish_videos
+
+
+class _FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **kwargs):
+        self.calls.append("start")
+
+    def start_chunk(self):
+        self.calls.append("start_chunk")
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+        if path:
+            open(path, "wb").close()
+
+
+class _FakeContext:
+    def __init__(self):
+        self.tracing = _FakeTracing()
+
+
+class _FakeVideo:
+    def __init__(self, path):
+        self._path = path
+        path.write_bytes(b"webm")
+
+    def path(self):
+        return str(self._path)
+
+    def delete(self):
+        self._path.unlink()
+
+
+@pytest.mark.unit
+def test_policy_keeps_artifacts_per_mode_and_samples_deterministically():
+    nodeids = [f"tests/ui/test_x.py::test_{i}" for i in range(1000)]
+    assert not any(ArtifactPolicy("off").keep(n, failed=True) for n in nodeids)
+    assert all(ArtifactPolicy("always").keep(n, failed=False) for n in nodeids)
+    on_failure = ArtifactPolicy("on-failure")
+    assert on_failure.keep(nodeids[0], failed=True) and not on_failure.keep(nodeids[0], failed=False)
+
+    sampled = ArtifactPolicy("sampled", sample_rate=0.1)
+    kept = [n for n in nodeids if sampled.keep(n, failed=False)]
+    assert 50 < len(kept) < 150
+    assert kept == [n for n in nodeids if ArtifactPolicy("sampled", 0.1).keep(n, failed=False)]
+    assert all(sampled.keep(n, failed=True) for n in nodeids)
+
+    with pytest.raises(ValueError):
+        ArtifactPolicy("retain-on-failure")
+
+
+@pytest.mark.unit
+def test_trace_chunks_share_one_tracing_session_and_passing_videos_are_deleted(tmp_path):
+    context = _FakeContext()
+    begin_trace(context)
+    assert end_trace(context, None) is None
+    begin_trace(context)
+    assert end_trace(context, tmp_path / "t2.zip") == tmp_path / "t2.zip"
+    assert context.tracing.calls == [
+        "start", "start_chunk", ("stop_chunk", None), "start_chunk", ("stop_chunk", str(tmp_path / "t2.zip")),
+    ]
+
+    passed = _FakeVideo(tmp_path / "a.webm")
+    assert finish_videos([passed], keep=False) == [] and not (tmp_path / "a.webm").exists()
+    failed = _FakeVideo(tmp_path / "b.webm")
+    assert finish_videos([failed], keep=True) == [tmp_path / "b.webm"]
@@ -0,0 +1,58 @@
+import httpx
+import pytest
+
+from tests.utils.api_client import AsyncApiClient
+from tests.utils.metrics import MetricStore
+from tests.utils.sf_stub import SalesforceStubApp
+
+LIMITS = "/services/data/v61.0/limits"
+
+
+def _client(app, events_or_hooks, max_concurrency=10):
+    on_request, on_response = events_or_hooks
+    return AsyncApiClient(
+        base_url="http://stub",
+        on_request=on_request,
+        on_response=on_response,
+        max_concurrency=max_concurrency,
+        transport=httpx.ASGITransport(app=app),
+    )
+
+
+@pytest.mark.unit
+def test_fan_out_respects_semaphore_limit_and_keeps_order():
+    app = SalesforceStubApp(latency_ms=20)
+    client = _client(app, (lambda req: None, lambda res: None))
+    calls = [("GET", LIMITS)] * 12 + [("GET", "/services/data/v61.0/missing")]
+    try:
+        responses = client.run_fan_out(calls, limit=4)
+    finally:
+        client.close()
+
+    assert [r.status_code for r in responses] == [200] * 12 + [404]
+    assert app.max_in_flight == 4
+
+
+@pytest.mark.unit
+def test_async_events_match_sync_log_format(monkeypatch):
+    from tests import conftest as conf
+
+    monkeypatch.setattr(conf, "API_METRICS", MetricStore())
+    sync_events, async_events = [], []
+
+    sync_hooks = conf._build_api_event_hooks("unit::sync", sync_events)
+    transport = httpx.MockTransport(lambda req: httpx.Response(200, json={"ok": True}))
+    with httpx.Client(base_url="http://stub", transport=transport, event_hooks={"request": [sync_hooks[0]], "response": [sync_hooks[1]]}) as sync_client:
+        sync_client.get(LIMITS)
+
+    client = _client(SalesforceStubApp(), conf._build_api_event_hooks("unit::async", async_events))
+    try:
+        client.run_fan_out([("GET", LIMITS), ("GET", LIMITS)])
+    finally:
+        client.close()
+
+    sync_keys = {evt["type"]: evt.keys() for evt in sync_events}
+    assert [evt["type"] for evt in async_events].count("response") == 2
+    for evt in async_events:
+        assert evt.keys() == sync_keys[evt["type"]]
+    assert len(conf.API_METRICS) == 3
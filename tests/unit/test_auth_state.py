@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from tests.utils.auth_state import AuthStateBootstrap, state_expiry
+
+
+def _state(expires=-1):
+    return {"cookies": [{"name": "sid", "value": "00D!abc", "domain": "x.my.salesforce.com", "expires": expires}], "origins": []}
+
+
+@pytest.mark.unit
+def test_expiry_comes_from_sid_cookie_or_file_age():
+    assert state_expiry({"cookies": [{"name": "BrowserId", "expires": 99}]}, 0, 7200) is None
+    assert state_expiry(_state(), written_at=1000, max_age=7200) == 8200
+    assert state_expiry(_state(expires=5000), written_at=1000, max_age=7200) == 5000
+
+
+@pytest.mark.unit
+def test_one_worker_logs_in_others_wait_and_stale_state_is_refreshed(tmp_path):
+    path = tmp_path / "auth-state.json"
+    logins = []
+
+    def _login():
+        logins.append(threading.current_thread().name)
+        time.sleep(0.2)
+        return _state()
+
+    workers = [AuthStateBootstrap(path, _login, max_age=7200, refresh_margin=600) for _ in range(6)]
+    threads = [threading.Thread(target=worker.ensure) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(logins) == 1 and json.loads(path.read_text()) == _state()
+
+    # Perto do timeout de sessão a próxima checagem loga de novo, antes de o estado expirar.
+    old = time.time() - (7200 - 599)
+    os.utime(path, (old, old))
+    late = AuthStateBootstrap(path, _login, max_age=7200, refresh_margin=600)
+    assert not late.is_fresh()
+    late.ensure()
+    assert late.is_fresh()
+    assert len(logins) == 2
+
+    broken = AuthStateBootstrap(tmp_path / "other.json", lambda: {"cookies": []})
+    with pytest.raises(RuntimeError, match="sid"):
+        broken.ensure()
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from tests.utils.cassette import Cassette, CassetteMissError, CassetteTransport, interaction_key
+
+
+def _sanitize_headers(headers):
+    return {k: "[redacted]" if k.lower() == "authorization" else v for k, v in headers.items()}
+
+
+def _sanitize_body(body):
+    if isinstance(body, dict):
+        return {k: "[redacted]" if k == "token" else v for k, v in body.items()}
+    return body.decode() if isinstance(body, bytes) else body
+
+
+def _online(request):
+    return httpx.Response(200, json={"echo": request.url.path, "token": "abc"})
+
+
+@pytest.mark.unit
+def test_key_normalizes_query_order_and_json_body():
+    assert interaction_key("get", "/x", "b=2&a=1", b'{"k": 1, "j": 2}') == interaction_key(
+        "GET", "/x", "a=1&b=2", b'{"j":2,"k":1}'
+    )
+    assert interaction_key("GET", "/x", "", b"") != interaction_key("GET", "/x", "", b"{}")
+
+
+@pytest.mark.unit
+def test_recorded_interactions_replay_offline_and_sanitized(tmp_path):
+    path = tmp_path / "api.jsonl"
+    recorder = Cassette(path, _sanitize_headers, _sanitize_body)
+    recorder.reset()
+    online = CassetteTransport(httpx.MockTransport(_online), recorder, "record")
+    with httpx.Client(base_url="https://org.example", transport=online, headers={"Authorization": "Bearer s3cr3t"}) as client:
+        client.get("/services/data/v61.0/limits", params={"b": 2, "a": 1})
+
+    assert "s3cr3t" not in path.read_text(encoding="utf-8")
+
+    def _offline(request):
+        raise AssertionError("replay não deve ir à rede")
+
+    replayer = CassetteTransport(httpx.MockTransport(_offline), Cassette(path, _sanitize_headers, _sanitize_body).load(), "replay")
+    with httpx.Client(base_url="https://outra-org.example", transport=replayer) as client:
+        response = client.get("/services/data/v61.0/limits?a=1&b=2")
+        assert response.json() == {"echo": "/services/data/v61.0/limits", "token": "[redacted]"}
+        assert response.extensions["cassette"] == "replay"
+
+        with pytest.raises(CassetteMissError):
+            client.get("/services/data/v61.0/sobjects")
@@ -0,0 +1,136 @@
+import pytest
+
+from tests.ui.playwright.context_pool import BrowserContextPool
+
+LOAD_S = 5.0
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakePage:
+    def __init__(self, context, clock):
+        self.context, self.clock = context, clock
+        self.video = None
+        self.ready_at = None
+
+    def goto(self, url, wait_until=None):
+        # A carga segue "no browser" depois do commit.
+        self.ready_at = self.clock.now + LOAD_S
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        if self.context.broken:
+            raise RuntimeError("Target crashed")
+        self.clock.now = max(self.clock.now, self.ready_at)
+
+    def evaluate(self, script):
+        if self.context.storage_error:
+            raise RuntimeError("Execution context was destroyed, most likely because of a navigation")
+        self.context.calls.append("clear_storage")
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self, clock):
+        self.clock, self.pages, self.calls, self.broken, self.closed = clock, [], [], False, False
+        self.storage_error = False
+        self.jar = [{"name": "sid", "value": "00D!sessao"}, {"name": "BrowserId", "value": "dispositivo"}]
+
+    def new_page(self):
+        page = _FakePage(self, self.clock)
+        self.pages.append(page)
+        return page
+
+    def unroute_all(self, behavior=None):
+        self.calls.append("unroute_all")
+
+    def clear_permissions(self):
+        self.calls.append("clear_permissions")
+
+    def set_extra_http_headers(self, headers):
+        self.calls.append("headers")
+
+    def cookies(self):
+        return list(self.jar)
+
+    def clear_cookies(self):
+        self.storage_error = False
+        self.jar = []
+
+    def add_cookies(self, cookies):
+        self.jar.extend(cookies)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.unit
+def test_leases_come_back_warm_and_reset_and_report_time_saved():
+    clock = _Clock()
+    created = []
+
+    def _new_context():
+        clock.now += 1.0  # custo de criar o contexto
+        created.append(_FakeContext(clock))
+        return created[-1]
+
+    pool = BrowserContextPool(_new_context, "https://org.lightning.force.com/lightning/page/home", size=2, clock=clock)
+    pool.start()
+    assert pool.cold_ms == pytest.approx((1.0 + LOAD_S) * 1000)
+
+    first = pool.lease("t1")
+    first.context.new_page()  # o teste abre uma aba extra
+    first.context.jar.append({"name": "renderCtx", "value": "estado do teste"})
+    clock.now += 10  # o teste roda; o outro contexto já terminou de carregar
+    pool.release(first)
+    # Storage limpo nas duas abas do teste, antes de fechá-las.
+    assert first.context.calls == ["clear_storage", "clear_storage", "unroute_all", "clear_permissions", "headers"]
+    assert [cookie["name"] for cookie in first.context.jar] == ["sid", "BrowserId"]
+    assert first.context.pages == [first.page] and first.page.ready_at == clock.now + LOAD_S
+
+    second = pool.lease("t2")
+    assert second.context is created[1]
+    pool.release(second)
+    # Volta ao primeiro contexto logo em seguida: espera só o que falta da carga em segundo plano.
+    third = pool.lease("t3")
+    assert third.context is created[0]
+
+    records = {record.test: record for record in pool.records}
+    assert records["t1"].lease_ms == 0 and records["t1"].saved_ms == pytest.approx(6000)
+    assert records["t3"].lease_ms == pytest.approx(LOAD_S * 1000) and records["t3"].saved_ms == pytest.approx(1000)
+    summary = pool.summary()
+    assert summary["warm_leases"] == 3 and summary["saved_ms_total"] == pytest.approx(13000)
+
+    # Contexto que quebrou em segundo plano é descartado e trocado por um novo (lease a frio).
+    pool.release(third)
+    created[1].broken = True
+    fourth = pool.lease("t4")
+    assert created[1].closed and fourth.context is created[2] and not pool.records[-1].warm
+    pool.close()
+
+
+@pytest.mark.unit
+def test_storage_clear_failure_does_not_discard_the_context():
+    clock = _Clock()
+    created = []
+
+    def _new_context():
+        created.append(_FakeContext(clock))
+        return created[-1]
+
+    pool = BrowserContextPool(_new_context, "https://org.lightning.force.com/lightning/page/home", size=1, clock=clock)
+    pool.start()
+    slot = pool.lease("t1")
+    slot.context.storage_error = True  # aba no meio de um redirect
+    pool.release(slot)
+
+    assert not created[0].closed and len(created) == 1
+    assert pool.lease("t2").context is created[0] and pool.records[-1].warm
+    pool.close()
@@ -0,0 +1,88 @@
+import httpx
+import pytest
+
+from tests.utils.data_builder import CompositeGraphError, RecordGraphBuilder, contact_fields_from_form
+from tests.utils.sf_stub import run_stub_server
+
+CONTACT = {
+    "salutation": "Sr.",
+    "firstName": "Ana",
+    "lastName": "Souza",
+    "birthdate": "05/03/1990",
+    "email": "ana@example.com",
+    "mailing_city": "Campinas",
+    "fax": "",
+}
+
+
+@pytest.mark.unit
+def test_contact_form_dict_maps_to_api_fields():
+    fields = contact_fields_from_form(CONTACT, account_ref="account")
+
+    assert fields == {
+        "Salutation": "Mr.",
+        "FirstName": "Ana",
+        "LastName": "Souza",
+        "Birthdate": "1990-03-05",
+        "Email": "ana@example.com",
+        "MailingCity": "Campinas",
+        "AccountId": "@{account.id}",
+    }
+
+
+@pytest.mark.unit
+def test_account_contact_opportunity_created_in_one_round_trip():
+    with run_stub_server() as server, httpx.Client(base_url=server.base_url) as client:
+        builder = RecordGraphBuilder(client, "v61.0")
+        builder.add_account_contact_opportunity(
+            {"Name": "ACME"},
+            CONTACT,
+            {"Name": "ACME - Renovação", "StageName": "Prospecting", "CloseDate": "2030-01-31"},
+        )
+        ids = builder.build()
+
+        assert len(server.requests) == 1
+        assert set(ids) == {"account", "contact", "opportunity"}
+        assert ids["contact"].startswith("003")
+        assert server.records[ids["contact"]]["AccountId"] == ids["account"]
+        assert server.records[ids["opportunity"]]["ContactId"] == ids["contact"]
+
+        builder.cleanup()
+        assert server.records == {}
+
+
+@pytest.mark.unit
+def test_failed_graph_is_rolled_back_and_reports_errors():
+    with run_stub_server() as server, httpx.Client(base_url=server.base_url) as client:
+        builder = RecordGraphBuilder(client, "v61.0")
+        builder.add("Account", {"Name": "ACME"}, ref="account")
+        builder.add("Contact", {"FirstName": "Sem sobrenome"}, ref="contact")
+
+        with pytest.raises(CompositeGraphError) as error:
+            builder.build()
+
+        assert error.value.errors[0]["referenceId"] == "contact"
+        assert server.records == {}
+
+
+@pytest.mark.unit
+def test_cleanup_reports_records_left_in_the_org():
+    with run_stub_server() as server, httpx.Client(base_url=server.base_url) as client:
+        builder = RecordGraphBuilder(client, "v61.0")
+        builder.add_account_contact_opportunity({"Name": "ACME"}, CONTACT)
+        ids = builder.build()
+        del server.records[ids["contact"]]  # já excluído pelo próprio teste
+
+        def _delete_blocked(stub, match, request):
+            return 200, {}, [
+                {"id": ids["account"], "success": False,
+                 "errors": [{"statusCode": "DELETE_FAILED", "message": "conta com oportunidade aberta"}]},
+                {"id": ids["contact"], "success": False,
+                 "errors": [{"statusCode": "ENTITY_IS_DELETED", "message": "entity is deleted"}]},
+            ]
+
+        server.add_route("DELETE", r"/services/data/[^/]+/composite/sobjects/?", _delete_blocked)
+        failures = builder.cleanup()
+
+        assert failures == {ids["account"]: "DELETE_FAILED: conta com oportunidade aberta"}
+        assert builder.created == {"account": ids["account"]}
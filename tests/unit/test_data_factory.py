@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from validate_docbr import CNPJ, CPF
+
+from tests.utils.data_builder import contact_fields_from_form
+from tests.utils.data_factory import DataFactory, valid_phone
+
+NODEID = "tests/ui/playwright/test_contact_playwright.py::test_create_contact_full_form[chromium]"
+
+
+@pytest.mark.unit
+def test_same_nodeid_and_seed_reproduce_the_same_records():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        factory = DataFactory(1234, batch_size=2, executor=executor)
+        factory.prefetch(NODEID)
+        stream = factory.stream(NODEID)
+        contacts = [stream.contact() for _ in range(3)]
+        account, cpf, phone = stream.account(), stream.cpf(), stream.phone()
+
+    again = DataFactory(1234, batch_size=2).stream(NODEID)
+    assert [again.contact() for _ in range(3)] == contacts
+    assert (again.account(), again.cpf(), again.phone()) == (account, cpf, phone)
+    assert DataFactory(1235).stream(NODEID).contact() != contacts[0]
+    assert DataFactory(1234).stream(NODEID.replace("create", "edit")).contact() != contacts[0]
+
+    assert CPF().validate(cpf) and CPF().validate(contacts[0].cpf) and CNPJ().validate(account.cnpj)
+    assert all(valid_phone(value) for value in (phone, contacts[0].mobile, account.phone))
+    # O dict do formulário continua compatível com o builder da API.
+    assert contact_fields_from_form(contacts[0].as_form())["MailingCity"] == contacts[0].mailing.city
+    assert stream.summary()["drawn"] == {"contact": 3, "account": 1}
+
+
+@pytest.mark.unit
+def test_pools_are_reused_from_disk(tmp_path):
+    first = DataFactory(7, cache_dir=tmp_path)
+    contact = first.stream(NODEID).contact()
+    assert first.stats == {"batches_generated": 1, "batches_from_disk": 0}
+
+    second = DataFactory(7, cache_dir=tmp_path)
+    assert second.stream(NODEID).contact() == contact
+    assert second.stats == {"batches_generated": 0, "batches_from_disk": 1}
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.utils.data_registry import DataRegistry
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+def test_each_record_is_leased_to_one_worker_at_a_time(tmp_path):
+    path = tmp_path / "registry.sqlite"
+    creator = DataRegistry(path, org="org").for_owner("create")
+    for index in range(8):
+        creator.register("Contact", {"fullName": f"Contato {index}"})
+
+    def lease_one(worker: int):
+        # Uma conexão por worker, como processos do xdist.
+        registry = DataRegistry(path, org="org").for_owner(f"gw{worker}")
+        try:
+            lease = registry.lease("Contact")
+            return lease.key if lease else None
+        finally:
+            registry.close()
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        keys = list(executor.map(lease_one, range(10)))
+
+    leased = [key for key in keys if key is not None]
+    assert len(leased) == 8 and len(set(leased)) == 8 and keys.count(None) == 2
+    assert DataRegistry(path, org="other").lease("Contact") is None
+
+
+@pytest.mark.unit
+def test_expired_and_failed_leases_become_orphans(tmp_path):
+    clock = _Clock()
+    registry = DataRegistry(tmp_path / "registry.sqlite", org="org", lease_ttl=60, clock=clock)
+    edit = registry.for_owner("edit")
+    delete = registry.for_owner("delete")
+    first = edit.register("Contact", {"fullName": "Ana Souza", "editCount": 0})
+    second = edit.register("Contact", {"fullName": "Bia Lima", "editCount": 0})
+
+    lease = edit.lease("Contact")
+    assert lease.key == first and lease.data["fullName"] == "Ana Souza"
+    clock.now += 1
+    edit.release(lease.key, data={"fullName": "Ana EDITADO 1 Souza", "editCount": 1})
+
+    # O mais antigo livre sai primeiro; o editado voltou para o fim da fila.
+    lease = delete.lease("Contact")
+    assert lease.key == second
+    delete.consume(lease.key)
+
+    # Teste que morreu sem devolver: depois do TTL o registro vira órfão e não é emprestado de novo.
+    crashed = registry.for_owner("crashed").lease("Contact")
+    assert crashed.data["editCount"] == 1
+    clock.now += 61
+    assert registry.lease("Contact") is None
+    assert [record.key for record in registry.orphans("Contact")] == [first]
+
+    # Fim de teste que falhou: o empréstimo aberto vira órfão na hora; se passou, volta a ficar livre.
+    third = edit.register("Contact", {"fullName": "Caio Reis"})
+    assert edit.lease("Contact").key == third
+    assert edit.settle_owner(failed=False) == [third]
+    assert delete.lease("Contact").key == third
+    assert delete.settle_owner(failed=True) == [third]
+    assert registry.summary()["by_sobject"]["Contact"] == {"available": 0, "leased": 0, "orphan": 2}
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from tests.utils.event_sink import ApiEventSink
+
+
+@pytest.mark.unit
+def test_sink_streams_every_event_but_keeps_bounded_tail(tmp_path):
+    sink = ApiEventSink(tmp_path / "test.jsonl", tail_size=3)
+    for index in range(10):
+        sink.append({"type": "response", "index": index})
+    sink.flush()
+
+    lines = (tmp_path / "test.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["index"] for line in lines] == list(range(10))
+    assert [evt["index"] for evt in sink] == [7, 8, 9]
+    assert len(sink) == 10
+    sink.close()
+
+
+@pytest.mark.unit
+def test_sink_without_events_creates_no_file_and_reopens_in_append_mode(tmp_path):
+    path = tmp_path / "test.jsonl"
+    sink = ApiEventSink(path)
+    sink.close()
+    assert not path.exists()
+
+    sink.append({"type": "request"})
+    sink.close()
+    sink.append({"type": "response"})
+    sink.close()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,77 @@
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+from tests.ui.playwright.utils import fill_record_form
+
+
+class _FakeLocator:
+    def __init__(self, scope, selector):
+        self.scope, self.selector = scope, selector
+
+    def nth(self, index):
+        return _FakeLocator(self.scope, f"{self.selector} >> nth={index}")
+
+    @property
+    def first(self):
+        return self.nth(0)
+
+    def locator(self, selector):
+        return _FakeLocator(self.scope, f"{self.selector} >> {selector}")
+
+    def wait_for(self, state=None, timeout=None):
+        if self.selector in self.scope.never_ready:
+            raise PlaywrightTimeout("Timeout exceeded")
+
+    def fill(self, value, timeout=None):
+        self.scope.fills.append((self.selector, value))
+
+
+class _FakeModal(_FakeLocator):
+    """Modal cujo evaluate devolve o plano pronto; guarda os campos enviados para a página."""
+
+    def __init__(self, plan, never_ready=()):
+        super().__init__(self, "modal")
+        self.plan, self.never_ready = plan, set(never_ready)
+        self.evaluated, self.fills = [], []
+
+    def locator(self, selector):
+        return _FakeLocator(self, selector)
+
+    def evaluate(self, expression, arg):
+        self.evaluated.append(arg)
+        return self.plan
+
+
+@pytest.mark.unit
+def test_one_evaluate_fills_plain_inputs_and_only_comboboxes_fall_back():
+    modal = _FakeModal(
+        {
+            "filled": ["firstName", "street", "street[1]"],
+            "fallback": [
+                {"key": "Languages__c", "rule": "field", "reason": "combobox"},
+                {"key": "AccountId", "rule": "name", "reason": "lookup"},
+            ],
+            "unresolved": ["Fax"],
+        },
+        never_ready={"[name='AccountId'] >> nth=0"},
+    )
+    result = fill_record_form(modal, {
+        "firstName": "Ana",
+        "street": ["Rua A", "Rua B"],
+        "Languages__c": "Português",
+        "AccountId": "Acme",
+        "Fax": "1",
+    })
+
+    assert len(modal.evaluated) == 1
+    assert [(f["key"], f["nth"], f["value"]) for f in modal.evaluated[0][1:3]] == [
+        ("street", 0, "Rua A"),
+        ("street[1]", 1, "Rua B"),
+    ]
+    assert modal.fills == [
+        ("lightning-input-field[field-name='Languages__c'] >> nth=0 >> input, textarea >> nth=0", "Português")
+    ]
+    assert result.filled == ["firstName", "street", "street[1]"]
+    assert result.fallback == ["Languages__c"]
+    assert result.unresolved == ["Fax", "AccountId"]
+    assert result.round_trips == 5 and result.elapsed_ms >= 0
@@ -0,0 +1,36 @@
+import threading
+import time
+
+import pytest
+
+from tests.utils.load import LoadConfig, run_load, summarize
+
+
+@pytest.mark.unit
+def test_closed_loop_uses_all_workers_and_counts_errors():
+    calls, threads = [], set()
+
+    def _scenario():
+        threads.add(threading.current_thread().name)
+        calls.append(1)
+        time.sleep(0.005)
+        if len(calls) % 4 == 0:
+            raise AssertionError("status 500")
+
+    result = run_load("unit::closed", _scenario, LoadConfig(duration=0.3, concurrency=3))
+
+    assert len(threads) == 3 and threading.current_thread().name not in threads
+    assert result.iterations == len(calls) and result.errors > 0
+    assert result.error_samples == ["AssertionError: status 500"]
+    assert summarize([result])["error_rate"] == round(result.errors / result.iterations * 100, 2)
+
+
+@pytest.mark.unit
+def test_open_loop_measures_from_schedule_so_queueing_shows_in_latency():
+    # 100 it/s com um worker de 20 ms: a fila cresce e a latência tem que refletir isso.
+    result = run_load("unit::open", lambda: time.sleep(0.02), LoadConfig(duration=0.3, concurrency=1, rps=100))
+
+    assert result.scheduled == 30
+    assert result.iterations + result.dropped == 30
+    assert result.histogram.max > 100
+    assert summarize([result])["mode"] == "open"
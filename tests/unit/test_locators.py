@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+from tests.ui.playwright.locators import LocatorResolver, LocatorWinnerCache
+
+
+class _FakePage:
+    url = "https://org.lightning.force.com/lightning/r/Contact/003/view"
+
+    def __init__(self, present):
+        self.present = set(present)
+        self.calls = []
+
+    def evaluate(self, expression):
+        self.calls.append("evaluate")
+        return "pt-BR"
+
+
+class _FakeLocator:
+    """Locator com só o que o resolver usa; cada count()/wait_for() conta uma ida ao browser."""
+
+    def __init__(self, page, names):
+        self.page, self.names = page, tuple(names)
+
+    def or_(self, other):
+        return _FakeLocator(self.page, self.names + other.names)
+
+    def filter(self, visible=None):
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    def count(self):
+        self.page.calls.append(("count",) + self.names)
+        return sum(1 for name in self.names if name in self.page.present)
+
+    def wait_for(self, state=None, timeout=None):
+        self.page.calls.append(("wait_for",) + self.names)
+        if not self.count():
+            raise PlaywrightTimeout("Timeout exceeded")
+
+
+def _candidates(page):
+    return {name: _FakeLocator(page, [name]) for name in ("record-edit", "title-editar", "role-editar")}
+
+
+@pytest.mark.unit
+def test_winner_is_remembered_and_checked_first_on_the_next_run(tmp_path):
+    cache_path = tmp_path / "locator-winners.json"
+    page = _FakePage(present={"role-editar"})
+    resolver = LocatorResolver(page, LocatorWinnerCache(cache_path))
+
+    assert resolver.resolve("contato.editar", _candidates(page)).names == ("role-editar",)
+    cold = resolver.records[-1]
+    # União + três identificações, contra count()/is_visible() nos três candidatos.
+    assert (cold.winner, cold.cached, cold.round_trips, cold.legacy_round_trips) == ("role-editar", False, 4, 6)
+    resolver.cache.save()
+    assert json.loads(cache_path.read_text(encoding="utf-8")) == {
+        "org.lightning.force.com|pt-BR|contato.editar": "role-editar"
+    }
+
+    # Outra execução (novo cache lido do disco) vai direto ao vencedor.
+    page = _FakePage(present={"role-editar"})
+    warm = LocatorResolver(page, LocatorWinnerCache(cache_path))
+    warm.resolve("contato.editar", _candidates(page))
+    assert page.calls == ["evaluate", ("count", "role-editar")]
+    assert warm.summary()["saved_round_trips"] == 5 and warm.summary()["cache_hits"] == 1
+
+    # Vencedor sumiu (release nova): volta para a união e grava o novo vencedor.
+    page = _FakePage(present={"title-editar"})
+    healed = LocatorResolver(page, LocatorWinnerCache(cache_path))
+    assert healed.resolve("contato.editar", _candidates(page)).names == ("title-editar",)
+    assert healed.cache.get("org.lightning.force.com|pt-BR|contato.editar") == "title-editar"
+    assert healed.resolve("contato.excluir", {"x": _FakeLocator(page, ["x"])}, timeout_ms=10) is None
+
+
+@pytest.mark.unit
+def test_save_merges_winners_written_by_other_workers(tmp_path):
+    cache_path = tmp_path / "locator-winners.json"
+    first, second = LocatorWinnerCache(cache_path), LocatorWinnerCache(cache_path)
+    first.put("org|pt-BR|contato.editar", "record-edit")
+    second.put("org|pt-BR|contato.salvar", "save-edit")
+    first.save()
+    second.save()
+
+    assert LocatorWinnerCache(cache_path).winners == {
+        "org|pt-BR|contato.editar": "record-edit",
+        "org|pt-BR|contato.salvar": "save-edit",
+    }
+    with pytest.raises(ValueError):
+        LocatorResolver(_FakePage(()), first).resolve("contato.editar", {}, state="hidden")
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from tests.utils.metrics import LatencyHistogram, MetricStore, normalize_endpoint
+
+
+@pytest.mark.unit
+def test_histogram_quantiles_stay_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+    hist = LatencyHistogram(relative_accuracy=0.01)
+    for value in values:
+        hist.add(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(hist.quantile(q) - exact) / exact <= 0.02
+    assert hist.max == max(values)
+
+
+@pytest.mark.unit
+def test_store_merge_matches_single_store_and_round_trips():
+    single, left, right = MetricStore(), MetricStore(), MetricStore()
+    for index in range(200):
+        status = 500 if index % 10 == 0 else 200
+        single.record("GET", "/services/data/v61.0/limits", status, float(index + 1))
+        (left if index % 2 else right).record("GET", "/services/data/v61.0/limits", status, float(index + 1))
+    left.increment("cache", "hit")
+
+    merged = MetricStore.from_dict(right.to_dict())
+    merged.merge(left)
+    summary = merged.summary()
+    assert summary["by_endpoint"] == single.summary()["by_endpoint"]
+    assert summary["failed"] == 20
+    assert set(summary["by_endpoint"][0]["by_status_class"]) == {"2xx", "5xx"}
+    assert merged.counters == {"cache": {"hit": 1}}
+
+
+@pytest.mark.unit
+def test_record_ids_are_collapsed_into_one_endpoint():
+    assert normalize_endpoint("/services/data/v61.0/sobjects/Contact/003000000000001AAA") == (
+        "/services/data/v61.0/sobjects/Contact/{id}"
+    )
+    assert normalize_endpoint("/services/data/v61.0/sobjects/Opportunities") == "/services/data/v61.0/sobjects/Opportunities"
+
+
+@pytest.mark.unit
+def test_xdist_workers_spool_and_controller_merges_one_report(monkeypatch, tmp_path):
+    from types import SimpleNamespace
+
+    from tests import conftest as conf
+    from tests.utils.load import LoadConfig, LoadResult, summarize
+
+    monkeypatch.setattr(conf, "API_METRICS_SPOOL_DIR", tmp_path / "spool")
+    config = LoadConfig(duration=1, concurrency=2)
+    expected = MetricStore()
+    for worker, started_at in (("gw0", 100.0), ("gw1", 100.5)):
+        store = MetricStore()
+        for ms in range(1, 101):
+            store.record("GET", "/services/data/v61.0/limits", 200, ms * (2 if worker == "gw1" else 1))
+            expected.record("GET", "/services/data/v61.0/limits", 200, ms * (2 if worker == "gw1" else 1))
+        store.increment("cache", "hit")
+        expected.increment("cache", "hit")
+        monkeypatch.setattr(conf, "API_METRICS", store)
+        monkeypatch.setattr(conf, "LOAD_RESULTS", [LoadResult("t", config, iterations=10, elapsed_s=1.0, started_at=started_at)])
+        assert conf._xdist_worker_id(SimpleNamespace(workerinput={"workerid": worker})) == worker
+        conf._spool_worker_metrics(worker)
+
+    monkeypatch.setattr(conf, "API_METRICS", MetricStore())
+    monkeypatch.setattr(conf, "LOAD_RESULTS", [])
+    assert conf._xdist_worker_id(SimpleNamespace()) is None
+    conf._merge_spooled_metrics()
+
+    assert conf.API_METRICS.summary() == expected.summary()
+    assert conf.API_METRICS.counters == {"cache": {"hit": 2}}
+    # Os cenários se sobrepõem: 20 iterações em 1.5 s de parede, não em 2 s somados.
+    assert summarize(conf.LOAD_RESULTS)["throughput_rps"] == round(20 / 1.5, 2)
+    assert not (tmp_path / "spool").exists()
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from tests.utils.api_client import ApiClientPool
+from tests.utils.filelock import FileLock, FileLockTimeout
+from tests.utils.oauth import TOKEN_PATH, OAuthAuth, OAuthError, TokenProvider, client_credentials_form, fetch_token
+from tests.utils.sf_stub import run_stub_server
+
+
+def _provider(server, cache_path, ttl=7200.0, secret="stub-secret", **kwargs):
+    fetch = partial(fetch_token, f"{server.base_url}{TOKEN_PATH}", partial(client_credentials_form, "stub-client", secret), ttl=ttl)
+    return TokenProvider(fetch, cache_path, **kwargs)
+
+
+@pytest.mark.unit
+def test_file_lock_is_exclusive_and_breaks_stale_locks(tmp_path):
+    lock_path = tmp_path / "state.lock"
+    with FileLock(lock_path):
+        with pytest.raises(FileLockTimeout):
+            FileLock(lock_path, timeout=0.1).acquire()
+    assert not lock_path.exists()
+
+    lock_path.write_text("99999\n")
+    with FileLock(lock_path, timeout=1, stale_after=-1):
+        assert lock_path.read_text() == f"{os.getpid()}\n"
+
+
+@pytest.mark.unit
+def test_file_lock_only_removes_the_lock_it_owns(tmp_path):
+    lock_path = tmp_path / "state.lock"
+    other_path = tmp_path / "other.lock"
+
+    # Outro processo quebrou o lock (achou velho) e criou o seu: o release não pode apagá-lo.
+    lock = FileLock(lock_path)
+    lock.acquire()
+    other_path.write_text("4242\n")
+    os.replace(other_path, lock_path)
+    lock.release()
+    assert lock_path.read_text() == "4242\n"
+
+    # Quebra de lock velho que perdeu a corrida: o arquivo já é outro e volta para o lugar.
+    stale = os.stat(lock_path)
+    other_path.write_text("4343\n")
+    os.replace(other_path, lock_path)
+    assert FileLock(lock_path)._remove_if((stale.st_dev, stale.st_ino)) is False
+    assert lock_path.read_text() == "4343\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["state.lock"]
+
+
+@pytest.mark.unit
+def test_processes_share_one_token_until_it_nears_expiry(tmp_path):
+    cache_path = tmp_path / "sf-token.json"
+    with run_stub_server() as server:
+        # Um provider por "worker": todos disputam o mesmo arquivo, só um vai ao endpoint.
+        providers = [_provider(server, cache_path) for _ in range(8)]
+        tokens = []
+        threads = [threading.Thread(target=lambda p=p: tokens.append(p.token())) for p in providers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert server.tokens_issued == 1
+        assert {token.access_token for token in tokens} == {tokens[0].access_token}
+        assert tokens[0].instance_url == server.base_url
+
+        now = [time.time()]
+        late = _provider(server, cache_path, refresh_margin=300, clock=lambda: now[0])
+        assert late.token().access_token == tokens[0].access_token
+        now[0] += 7200 - 299
+        assert late.token().access_token != tokens[0].access_token and server.tokens_issued == 2
+
+        with pytest.raises(OAuthError, match="invalid_client"):
+            _provider(server, tmp_path / "other.json", secret="wrong").token()
+
+
+@pytest.mark.unit
+def test_rejected_token_is_refreshed_and_request_replayed(tmp_path):
+    with run_stub_server() as server:
+        provider = _provider(server, tmp_path / "sf-token.json")
+        first = provider.token().access_token
+        server.revoked_tokens.add(first)
+        pool = ApiClientPool(base_url=server.base_url, auth=OAuthAuth(provider))
+        try:
+            with pool.view(lambda req: None, lambda res: None) as client:
+                response = client.get("/services/data/v61.0/limits")
+        finally:
+            pool.close()
+
+    assert response.status_code == 200
+    assert [item["headers"]["authorization"] for item in server.requests if item["path"].endswith("/limits")] == [
+        f"Bearer {first}",
+        f"Bearer {provider.token().access_token}",
+    ]
+
+
+@pytest.mark.unit
+def test_background_refresh_renews_before_expiry(tmp_path):
+    with run_stub_server() as server:
+        provider = _provider(server, tmp_path / "sf-token.json", ttl=2.5, refresh_margin=1.0)
+        first = provider.token()
+        provider.start()
+        try:
+            time.sleep(1.2)
+        finally:
+            provider.stop()
+        assert server.tokens_issued >= 2
+        assert provider.token().expires_at > first.expires_at
+
+
+@pytest.mark.unit
+def test_background_refresh_survives_unexpected_errors(tmp_path, caplog):
+    def broken_fetch():
+        raise KeyError("instance_url")
+
+    provider = TokenProvider(broken_fetch, tmp_path / "sf-token.json")
+    with caplog.at_level("WARNING", logger="tests.utils.oauth"):
+        provider.start()
+        try:
+            time.sleep(0.2)
+            assert provider._thread.is_alive()
+        finally:
+            provider.stop()
+    assert "Falha ao renovar o token OAuth (1 seguidas)" in caplog.text
@@ -0,0 +1,37 @@
+import httpx
+import pytest
+
+from tests.utils.record_locator import RecordLocator, soql_literal
+from tests.utils.sf_stub import run_stub_server
+
+
+@pytest.mark.unit
+def test_name_resolves_to_id_with_one_query_and_is_cached():
+    with run_stub_server() as server, httpx.Client(base_url=server.base_url) as client:
+        server.create_record("Contact", {"FirstName": "Ana", "LastName": "Souza"})
+        newest = server.create_record("Contact", {"FirstName": "Ana", "LastName": "Souza"})
+        quoted = server.create_record("Contact", {"LastName": "D'Ávila"})
+        cache = {}
+        locator = RecordLocator(client, "v61.0", cache=cache)
+
+        assert locator.find_id("Contact", "Ana Souza") == newest
+        assert locator.find_id("Contact", "Ana Souza") == newest
+        assert len(server.requests) == 1
+        # Outro teste da sessão reaproveita o mesmo cache.
+        assert RecordLocator(client, "v61.0", cache=cache).find_id("Contact", "Ana Souza") == newest
+        assert len(server.requests) == 1
+
+        assert locator.find_id("Contact", "D'Ávila") == quoted
+        assert locator.find_id("Contact", "Ninguém") is None
+        assert ("Contact", "Name", "Ninguém") not in cache
+
+        locator.forget(newest)
+        assert ("Contact", "Name", "Ana Souza") not in cache
+        assert RecordLocator.record_url("https://org.lightning.force.com/", "Contact", newest) == (
+            f"https://org.lightning.force.com/lightning/r/Contact/{newest}/view"
+        )
+
+
+@pytest.mark.unit
+def test_soql_literal_escapes_quotes_and_backslashes():
+    assert soql_literal("O'Neil \\ co") == "'O\\'Neil \\\\ co'"
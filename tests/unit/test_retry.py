@@ -0,0 +1,149 @@
+import asyncio
+
+import httpx
+import pytest
+
+from tests.utils.api_client import ApiClientPool
+from tests.utils.cassette import CassetteMissError
+from tests.utils.metrics import MetricStore
+from tests.utils.retry import AsyncRetryTransport, CircuitBreaker, CircuitOpenError, RetryPolicy, RetryTransport
+from tests.utils.throttle import ApiBudgetExhausted
+
+LOCK_ROW = [{"errorCode": "UNABLE_TO_LOCK_ROW", "message": "unable to obtain exclusive access to this record"}]
+
+
+def _scripted(*outcomes):
+    calls = []
+
+    def _handler(request):
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(request.method)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return calls, httpx.MockTransport(_handler)
+
+
+@pytest.mark.unit
+def test_retries_only_what_is_safe_for_the_method():
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.001, backoff_max=0.001)
+
+    calls, transport = _scripted(httpx.Response(503), httpx.Response(200, json={}))
+    with httpx.Client(transport=RetryTransport(transport, policy)) as client:
+        response = client.get("http://stub/services/data/v61.0/limits")
+    assert response.status_code == 200 and response.extensions["api_attempts"] == 2 and len(calls) == 2
+
+    # POST com timeout de leitura pode ter sido processado pela org: não repete.
+    calls, transport = _scripted(httpx.ReadTimeout("read timed out"))
+    with httpx.Client(transport=RetryTransport(transport, policy)) as client, pytest.raises(httpx.ReadTimeout):
+        client.post("http://stub/services/data/v61.0/sobjects/Contact", json={})
+    assert len(calls) == 1
+
+    # UNABLE_TO_LOCK_ROW reverte a DML, então até o POST repete; 400 comum não.
+    calls, transport = _scripted(httpx.Response(400, json=LOCK_ROW), httpx.Response(201, json={"id": "003"}))
+    with httpx.Client(transport=RetryTransport(transport, policy)) as client:
+        assert client.post("http://stub/services/data/v61.0/sobjects/Contact", json={}).status_code == 201
+    calls, transport = _scripted(httpx.Response(400, json=[{"errorCode": "INVALID_FIELD"}]))
+    with httpx.Client(transport=RetryTransport(transport, policy)) as client:
+        assert client.post("http://stub/services/data/v61.0/sobjects/Contact", json={}).status_code == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_circuit_breaker_fails_fast_and_probes_after_cooldown():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    calls, transport = _scripted(httpx.Response(503), httpx.Response(503), httpx.Response(200, json={}))
+    client = httpx.Client(transport=RetryTransport(transport, RetryPolicy(max_attempts=1), breaker))
+
+    url = "http://stub/services/data/v61.0/sobjects/Contact/003000000000001AAA"
+    assert client.get(url).status_code == 503
+    assert client.get(url.replace("1AAA", "2AAA")).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        client.get(url)
+    assert len(calls) == 2
+
+    now[0] = 31
+    assert client.get(url).status_code == 200
+    assert not breaker.is_open("GET stub/services/data/v61.0/sobjects/Contact/{id}")
+    client.close()
+
+
+@pytest.mark.unit
+def test_local_refusals_do_not_open_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=2)
+    refusals = (ApiBudgetExhausted("hard limit"), CassetteMissError("sem gravação"), ApiBudgetExhausted("hard limit"))
+    calls, transport = _scripted(*refusals, httpx.ConnectError("down"), httpx.ConnectError("down"))
+    client = httpx.Client(transport=RetryTransport(transport, RetryPolicy(max_attempts=1), breaker))
+    url = "http://stub/services/data/v61.0/limits"
+
+    for refusal in refusals:
+        with pytest.raises(type(refusal)):
+            client.get(url)
+    assert not breaker.is_open("GET stub/services/data/v61.0/limits")
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            client.get(url)
+    assert breaker.is_open("GET stub/services/data/v61.0/limits") and len(calls) == 5
+    client.close()
+
+
+@pytest.mark.unit
+def test_half_open_probe_without_verdict_lets_the_next_call_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: now[0])
+    outcomes = (httpx.Response(503), ApiBudgetExhausted("hard limit"), RuntimeError("bug no hook"), httpx.Response(200))
+    calls, transport = _scripted(*outcomes)
+    client = httpx.Client(transport=RetryTransport(transport, RetryPolicy(max_attempts=1), breaker))
+    url = "http://stub/services/data/v61.0/limits"
+
+    assert client.get(url).status_code == 503
+    now[0] = 31
+    with pytest.raises(ApiBudgetExhausted):
+        client.get(url)
+    with pytest.raises(RuntimeError):
+        client.get(url)
+    assert client.get(url).status_code == 200 and len(calls) == 4
+    assert not breaker.is_open("GET stub/services/data/v61.0/limits")
+    client.close()
+
+    async def _probe_async():
+        async def _handler(request):
+            raise CassetteMissError("sem gravação")
+
+        breaker.record("GET stub/services/data/v61.0/limits", True)
+        now[0] = 62
+        transport = AsyncRetryTransport(httpx.MockTransport(_handler), RetryPolicy(max_attempts=1), breaker)
+        async with httpx.AsyncClient(transport=transport) as async_client:
+            for _ in range(2):
+                with pytest.raises(CassetteMissError):
+                    await async_client.get(url)
+
+    asyncio.run(_probe_async())
+
+
+@pytest.mark.unit
+def test_each_attempt_lands_in_event_log_and_metrics(monkeypatch):
+    from tests import conftest as conf
+
+    monkeypatch.setattr(conf, "API_METRICS", MetricStore())
+    events = []
+    on_request, on_response = conf._build_api_event_hooks("unit::retry", events)
+    _, transport = _scripted(httpx.ConnectError("connection refused"), httpx.Response(503), httpx.Response(200, json={}))
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.001, backoff_max=0.001)
+    pool = ApiClientPool(base_url="http://stub", transport=transport, wrappers=[lambda inner: RetryTransport(inner, policy)])
+    try:
+        with pool.view(on_request, on_response) as client:
+            client.get("/services/data/v61.0/limits")
+    finally:
+        pool.close()
+
+    assert [event["type"] for event in events] == ["request", "attempt", "attempt", "response"]
+    assert events[1]["error"].startswith("ConnectError") and events[2]["status"] == 503
+    assert events[3]["attempts"] == 3
+    summary = conf.API_METRICS.summary()
+    assert set(summary["by_endpoint"][0]["by_status_class"]) == {"error", "5xx", "2xx"}
+    assert summary["observations"]["retry_backoff_ms"]["count"] == 2
+    assert conf.API_METRICS.counters["retry"] == {"retried": 2, "recovered": 1}
@@ -0,0 +1,43 @@
+import pytest
+
+from tests.utils.sanitizer import DEPTH_MARKER, Sanitizer
+
+KEYS = {"password", "token", "authorization"}
+
+
+@pytest.mark.unit
+def test_masks_pii_in_one_pass_and_truncates_large_text():
+    engine = Sanitizer(KEYS, max_chars=40)
+    text = "email joao.silva@example.com cpf 123.456.789-09 fone (11) 98765-4321"
+    assert engine.mask_text(text[:30]) == "email [redacted] c"
+
+    masked = engine.sanitize(text + "x" * 5_000_000)
+    assert masked.startswith("email [redacted] cpf [redacted] fone[red")
+    assert len(masked) == 40
+
+
+@pytest.mark.unit
+def test_email_on_truncation_boundary_is_not_leaked():
+    engine = Sanitizer(KEYS, max_chars=20)
+    masked = engine.mask_text("a" * 15 + " joao.silva@example.com")
+    assert "joao" not in masked
+
+
+@pytest.mark.unit
+def test_nested_structures_keep_order_and_respect_depth_limit():
+    engine = Sanitizer(KEYS, max_depth=3)
+    data = {"Token": "abc", "b": [1, {"email": "a@b.com", "deep": {"x": 1}}], "c": (True, None)}
+    assert engine.sanitize(data) == {
+        "Token": "[redacted]",
+        "b": [1, {"email": "[redacted]", "deep": DEPTH_MARKER}],
+        "c": [True, None],
+    }
+    assert list(engine.sanitize(data)) == ["Token", "b", "c"]
+
+
+@pytest.mark.unit
+def test_logger_mode_redacts_whole_string_mentioning_a_secret():
+    from tests.utils.logger import _mask
+
+    meta = {"password": "x", "text": "Authorization: Bearer abc", "url": "https://org/lightning"}
+    assert _mask(meta) == {"password": "***", "text": "***", "url": "https://org/lightning"}
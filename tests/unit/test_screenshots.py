@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.utils.screenshots import ScreenshotService
+
+
+class _FakePage:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = []
+
+    def screenshot(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.frames.pop(0)
+
+
+@pytest.mark.unit
+def test_identical_frames_are_attached_once_in_capture_order(tmp_path):
+    page = _FakePage([b"home", b"home", b"modal", b"home"])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = ScreenshotService(tmp_path, executor, image_format="jpeg", quality=60, prefix="t-")
+        for name in ("01-home", "02-home-again", "03-modal", "04-home-later"):
+            service.capture(page, name)
+        stats = service.flush()
+
+    assert page.calls[0] == {"full_page": True, "type": "jpeg", "quality": 60}
+    assert (stats.captured, stats.attached, stats.duplicates) == (4, 2, 2)
+    assert stats.raw_bytes == 17 and stats.attached_bytes == len(b"home") + len(b"modal")
+    assert sorted(path.read_bytes() for path in tmp_path.glob("t-*.jpg")) == [b"home", b"modal"]
+    # Nada pendente: um segundo flush não anexa de novo.
+    assert service.flush().attached == 2
+
+
+@pytest.mark.unit
+def test_rejects_unknown_format(tmp_path):
+    with ThreadPoolExecutor(max_workers=1) as executor, pytest.raises(ValueError):
+        ScreenshotService(tmp_path, executor, image_format="gif")
@@ -0,0 +1,38 @@
+import httpx
+import pytest
+
+from tests.utils.sf_stub import run_stub_server
+from tests.utils.sobject_metadata import MetadataError, SObjectMetadata
+
+
+@pytest.mark.unit
+def test_metadata_is_downloaded_once_and_revalidated_from_disk(tmp_path):
+    with run_stub_server() as server, httpx.Client(base_url=server.base_url) as client:
+        first = SObjectMetadata(client, "v61.0", tmp_path)
+        assert first.picklist_values("Contact", "LeadSource") == ["Web", "Phone Inquiry", "Other"]
+        assert {"apiName": "LastName", "label": "LastName"} in first.form_fields("Contact")
+        assert first.required_fields("Contact") == ["LastName"]
+        # describe só uma vez no mesmo processo; object-info só baixado quando pedido.
+        assert len(server.requests) == 2
+        assert first.stats.downloaded == 2 and first.stats.memory == 1
+
+        # Nova sessão: requisições condicionais, 304 e payload lido do disco.
+        second = SObjectMetadata(client, "v61.0", tmp_path)
+        assert second.describe("Contact") == first.describe("Contact")
+        assert second.required_fields("Contact") == ["LastName"]
+        assert "if-modified-since" in server.requests[-2]["headers"]
+        assert server.requests[-1]["headers"]["if-none-match"] == '"Contact-1"'
+        assert second.stats.revalidated == 2 and second.stats.downloaded == 0 and second.stats.bytes_reused > 0
+
+        # Metadado mudou na org: baixa de novo.
+        server.metadata_version += 1
+        third = SObjectMetadata(client, "v61.0", tmp_path)
+        third.describe("Contact")
+        assert third.stats.downloaded == 1
+
+    with httpx.Client(base_url=server.base_url) as offline:
+        # Org fora do ar: usa a cópia em disco; sem cópia, erro explícito.
+        stale = SObjectMetadata(offline, "v61.0", tmp_path)
+        assert stale.required_fields("Contact") == ["LastName"] and stale.stats.stale == 1
+        with pytest.raises(MetadataError):
+            stale.describe("Opportunity")
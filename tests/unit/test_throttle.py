@@ -0,0 +1,61 @@
+import httpx
+import pytest
+
+from tests.utils.api_client import ApiClientPool
+from tests.utils.sf_stub import run_stub_server
+from tests.utils.throttle import AdaptiveThrottle, ApiBudgetExhausted, ThrottleTransport, parse_limit_info
+
+LIMITS = "/services/data/v61.0/limits"
+
+
+@pytest.mark.unit
+def test_budget_scales_rate_and_concurrency_between_soft_and_hard_limit():
+    assert parse_limit_info("per-app-api-usage=1/50(appName=x); api-usage=18/15000") == (18, 15000)
+    assert parse_limit_info("per-app-api-usage=1/50(appName=x)") is None
+
+    throttle = AdaptiveThrottle(max_concurrency=10, soft_limit=0.8, hard_limit=0.9, degraded_rps=20)
+    throttle.update(700, 1000)
+    assert (throttle.factor(), throttle.concurrency_limit(), throttle.rate()) == (1.0, 10, 0.0)
+    throttle.update(850, 1000)
+    assert throttle.concurrency_limit() == 5 and throttle.rate() == pytest.approx(10)
+    throttle.update(900, 1000)
+    with pytest.raises(ApiBudgetExhausted):
+        throttle.check_budget()
+
+
+@pytest.mark.unit
+def test_throttle_stops_before_the_org_limit_and_reports_waits():
+    with run_stub_server() as server:
+        server.limits["DailyApiRequests"] = {"Max": 100, "Remaining": 100}
+        throttle = AdaptiveThrottle(soft_limit=0.5, hard_limit=0.8, degraded_rps=400)
+        pool = ApiClientPool(
+            base_url=server.base_url,
+            wrappers=[lambda inner: ThrottleTransport(inner, throttle, LIMITS)],
+        )
+        statuses, waits = [], []
+        try:
+            with pool.view(lambda req: None, lambda res: None) as client, pytest.raises(ApiBudgetExhausted):
+                for _ in range(100):
+                    response = client.get("/services/data/v61.0/sobjects")
+                    statuses.append(response.status_code)
+                    waits.append(response.extensions["throttle_wait_ms"])
+        finally:
+            pool.close()
+
+    # 1 refresh em /limits + 79 chamadas: para em 80% sem nenhum REQUEST_LIMIT_EXCEEDED.
+    assert server.requests[0]["path"] == LIMITS
+    assert set(statuses) == {200} and len(statuses) == 79
+    assert max(waits[:45]) < 1 < max(waits[60:])
+
+
+@pytest.mark.unit
+def test_request_limit_exceeded_marks_budget_as_exhausted():
+    def _handler(request):
+        return httpx.Response(403, json=[{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "TotalRequests Limit exceeded."}])
+
+    throttle = AdaptiveThrottle()
+    throttle.update(10, 1000)
+    with httpx.Client(transport=ThrottleTransport(httpx.MockTransport(_handler), throttle, LIMITS)) as client:
+        assert client.get(f"http://stub{LIMITS}").status_code == 403
+        with pytest.raises(ApiBudgetExhausted):
+            client.get(f"http://stub{LIMITS}")
@@ -0,0 +1,62 @@
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+from tests.ui.playwright.waits import LightningWaits
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakePage:
+    """Assenta `settles_after_ms` depois do início da espera; `navigations` erros de contexto antes disso."""
+
+    def __init__(self, clock, settles_after_ms, navigations=0):
+        self.clock, self.settles_after_ms, self.navigations = clock, settles_after_ms, navigations
+        self.timeouts = []
+
+    def wait_for_function(self, expression, arg=None, polling=None, timeout=None):
+        self.timeouts.append(timeout)
+        if self.navigations:
+            self.navigations -= 1
+            self.clock.now += 0.2
+            raise PlaywrightError("Execution context was destroyed, most likely because of a navigation")
+        if self.settles_after_ms > timeout:
+            self.clock.now += timeout / 1000
+            raise PlaywrightTimeout("Timeout exceeded")
+        self.clock.now += self.settles_after_ms / 1000
+        self.settles_after_ms = 0
+
+    def wait_for_load_state(self, state=None, timeout=None):
+        self.clock.now += 0.1
+
+
+@pytest.mark.unit
+def test_settle_returns_when_idle_and_reports_sleep_removed():
+    clock = _Clock()
+    waits = LightningWaits(_FakePage(clock, settles_after_ms=1200), clock=clock)
+    record = waits.settle("lista-contatos", budget_ms=7000)
+    assert record.settled and record.waited_ms == pytest.approx(1200) and record.saved_ms == pytest.approx(5800)
+
+    # Não assentou no orçamento: segue sem falhar, como seguiria depois do sleep.
+    waits.page.settles_after_ms = 9000
+    over = waits.settle("modal", budget_ms=900)
+    assert not over.settled and over.waited_ms == pytest.approx(900) and over.saved_ms == 0
+
+    summary = waits.summary()
+    assert summary["budget_ms"] == 7900 and summary["sleep_removed_ms"] == pytest.approx(5800)
+    assert summary["over_budget"] == 1
+
+
+@pytest.mark.unit
+def test_navigation_during_wait_retries_within_the_same_budget():
+    clock = _Clock()
+    page = _FakePage(clock, settles_after_ms=500, navigations=1)
+    record = LightningWaits(page, clock=clock).settle("detalhe", budget_ms=5000)
+    assert record.settled and record.waited_ms == pytest.approx(800)
+    assert page.timeouts[1] == pytest.approx(4700)
@@ -0,0 +1,211 @@
+"""
+Cache de respostas GET da sessão (opt-in via API_CACHE_ENABLED=true).
+
+Funciona como um transporte httpx em volta do transporte real:
+  - hit: resposta ainda dentro do TTL, servida sem ir à rede;
+  - revalidated: TTL expirou, mas a org respondeu 304 ao If-None-Match/If-Modified-Since;
+  - miss: resposta nova vinda da rede (e guardada, se cacheável);
+  - bypass: cache desligado para o teste (marker no_api_cache).
+O resultado vai em response.extensions["api_cache"] para logs e métricas.
+Requisições de escrita invalidam as entradas do mesmo recurso.
+
+Só entram no cache os recursos de CACHEABLE_PATHS (/limits e describe de sObject).
+/query e os registros nunca são guardados: uma consulta repetida depois de um
+insert/delete precisa ver a org como ela está, e o DELETE de um registro não
+teria como invalidar a /query que o listou.
+
+O Cache-Control da org é ignorado de propósito: o Salesforce responde `no-store`
+em toda a API REST, e aqui o TTL da sessão é a política desejada.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+import httpx
+
+CACHEABLE_METHODS = {"GET", "HEAD"}
+CACHEABLE_STATUSES = {200, 203, 300, 301}
+CACHEABLE_PATHS = (
+    re.compile(r"/services/data/v[\d.]+/limits/?"),
+    re.compile(r"/services/data/v[\d.]+/sobjects/[^/]+/describe/?"),
+)
+# O corpo é guardado já decodificado; estes headers não valem mais para ele.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: Tuple[Tuple[str, str], ...]
+    content: bytes
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    path: str = ""
+
+
+@dataclass
+class CacheStats:
+    hit: int = 0
+    miss: int = 0
+    revalidated: int = 0
+    bypass: int = 0
+    evicted: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "revalidated": self.revalidated,
+            "bypass": self.bypass,
+            "evicted": self.evicted,
+        }
+
+
+class ResponseCache:
+    """LRU limitado a `max_entries`, com TTL em segundos."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, clock=time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.stats = CacheStats()
+        self.bypass = False
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        # O token entra como hash para nunca reaproveitar resposta de outra credencial.
+        auth = request.headers.get("authorization", "")
+        auth_hash = hashlib.sha256(auth.encode("utf-8")).hexdigest()[:12] if auth else "-"
+        return f"{request.method} {request.url} {auth_hash}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def now(self) -> float:
+        return self._clock()
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return (self._clock() - entry.stored_at) < self.ttl
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evicted += 1
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        entry.stored_at = self._clock()
+        self.put(key, entry)
+
+    def invalidate_path(self, path: str) -> None:
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.path == path or e.path.startswith(path.rstrip("/") + "/")]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @contextmanager
+    def bypassed(self, enabled: bool = True) -> Iterator[None]:
+        previous = self.bypass
+        self.bypass = enabled
+        try:
+            yield
+        finally:
+            self.bypass = previous
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+
+def is_cacheable_path(path: str) -> bool:
+    return any(pattern.fullmatch(path) for pattern in CACHEABLE_PATHS)
+
+
+def _cached_response(entry: CacheEntry, request: httpx.Request, outcome: str) -> httpx.Response:
+    return httpx.Response(
+        status_code=entry.status_code,
+        headers=list(entry.headers),
+        content=entry.content,
+        request=request,
+        extensions={"api_cache": outcome},
+    )
+
+
+class CachingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, cache: ResponseCache) -> None:
+        self.inner = inner
+        self.cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in CACHEABLE_METHODS:
+            self.cache.invalidate_path(request.url.path)
+            return self.inner.handle_request(request)
+
+        if not is_cacheable_path(request.url.path):
+            return self.inner.handle_request(request)
+
+        if self.cache.bypass:
+            self.cache.record("bypass")
+            response = self.inner.handle_request(request)
+            response.extensions["api_cache"] = "bypass"
+            return response
+
+        key = ResponseCache.key_for(request)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record("hit")
+            return _cached_response(entry, request, "hit")
+
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.inner.handle_request(request)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            self.cache.touch(key, entry)
+            self.cache.record("revalidated")
+            return _cached_response(entry, request, "revalidated")
+
+        self.cache.record("miss")
+        if response.status_code in CACHEABLE_STATUSES:
+            content = response.read()
+            self.cache.put(
+                key,
+                CacheEntry(
+                    status_code=response.status_code,
+                    headers=tuple((k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROPPED_HEADERS),
+                    content=content,
+                    stored_at=self.cache.now(),
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                    path=request.url.path,
+                ),
+            )
+        response.extensions["api_cache"] = "miss"
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
@@ -0,0 +1,211 @@
+"""
+Clients HTTP dos testes de API.
+
+Um único httpx.Client (keep-alive e HTTP/2 opcional) atende todos os testes;
+cada teste recebe uma ApiClientView com seus próprios hooks de request/response,
+mantendo os logs por teste em reports/api-logs/.
+
+AsyncApiClient usa os mesmos hooks sobre httpx.AsyncClient e dispara várias
+requisições em paralelo (fan-out) limitadas por um semáforo.
+"""
+import asyncio
+import importlib.util
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from tests.utils.api_response import AsyncDecodeOnceTransport, DecodeOnceTransport
+
+RequestHook = Callable[[httpx.Request], None]
+ResponseHook = Callable[[httpx.Response], None]
+# ("GET", "/services/data/v61.0/limits") ou ("POST", url, {"json": {...}})
+TransportWrapper = Callable[[httpx.BaseTransport], httpx.BaseTransport]
+AsyncTransportWrapper = Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]
+ApiCall = Union[Tuple[str, str], Tuple[str, str, Dict[str, Any]]]
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class ApiClientPool:
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        http2: bool = False,
+        max_connections: int = 10,
+        keepalive_expiry: float = 60.0,
+        transport: Optional[httpx.BaseTransport] = None,
+        auth: Optional[httpx.Auth] = None,
+        wrappers: Sequence[TransportWrapper] = (),
+    ) -> None:
+        # HTTP/2 depende do pacote opcional `h2` (pip install httpx[http2]).
+        self.http2 = http2 and http2_available()
+        self._view: Optional["ApiClientView"] = None
+        self._lock = threading.Lock()
+        if transport is None:
+            transport = httpx.HTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            )
+        # Camadas extras (cache etc.) envolvem o transporte real, da mais interna para a mais externa.
+        for wrap in wrappers:
+            transport = wrap(transport)
+        # Camada mais externa: respostas com json() memoizado (hook e teste decodificam uma vez).
+        transport = DecodeOnceTransport(transport)
+        self.transport = transport
+        self.client = httpx.Client(
+            base_url=base_url,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+            transport=transport,
+            event_hooks={"request": [self._dispatch_request], "response": [self._dispatch_response]},
+        )
+
+    def view(self, on_request: RequestHook, on_response: ResponseHook) -> "ApiClientView":
+        view = ApiClientView(self, on_request, on_response)
+        with self._lock:
+            self._view = view
+        return view
+
+    def release(self, view: "ApiClientView") -> None:
+        with self._lock:
+            if self._view is view:
+                self._view = None
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _dispatch_request(self, req: httpx.Request) -> None:
+        view = self._view
+        if view is not None:
+            view.on_request(req)
+
+    def _dispatch_response(self, res: httpx.Response) -> None:
+        view = self._view
+        if view is not None:
+            view.on_response(res)
+
+
+class ApiClientView:
+    """Visão fina por teste: delega tudo ao client do pool, exceto close()."""
+
+    def __init__(self, pool: ApiClientPool, on_request: RequestHook, on_response: ResponseHook) -> None:
+        self._pool = pool
+        self.on_request = on_request
+        self.on_response = on_response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool.client, name)
+
+    def close(self) -> None:
+        # Fecha apenas a visão; as conexões continuam vivas no pool da sessão.
+        self._pool.release(self)
+
+    def __enter__(self) -> "ApiClientView":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncApiClient:
+    """
+    httpx.AsyncClient com os mesmos hooks síncronos do api_client.
+    Tem event loop próprio, numa thread dedicada, para ser usado em testes pytest síncronos
+    via run()/run_fan_out() — inclusive de várias threads ao mesmo tempo (modo carga).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        on_request: RequestHook,
+        on_response: ResponseHook,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+        http2: bool = False,
+        max_concurrency: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        auth: Optional[httpx.Auth] = None,
+        wrappers: Sequence[AsyncTransportWrapper] = (),
+    ) -> None:
+        self.on_request = on_request
+        self.on_response = on_response
+        self.max_concurrency = max(1, max_concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-api-client", daemon=True)
+        self._thread.start()
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=http2 and http2_available(),
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            )
+        for wrap in wrappers:
+            transport = wrap(transport)
+        transport = AsyncDecodeOnceTransport(transport)
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            auth=auth,
+            timeout=timeout,
+            transport=transport,
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    async def _on_request(self, req: httpx.Request) -> None:
+        self.on_request(req)
+
+    async def _on_response(self, res: httpx.Response) -> None:
+        # Lê o corpo aqui para que o hook síncrono (res.read()/res.json()) funcione.
+        await res.aread()
+        self.on_response(res)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def fan_out(
+        self,
+        calls: Iterable[ApiCall],
+        limit: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[httpx.Response, BaseException]]:
+        """
+        Dispara as chamadas em paralelo, no máximo `limit` ao mesmo tempo.
+        Retorna as respostas na mesma ordem de `calls`.
+        """
+        semaphore = asyncio.Semaphore(max(1, limit or self.max_concurrency))
+
+        async def _send(call: Sequence[Any]) -> httpx.Response:
+            method, url = call[0], call[1]
+            kwargs = call[2] if len(call) > 2 else {}
+            async with semaphore:
+                return await self.client.request(method, url, **kwargs)
+
+        return await asyncio.gather(*(_send(call) for call in calls), return_exceptions=return_exceptions)
+
+    def run(self, awaitable: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(awaitable, self._loop).result()
+
+    def run_fan_out(
+        self,
+        calls: Iterable[ApiCall],
+        limit: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[httpx.Response, BaseException]]:
+        return self.run(self.fan_out(calls, limit=limit, return_exceptions=return_exceptions))
+
+    def close(self) -> None:
+        try:
+            self.run(self.client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
@@ -0,0 +1,85 @@
+"""
+Resposta que decodifica o JSON uma vez só.
+
+O hook de log (_on_response) e o teste chamam response.json() no mesmo objeto;
+com ApiResponse a segunda chamada devolve o mesmo dict já decodificado.
+Usa orjson quando instalado (pip install orjson) e cai para o json da stdlib
+se ele não estiver disponível ou recusar o body (ex.: NaN).
+
+Obs.: o dict é compartilhado entre hook e teste; o sanitizer gera uma cópia,
+então só o teste enxerga alterações que ele mesmo fizer.
+"""
+import importlib
+import importlib.util
+import json
+from typing import Any, Callable
+
+import httpx
+
+_MISSING = object()
+
+
+def orjson_available() -> bool:
+    return importlib.util.find_spec("orjson") is not None
+
+
+def _json_loader() -> Callable[[bytes], Any]:
+    if not orjson_available():
+        return json.loads
+    orjson = importlib.import_module("orjson")
+
+    def _loads(content: bytes) -> Any:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return json.loads(content)
+
+    return _loads
+
+
+json_loads = _json_loader()
+
+
+class ApiResponse(httpx.Response):
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        decoded = getattr(self, "_decoded_json", _MISSING)
+        if decoded is _MISSING:
+            try:
+                decoded = json_loads(self.content)
+            except ValueError as exc:
+                decoded = exc
+            self._decoded_json = decoded
+        if isinstance(decoded, ValueError):
+            raise decoded
+        return decoded
+
+
+def decode_once(response: httpx.Response) -> httpx.Response:
+    # Troca só a classe: sem copiar headers/stream, e funciona com o body lido ou não.
+    if type(response) is httpx.Response:
+        response.__class__ = ApiResponse
+    return response
+
+
+class DecodeOnceTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport) -> None:
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return decode_once(self.inner.handle_request(request))
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncDecodeOnceTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return decode_once(await self.inner.handle_async_request(request))
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
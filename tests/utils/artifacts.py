@@ -0,0 +1,74 @@
+"""
+Política de captura de trace e vídeo dos testes UI (ARTIFACT_CAPTURE).
+
+  - off: sem trace e sem vídeo (o contexto nem liga a gravação);
+  - on-failure: grava tudo, mas só guarda/anexa quando o teste falha;
+  - sampled: como on-failure, e também guarda uma amostra fixa dos testes que passam
+    (ARTIFACT_SAMPLE_RATE, sorteada pelo nodeid: o mesmo teste cai na amostra em toda execução);
+  - always: guarda e anexa sempre.
+
+O tracing fica ligado uma vez por contexto (os do pool vivem a sessão toda) e cada teste grava um
+chunk (start_chunk/stop_chunk). Chunk de teste que passou é descartado sem gerar zip.
+"""
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+CAPTURE_MODES = ("off", "on-failure", "sampled", "always")
+
+
+class ArtifactPolicy:
+    def __init__(self, mode: str = "on-failure", sample_rate: float = 0.1) -> None:
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"ARTIFACT_CAPTURE={mode!r} inválido; use um de {', '.join(CAPTURE_MODES)}.")
+        self.mode = mode
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def sampled(self, nodeid: str) -> bool:
+        return zlib.crc32(nodeid.encode("utf-8")) / 0xFFFFFFFF < self.sample_rate
+
+    def keep(self, nodeid: str, failed: bool) -> bool:
+        if self.mode == "off":
+            return False
+        if self.mode == "always" or failed:
+            return True
+        return self.mode == "sampled" and self.sampled(nodeid)
+
+
+def begin_trace(context) -> None:
+    if not getattr(context, "_artifact_tracing", False):
+        context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        context._artifact_tracing = True
+    context.tracing.start_chunk()
+
+
+def end_trace(context, path: Optional[Path]) -> Optional[Path]:
+    """Fecha o chunk do teste: grava em `path` ou, sem path, descarta."""
+    if path is None:
+        context.tracing.stop_chunk()
+        return None
+    context.tracing.stop_chunk(path=str(path))
+    return path if path.exists() else None
+
+
+def finish_videos(videos: Iterable[Any], keep: bool) -> List[Path]:
+    """Vídeos das páginas já fechadas: devolve os caminhos a anexar ou apaga os arquivos."""
+    kept = []
+    for video in videos:
+        try:
+            path = Path(video.path())
+        except Exception:
+            continue
+        if keep:
+            if path.exists():
+                kept.append(path)
+            continue
+        try:
+            video.delete()
+        except Exception:
+            path.unlink(missing_ok=True)
+    return kept
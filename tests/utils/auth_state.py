@@ -0,0 +1,107 @@
+"""
+auth-state.json (storage state do Playwright) gerado uma única vez e compartilhado entre processos.
+
+AuthStateBootstrap.ensure() devolve o caminho de um estado ainda válido:
+  - se o arquivo existe e o cookie de sessão (`sid`) não vence dentro de `refresh_margin`, usa como está;
+  - senão, um processo pega o FileLock, faz login e grava o estado (escrita atômica);
+    os demais esperam o lock e reaproveitam o arquivo novo, sem logar de novo.
+
+O Salesforce costuma emitir `sid` como cookie de sessão (sem expiração). Nesse caso a validade
+é estimada pela idade do arquivo contra `max_age` (o timeout de sessão da org).
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from tests.utils.filelock import FileLock
+
+SESSION_COOKIE = "sid"
+
+
+def state_expiry(state: Dict[str, Any], written_at: float, max_age: float) -> Optional[float]:
+    """Momento (epoch) em que a sessão salva deixa de valer; None se não há cookie de sessão."""
+    expiries = [
+        float(cookie.get("expires", -1))
+        for cookie in state.get("cookies", [])
+        if cookie.get("name") == SESSION_COOKIE
+    ]
+    if not expiries:
+        return None
+    persistent = [expiry for expiry in expiries if expiry > 0]
+    session_end = written_at + max_age
+    # Cookies com expiração explícita valem até a primeira delas, mas nunca além do timeout da org.
+    return min(min(persistent), session_end) if persistent else session_end
+
+
+def write_storage_state(context, path: Path, lock_timeout: float = 600.0) -> None:
+    """Grava context.storage_state() em `path` sob o lock (leitores nunca veem arquivo pela metade)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(path.with_name(path.name + ".lock"), timeout=lock_timeout, stale_after=lock_timeout * 1.5):
+        _atomic_write(path, context.storage_state())
+
+
+def _atomic_write(path: Path, state: Dict[str, Any]) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, path)
+
+
+class AuthStateBootstrap:
+    def __init__(
+        self,
+        path: Path,
+        login: Callable[[], Dict[str, Any]],
+        max_age: float = 7200.0,
+        refresh_margin: float = 600.0,
+        lock_timeout: float = 600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.login = login
+        self.max_age = max_age
+        self.refresh_margin = refresh_margin
+        # O login pode esperar MFA manual: quem espera o lock precisa aguentar esse tempo.
+        self.lock_timeout = lock_timeout
+        self.logins = 0
+        self._clock = clock
+        self._checked: Optional[tuple] = None
+
+    def expires_at(self) -> Optional[float]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        # Relê o JSON só quando o arquivo muda (o context fixture consulta a cada teste).
+        if self._checked is None or self._checked[0] != stat.st_mtime_ns:
+            try:
+                state = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                state = {}
+            self._checked = (stat.st_mtime_ns, state_expiry(state, stat.st_mtime, self.max_age))
+        return self._checked[1]
+
+    def is_fresh(self) -> bool:
+        expires_at = self.expires_at()
+        return expires_at is not None and expires_at - self._clock() > self.refresh_margin
+
+    def ensure(self) -> Path:
+        if self.is_fresh():
+            return self.path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.lock_path, timeout=self.lock_timeout, stale_after=self.lock_timeout * 1.5):
+            # Outro worker pode ter logado enquanto esperávamos o lock.
+            if not self.is_fresh():
+                _atomic_write(self.path, self.login())
+                self.logins += 1
+                if not self.is_fresh():
+                    raise RuntimeError(
+                        f"Login gravou {self.path} sem cookie '{SESSION_COOKIE}' válido por mais de "
+                        f"{self.refresh_margin:.0f}s; confira credenciais e AUTH_STATE_MAX_AGE."
+                    )
+        return self.path
@@ -0,0 +1,203 @@
+"""
+Gravação/reprodução (cassette) das chamadas REST do Salesforce.
+
+Modos (API_CASSETTE_MODE):
+  - passthrough: não grava nem reproduz (padrão);
+  - record: vai à org e regrava o cassette com as interações já sanitizadas (com pytest-xdist
+    o arquivo é zerado uma vez, pelo controller, e cada worker acrescenta suas linhas);
+  - replay: responde só a partir do cassette, sem rede (CI offline).
+
+O cassette é um JSONL (uma interação por linha). Ao carregar, monta um índice
+method + path + query normalizada + hash do body -> interações, com busca O(1).
+Chamadas repetidas com a mesma chave são servidas na ordem em que foram gravadas.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+MODES = {"passthrough", "record", "replay"}
+# O corpo é gravado decodificado; estes headers não valem mais para ele.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """Requisição sem interação gravada no modo replay."""
+
+
+def _body_hash(content: bytes) -> str:
+    if not content:
+        return "-"
+    try:
+        canonical = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        canonical = content
+    return hashlib.sha256(canonical).hexdigest()[:16]
+
+
+def interaction_key(method: str, path: str, query: str, content: bytes) -> str:
+    normalized_query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return f"{method.upper()} {path} ?{normalized_query} #{_body_hash(content)}"
+
+
+def request_key(request: httpx.Request) -> str:
+    return interaction_key(request.method, request.url.path, request.url.query.decode("ascii"), request.content)
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: Path,
+        sanitize_headers: Callable[[Any], Dict[str, str]],
+        sanitize_body: Callable[[Any], Any],
+    ) -> None:
+        self.path = Path(path)
+        self.sanitize_headers = sanitize_headers
+        self.sanitize_body = sanitize_body
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "Cassette":
+        self._index.clear()
+        self._cursor.clear()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._index.setdefault(interaction["key"], []).append(interaction)
+        return self
+
+    def reset(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+        self._index.clear()
+        self._cursor.clear()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._index.values())
+
+    def find(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            items = self._index.get(key)
+            if not items:
+                return None
+            position = self._cursor.get(key, 0)
+            # Depois da última gravação, repete a última resposta.
+            self._cursor[key] = position + 1
+            return items[min(position, len(items) - 1)]
+
+    def record(self, request: httpx.Request, response: httpx.Response, content: bytes) -> None:
+        try:
+            body: Any = json.loads(content) if content else None
+            body_format = "json"
+        except ValueError:
+            body = content.decode(response.encoding or "utf-8", errors="replace")
+            body_format = "text"
+
+        interaction = {
+            "key": request_key(request),
+            "request": {
+                "method": request.method,
+                "path": request.url.path,
+                "query": request.url.query.decode("ascii"),
+                "headers": self.sanitize_headers(request.headers),
+                "body": self.sanitize_body(request.content),
+            },
+            "response": {
+                "status": response.status_code,
+                "headers": {
+                    key: value
+                    for key, value in self.sanitize_headers(response.headers).items()
+                    if key.lower() not in _DROPPED_HEADERS
+                },
+                "body_format": body_format,
+                "body": self.sanitize_body(body),
+            },
+        }
+        line = (json.dumps(interaction, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Um único write em O_APPEND: linhas de workers do xdist gravando juntos não se misturam.
+            fd = os.open(self.path, os.O_CREAT | os.O_APPEND | os.O_WRONLY, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._index.setdefault(interaction["key"], []).append(interaction)
+
+
+def _replayed_response(interaction: Dict[str, Any], request: httpx.Request) -> httpx.Response:
+    recorded = interaction["response"]
+    body = recorded.get("body")
+    if body is None:
+        content = b""
+    elif recorded.get("body_format") == "json":
+        content = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    else:
+        content = str(body).encode("utf-8")
+    return httpx.Response(
+        status_code=recorded["status"],
+        headers=recorded.get("headers") or {},
+        content=content,
+        request=request,
+        extensions={"cassette": "replay"},
+    )
+
+
+class CassetteTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"API_CASSETTE_MODE inválido: {mode!r} (use {', '.join(sorted(MODES))}).")
+        self.inner = inner
+        self.cassette = cassette
+        self.mode = mode
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "replay":
+            interaction = self.cassette.find(request_key(request))
+            if interaction is None:
+                raise CassetteMissError(
+                    f"Sem gravação para {request.method} {request.url.path} em {self.cassette.path}. "
+                    "Rode com API_CASSETTE_MODE=record contra a org para regravar.",
+                    request=request,
+                )
+            return _replayed_response(interaction, request)
+
+        response = self.inner.handle_request(request)
+        if self.mode == "record":
+            content = response.read()
+            self.cassette.record(request, response, content)
+            response.extensions["cassette"] = "record"
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Mesmo comportamento do CassetteTransport para o async_api_client."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette, mode: str) -> None:
+        self._sync = CassetteTransport(httpx.BaseTransport(), cassette, mode)
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._sync.mode == "replay":
+            return self._sync.handle_request(request)
+
+        response = await self.inner.handle_async_request(request)
+        if self._sync.mode == "record":
+            content = await response.aread()
+            self._sync.cassette.record(request, response, content)
+            response.extensions["cassette"] = "record"
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
@@ -0,0 +1,191 @@
+"""
+Criação de massa de teste via Composite Graph API (uma chamada HTTP para vários registros).
+
+Exemplo:
+    builder = RecordGraphBuilder(api_client, "v61.0")
+    account = builder.add("Account", {"Name": "ACME"})
+    builder.add("Contact", contact_fields_from_form(contact, account_ref=account), ref="contact")
+    ids = builder.build()   # {"account1": "001...", "contact": "003..."}
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Chaves dos dicts Faker usados nos testes de UI -> API name do campo em Contact.
+CONTACT_FORM_FIELDS = {
+    "salutation": "Salutation",
+    "firstName": "FirstName",
+    "lastName": "LastName",
+    "phone": "Phone",
+    "mobile": "MobilePhone",
+    "home": "HomePhone",
+    "other_phone": "OtherPhone",
+    "title": "Title",
+    "department": "Department",
+    "fax": "Fax",
+    "birthdate": "Birthdate",
+    "email": "Email",
+    "assistant": "AssistantName",
+    "assistant_phone": "AssistantPhone",
+    "lead_source": "LeadSource",
+    "languages": "Languages__c",
+    "level": "Level__c",
+    "description": "Description",
+    "mailing_street": "MailingStreet",
+    "mailing_city": "MailingCity",
+    "mailing_state": "MailingState",
+    "mailing_postal": "MailingPostalCode",
+    "mailing_country": "MailingCountry",
+    "other_street": "OtherStreet",
+    "other_city": "OtherCity",
+    "other_state": "OtherState",
+    "other_postal": "OtherPostalCode",
+    "other_country": "OtherCountry",
+}
+# O modal mostra o rótulo traduzido; a API espera o valor da picklist.
+SALUTATION_VALUES = {"Sr.": "Mr.", "Sra.": "Mrs.", "Srta.": "Ms.", "Dr.": "Dr.", "Prof.": "Prof."}
+GRAPH_MAX_NODES = 500
+
+
+class CompositeGraphError(RuntimeError):
+    def __init__(self, message: str, errors: List[Dict[str, Any]]) -> None:
+        super().__init__(message)
+        self.errors = errors
+
+
+def _api_date(value: str) -> str:
+    # Datas do formulário vêm como dd/mm/aaaa; a API usa ISO.
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return value
+
+
+def contact_fields_from_form(contact: Dict[str, Any], account_ref: Optional[str] = None) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    for key, value in contact.items():
+        api_name = CONTACT_FORM_FIELDS.get(key)
+        if not api_name or value in (None, ""):
+            continue
+        if api_name == "Salutation":
+            value = SALUTATION_VALUES.get(value, value)
+        elif api_name == "Birthdate":
+            value = _api_date(value)
+        fields[api_name] = value
+    if account_ref:
+        fields["AccountId"] = f"@{{{account_ref}.id}}"
+    return fields
+
+
+class RecordGraphBuilder:
+    def __init__(self, client: httpx.Client, api_version: str, graph_id: str = "setup") -> None:
+        self.client = client
+        self.api_version = api_version
+        self.graph_id = graph_id
+        self.created: Dict[str, str] = {}
+        self._nodes: List[Dict[str, Any]] = []
+        self._counters: Dict[str, int] = {}
+
+    @property
+    def base_path(self) -> str:
+        return f"/services/data/{self.api_version}"
+
+    def add(self, sobject: str, fields: Dict[str, Any], ref: Optional[str] = None) -> str:
+        """
+        Enfileira um registro e devolve o referenceId.
+        Campos podem apontar para registros anteriores com "@{<ref>.id}".
+        """
+        if len(self._nodes) >= GRAPH_MAX_NODES:
+            raise ValueError(f"Composite Graph aceita no máximo {GRAPH_MAX_NODES} nós por grafo.")
+        if ref is None:
+            self._counters[sobject] = self._counters.get(sobject, 0) + 1
+            ref = f"{sobject.lower()}{self._counters[sobject]}"
+        self._nodes.append(
+            {
+                "method": "POST",
+                "url": f"{self.base_path}/sobjects/{sobject}/",
+                "referenceId": ref,
+                "body": fields,
+            }
+        )
+        return ref
+
+    def add_account_contact_opportunity(
+        self,
+        account: Dict[str, Any],
+        contact: Dict[str, Any],
+        opportunity: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, str]:
+        """Account -> Contact (dict do formulário) -> Opportunity, ligados por referência."""
+        refs = {"account": self.add("Account", account, ref="account")}
+        refs["contact"] = self.add("Contact", contact_fields_from_form(contact, account_ref=refs["account"]), ref="contact")
+        if opportunity is not None:
+            opp_fields = dict(opportunity)
+            opp_fields.setdefault("AccountId", f"@{{{refs['account']}.id}}")
+            opp_fields.setdefault("ContactId", f"@{{{refs['contact']}.id}}")
+            refs["opportunity"] = self.add("Opportunity", opp_fields, ref="opportunity")
+        return refs
+
+    def payload(self) -> Dict[str, Any]:
+        return {"graphs": [{"graphId": self.graph_id, "compositeRequest": list(self._nodes)}]}
+
+    def build(self) -> Dict[str, str]:
+        """Envia o grafo numa única chamada e devolve {referenceId: Id}."""
+        if not self._nodes:
+            return {}
+        response = self.client.post(f"{self.base_path}/composite/graph", json=self.payload())
+        if response.status_code != 200:
+            raise CompositeGraphError(
+                f"Composite Graph retornou HTTP {response.status_code}.",
+                [{"status": response.status_code, "body": response.text[:500]}],
+            )
+
+        graph = response.json()["graphs"][0]
+        results = graph["graphResponse"]["compositeResponse"]
+        if not graph.get("isSuccessful"):
+            errors = [
+                {"referenceId": item.get("referenceId"), "status": item.get("httpStatusCode"), "body": item.get("body")}
+                for item in results
+                if item.get("httpStatusCode", 500) >= 400
+            ]
+            raise CompositeGraphError(f"Composite Graph '{self.graph_id}' falhou e foi revertido.", errors)
+
+        ids = {item["referenceId"]: item["body"]["id"] for item in results if isinstance(item.get("body"), dict)}
+        self.created.update(ids)
+        self._nodes = []
+        return ids
+
+    def cleanup(self) -> Dict[str, str]:
+        """
+        Remove os registros criados (filhos primeiro); ignora os que já foram excluídos.
+
+        Devolve {Id: motivo} dos que não saíram da org, que continuam em `created`.
+        O composite/sobjects responde 200 mesmo assim, com success=false por item.
+        """
+        ids = list(reversed(list(self.created.values())))
+        failures: Dict[str, str] = {}
+        for start in range(0, len(ids), 200):
+            chunk = ids[start:start + 200]
+            try:
+                response = self.client.delete(
+                    f"{self.base_path}/composite/sobjects",
+                    params={"ids": ",".join(chunk), "allOrNone": "false"},
+                )
+            except httpx.HTTPError as exc:
+                failures.update({record_id: f"{type(exc).__name__}: {exc}" for record_id in chunk})
+                continue
+            if response.status_code != 200:
+                failures.update({record_id: f"HTTP {response.status_code}" for record_id in chunk})
+                continue
+            results = {item.get("id"): item for item in response.json() if isinstance(item, dict)}
+            for record_id in chunk:
+                item = results.get(record_id)
+                if item is None:
+                    failures[record_id] = "sem resultado na resposta"
+                    continue
+                errors = [error for error in item.get("errors") or [] if error.get("statusCode") != "ENTITY_IS_DELETED"]
+                if not item.get("success") and errors:
+                    failures[record_id] = "; ".join(f"{e.get('statusCode')}: {e.get('message')}" for e in errors)
+        self.created = {ref: record_id for ref, record_id in self.created.items() if record_id in failures}
+        return failures
@@ -0,0 +1,330 @@
+"""
+Massa de teste determinística (Faker pt_BR), gerada fora do caminho crítico do teste.
+
+    contact = test_data.contact()        # fixture: ContactData; contact.as_form() é o dict dos testes UI
+    account = test_data.account()
+    test_data.cpf(), test_data.phone()   # CPF válido (validate-docbr) e celular no formato (DD) 9XXXX-XXXX
+
+Semente do teste = crc32(semente da execução + nodeid). A semente da execução é DATA_SEED ou, sem ele,
+um valor sorteado por execução (o mesmo em todos os workers do xdist) que aparece no log de cada
+teste: rodar de novo com DATA_SEED=<valor> reproduz exatamente a mesma massa.
+
+Os registros vêm de pools por tipo (contato, conta, endereço) gerados em lotes de `batch_size`.
+No início da sessão o primeiro lote de cada teste coletado é gerado numa thread à parte; na metade
+de um lote, o seguinte já é encomendado. Com `cache_dir` os lotes ficam em disco, por versão do Faker,
+idioma e semente (útil com DATA_SEED fixo, como no CI).
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import faker
+from faker import Faker
+from validate_docbr import CNPJ, CPF
+
+DATA_KINDS = ("contact", "account", "address")
+# DDDs em uso no Brasil (Anatel).
+VALID_DDDS = (
+    11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 24, 27, 28, 31, 32, 33, 34, 35, 37, 38,
+    41, 42, 43, 44, 45, 46, 47, 48, 49, 51, 53, 54, 55, 61, 62, 63, 64, 65, 66, 67, 68, 69,
+    71, 73, 74, 75, 77, 79, 81, 82, 83, 84, 85, 86, 87, 88, 89, 91, 92, 93, 94, 95, 96, 97, 98, 99,
+)
+_MOBILE = re.compile(r"\((\d{2})\) 9[6-9]\d{3}-\d{4}")
+
+
+def seed_for(nodeid: str, run_seed: int = 0) -> int:
+    return zlib.crc32(f"{run_seed}:{nodeid}".encode("utf-8"))
+
+
+def generate_cpf(rnd: random.Random, mask: bool = True) -> str:
+    validator = CPF()
+    while True:
+        digits = [rnd.randint(0, 9) for _ in range(9)]
+        for size in (9, 10):
+            total = sum(digit * weight for digit, weight in zip(digits, range(size + 1, 1, -1)))
+            digits.append(total * 10 % 11 % 10)
+        value = "".join(str(digit) for digit in digits)
+        # validate() descarta os de dígitos repetidos (111.111.111-11), válidos só na conta.
+        if validator.validate(value):
+            return validator.mask(value) if mask else value
+
+
+def generate_phone(rnd: random.Random) -> str:
+    number = f"9{rnd.randint(6, 9)}{rnd.randint(0, 9999999):07d}"
+    return f"({rnd.choice(VALID_DDDS)}) {number[:5]}-{number[5:]}"
+
+
+def valid_phone(value: str) -> bool:
+    match = _MOBILE.fullmatch(value)
+    return match is not None and int(match.group(1)) in VALID_DDDS
+
+
+@dataclass
+class AddressBlock:
+    street: str
+    city: str
+    state: str
+    postal: str
+    country: str
+
+
+@dataclass
+class AccountData:
+    name: str
+    phone: str
+    cnpj: str
+    billing: AddressBlock
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AccountData":
+        return cls(**{**data, "billing": AddressBlock(**data["billing"])})
+
+
+@dataclass
+class ContactData:
+    salutation: str
+    first_name: str
+    last_name: str
+    phone: str
+    mobile: str
+    home: str
+    other_phone: str
+    title: str
+    department: str
+    fax: str
+    birthdate: str
+    email: str
+    assistant: str
+    assistant_phone: str
+    lead_source: str
+    languages: str
+    level: str
+    description: str
+    cpf: str
+    mailing: AddressBlock
+    other: AddressBlock
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContactData":
+        return cls(**{**data, "mailing": AddressBlock(**data["mailing"]), "other": AddressBlock(**data["other"])})
+
+    def as_form(self) -> Dict[str, str]:
+        """Chaves dos testes UI (e de data_builder.CONTACT_FORM_FIELDS)."""
+        form = {
+            "salutation": self.salutation,
+            "firstName": self.first_name,
+            "lastName": self.last_name,
+            "phone": self.phone,
+            "mobile": self.mobile,
+            "home": self.home,
+            "other_phone": self.other_phone,
+            "title": self.title,
+            "department": self.department,
+            "fax": self.fax,
+            "birthdate": self.birthdate,
+            "email": self.email,
+            "assistant": self.assistant,
+            "assistant_phone": self.assistant_phone,
+            "lead_source": self.lead_source,
+            "languages": self.languages,
+            "level": self.level,
+            "description": self.description,
+        }
+        for prefix, block in (("mailing", self.mailing), ("other", self.other)):
+            for key, value in asdict(block).items():
+                form[f"{prefix}_{key}"] = value
+        return form
+
+
+def _address(fake: Faker) -> AddressBlock:
+    return AddressBlock(fake.street_address(), fake.city(), "SP", fake.postcode(), "Brasil")
+
+
+def _account(fake: Faker) -> AccountData:
+    validator = CNPJ()
+    cnpj = fake.cnpj()
+    while not validator.validate(cnpj):
+        cnpj = fake.cnpj()
+    return AccountData(f"{fake.last_name()} Ltda", generate_phone(fake.random), cnpj, _address(fake))
+
+
+def _contact(fake: Faker) -> ContactData:
+    rnd = fake.random
+    return ContactData(
+        salutation="Sr.",
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        phone=generate_phone(rnd),
+        mobile=generate_phone(rnd),
+        home=generate_phone(rnd),
+        other_phone=generate_phone(rnd),
+        title=fake.job(),
+        department="Vendas",
+        fax=fake.msisdn()[0:10],
+        birthdate=fake.date_of_birth(minimum_age=25, maximum_age=50).strftime("%d/%m/%Y"),
+        email=fake.email(),
+        assistant=fake.name(),
+        assistant_phone=generate_phone(rnd),
+        lead_source="Web",
+        languages="Português, Inglês",
+        level="Primary",
+        description=fake.text(max_nb_chars=120),
+        cpf=generate_cpf(rnd),
+        mailing=_address(fake),
+        other=_address(fake),
+    )
+
+
+_GENERATORS: Dict[str, Callable[[Faker], Any]] = {"contact": _contact, "account": _account, "address": _address}
+_LOADERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "contact": ContactData.from_dict,
+    "account": AccountData.from_dict,
+    "address": lambda data: AddressBlock(**data),
+}
+_FAKERS = threading.local()
+
+
+def _faker(locale: str) -> Faker:
+    # Criar um Faker custa dezenas de ms; um por thread e idioma, re-semeado a cada lote.
+    if not hasattr(_FAKERS, "by_locale"):
+        _FAKERS.by_locale = {}
+    if locale not in _FAKERS.by_locale:
+        _FAKERS.by_locale[locale] = Faker(locale)
+    return _FAKERS.by_locale[locale]
+
+
+def generate_batch(kind: str, seed: int, batch: int, size: int, locale: str = "pt_BR") -> List[Any]:
+    fake = _faker(locale)
+    fake.seed_instance(zlib.crc32(f"{seed}:{kind}:{batch}".encode("utf-8")))
+    return [_GENERATORS[kind](fake) for _ in range(size)]
+
+
+class DataFactory:
+    def __init__(
+        self,
+        run_seed: int,
+        batch_size: int = 4,
+        executor: Optional[Executor] = None,
+        cache_dir: Optional[Path] = None,
+        locale: str = "pt_BR",
+    ) -> None:
+        self.run_seed = run_seed
+        self.batch_size = max(1, batch_size)
+        self.executor = executor
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.locale = locale
+        self.stats = {"batches_generated": 0, "batches_from_disk": 0}
+        self._batches: Dict[Tuple[int, str, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def _cache_path(self, seed: int, kind: str, batch: int) -> Path:
+        return self.cache_dir / faker.VERSION / self.locale / str(self.batch_size) / f"{seed}-{kind}-{batch}.json"
+
+    def _load_or_generate(self, seed: int, kind: str, batch: int) -> List[Any]:
+        path = self._cache_path(seed, kind, batch) if self.cache_dir else None
+        if path is not None and path.exists():
+            try:
+                rows = [_LOADERS[kind](row) for row in json.loads(path.read_text(encoding="utf-8"))]
+            except (OSError, ValueError, TypeError, KeyError):
+                rows = None
+            if rows is not None:
+                with self._lock:
+                    self.stats["batches_from_disk"] += 1
+                return rows
+        rows = generate_batch(kind, seed, batch, self.batch_size, self.locale)
+        with self._lock:
+            self.stats["batches_generated"] += 1
+        if path is not None:
+            # Mesma semente gera o mesmo lote: escrita atômica basta, sem lock entre processos.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps([asdict(row) for row in rows], ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        return rows
+
+    def batch(self, seed: int, kind: str, batch: int) -> "Future[List[Any]]":
+        key = (seed, kind, batch)
+        with self._lock:
+            future = self._batches.get(key)
+            if future is not None:
+                return future
+            if self.executor is None:
+                future = Future()
+            else:
+                future = self.executor.submit(self._load_or_generate, seed, kind, batch)
+            self._batches[key] = future
+        if self.executor is None:
+            future.set_result(self._load_or_generate(seed, kind, batch))
+        return future
+
+    def prefetch(self, nodeid: str, kinds: Tuple[str, ...] = DATA_KINDS) -> None:
+        seed = seed_for(nodeid, self.run_seed)
+        for kind in kinds:
+            self.batch(seed, kind, 0)
+
+    def release(self, seed: int) -> None:
+        with self._lock:
+            for key in [key for key in self._batches if key[0] == seed]:
+                del self._batches[key]
+
+    def stream(self, nodeid: str) -> "DataStream":
+        return DataStream(self, nodeid)
+
+
+class DataStream:
+    """Registros de um teste, na ordem em que ele pede; o mesmo nodeid + semente repete a sequência."""
+
+    def __init__(self, factory: DataFactory, nodeid: str) -> None:
+        self.factory = factory
+        self.nodeid = nodeid
+        self.seed = seed_for(nodeid, factory.run_seed)
+        self.random = random.Random(self.seed)
+        self.drawn: Dict[str, int] = {kind: 0 for kind in DATA_KINDS}
+        self.waited_ms = 0.0
+
+    def _next(self, kind: str) -> Any:
+        batch, index = divmod(self.drawn[kind], self.factory.batch_size)
+        start = time.perf_counter()
+        rows = self.factory.batch(self.seed, kind, batch).result()
+        self.waited_ms += (time.perf_counter() - start) * 1000
+        if index + 1 == (self.factory.batch_size + 1) // 2:
+            # Na metade do lote já encomenda o próximo; quem pede um registro só não gera lote extra.
+            self.factory.batch(self.seed, kind, batch + 1)
+        self.drawn[kind] += 1
+        return rows[index]
+
+    def contact(self) -> ContactData:
+        return self._next("contact")
+
+    def account(self) -> AccountData:
+        return self._next("account")
+
+    def address(self) -> AddressBlock:
+        return self._next("address")
+
+    def cpf(self, mask: bool = True) -> str:
+        return generate_cpf(self.random, mask=mask)
+
+    def phone(self) -> str:
+        return generate_phone(self.random)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "nodeid": self.nodeid,
+            "run_seed": self.factory.run_seed,
+            "seed": self.seed,
+            "drawn": {kind: count for kind, count in self.drawn.items() if count},
+            "waited_ms": round(self.waited_ms, 1),
+        }
@@ -0,0 +1,220 @@
+"""
+Registro de massa de teste compartilhado entre testes, workers e execuções (SQLite em modo WAL).
+
+Substitui o arquivo test-results/last_contact.json: quem cria um registro o cadastra, e quem precisa
+de um registro daquele tipo pega um emprestado (lease) de forma atômica, sem disputar o mesmo arquivo.
+
+    registry = DataRegistry(Path("test-results/data-registry.sqlite"), org="minha-org").for_owner(nodeid)
+    registry.register("Contact", {"firstName": "Ana", "lastName": "Souza"})
+    lease = registry.lease("Contact")           # None se não houver registro livre
+    registry.release(lease.key, data=novos)     # devolve (com os dados atualizados, se mudaram)
+    registry.consume(lease.key)                 # registro excluído na org: sai do registro
+
+Cada empréstimo vale `lease_ttl` segundos. Empréstimo vencido é de um teste que morreu no meio
+(o registro pode ter ficado pela metade): ele não volta a ser emprestado, vira órfão e aparece em
+orphans() / reports/data-registry.json para limpeza.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+REGISTRY_STATES = ("available", "leased", "orphan")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    key INTEGER PRIMARY KEY AUTOINCREMENT,
+    org TEXT NOT NULL,
+    sobject TEXT NOT NULL,
+    record_id TEXT,
+    data TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'available',
+    owner TEXT,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_state ON records (org, sobject, state, updated_at);
+"""
+
+
+@dataclass
+class RegistryRecord:
+    key: int
+    sobject: str
+    record_id: Optional[str]
+    data: Dict[str, Any]
+    state: str
+    owner: Optional[str]
+    lease_until: Optional[float]
+
+
+def _record(row: sqlite3.Row) -> RegistryRecord:
+    return RegistryRecord(
+        key=row["key"],
+        sobject=row["sobject"],
+        record_id=row["record_id"],
+        data=json.loads(row["data"]),
+        state=row["state"],
+        owner=row["owner"],
+        lease_until=row["lease_until"],
+    )
+
+
+class DataRegistry:
+    def __init__(
+        self,
+        path: Path,
+        org: str,
+        lease_ttl: float = 900.0,
+        owner: str = "",
+        busy_timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+        _connection: Optional[sqlite3.Connection] = None,
+        _lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.org = org
+        self.lease_ttl = lease_ttl
+        self.owner = owner
+        self._clock = clock
+        self._lock = _lock or threading.Lock()
+        if _connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: as transações são abertas à mão (BEGIN IMMEDIATE).
+            _connection = sqlite3.connect(
+                str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            _connection.row_factory = sqlite3.Row
+            _connection.execute("PRAGMA journal_mode=WAL")
+            _connection.execute("PRAGMA synchronous=NORMAL")
+            _connection.executescript(_SCHEMA)
+        self._db = _connection
+
+    def for_owner(self, owner: str) -> "DataRegistry":
+        """Mesma conexão, com `owner` gravado nos registros e empréstimos feitos por esta visão."""
+        return DataRegistry(
+            self.path, self.org, self.lease_ttl, owner, clock=self._clock, _connection=self._db, _lock=self._lock
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE pega o lock de escrita já no início: dois workers nunca emprestam o mesmo registro.
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _expire_leases(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute(
+            "UPDATE records SET state = 'orphan', updated_at = ? WHERE org = ? AND state = 'leased' AND lease_until < ?",
+            (now, self.org, now),
+        )
+
+    def register(self, sobject: str, data: Dict[str, Any], record_id: Optional[str] = None) -> int:
+        now = self._clock()
+        with self._write() as db:
+            cursor = db.execute(
+                "INSERT INTO records (org, sobject, record_id, data, owner, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.org, sobject, record_id, json.dumps(data, ensure_ascii=False), self.owner, now, now),
+            )
+            return int(cursor.lastrowid)
+
+    def lease(self, sobject: str, ttl: Optional[float] = None) -> Optional[RegistryRecord]:
+        """Empresta o registro livre mais antigo do tipo; None se não houver."""
+        now = self._clock()
+        with self._write() as db:
+            self._expire_leases(db, now)
+            row = db.execute(
+                "SELECT * FROM records WHERE org = ? AND sobject = ? AND state = 'available' "
+                "ORDER BY updated_at, key LIMIT 1",
+                (self.org, sobject),
+            ).fetchone()
+            if row is None:
+                return None
+            lease_until = now + (self.lease_ttl if ttl is None else ttl)
+            db.execute(
+                "UPDATE records SET state = 'leased', owner = ?, lease_until = ?, updated_at = ? WHERE key = ?",
+                (self.owner, lease_until, now, row["key"]),
+            )
+        record = _record(row)
+        record.state, record.owner, record.lease_until = "leased", self.owner, lease_until
+        return record
+
+    def release(self, key: int, data: Optional[Dict[str, Any]] = None) -> None:
+        now = self._clock()
+        with self._write() as db:
+            if data is None:
+                db.execute(
+                    "UPDATE records SET state = 'available', lease_until = NULL, updated_at = ? "
+                    "WHERE key = ? AND state = 'leased'",
+                    (now, key),
+                )
+            else:
+                db.execute(
+                    "UPDATE records SET state = 'available', lease_until = NULL, data = ?, updated_at = ? "
+                    "WHERE key = ? AND state = 'leased'",
+                    (json.dumps(data, ensure_ascii=False), now, key),
+                )
+
+    def consume(self, key: int) -> None:
+        with self._write() as db:
+            db.execute("DELETE FROM records WHERE key = ?", (key,))
+
+    def settle_owner(self, failed: bool) -> List[int]:
+        """Fim do teste: empréstimos ainda abertos voltam a ficar livres, ou viram órfãos se o teste falhou."""
+        now = self._clock()
+        with self._write() as db:
+            keys = [
+                row["key"]
+                for row in db.execute(
+                    "SELECT key FROM records WHERE org = ? AND owner = ? AND state = 'leased'", (self.org, self.owner)
+                )
+            ]
+            db.execute(
+                "UPDATE records SET state = ?, lease_until = NULL, updated_at = ? "
+                "WHERE org = ? AND owner = ? AND state = 'leased'",
+                ("orphan" if failed else "available", now, self.org, self.owner),
+            )
+        return keys
+
+    def orphans(self, sobject: Optional[str] = None) -> List[RegistryRecord]:
+        with self._write() as db:
+            self._expire_leases(db, self._clock())
+        query = "SELECT * FROM records WHERE org = ? AND state = 'orphan'"
+        params: List[Any] = [self.org]
+        if sobject:
+            query += " AND sobject = ?"
+            params.append(sobject)
+        with self._lock:
+            return [_record(row) for row in self._db.execute(query + " ORDER BY key", params)]
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for row in self._db.execute(
+                "SELECT sobject, state, COUNT(*) AS total FROM records WHERE org = ? GROUP BY sobject, state",
+                (self.org,),
+            ):
+                counts.setdefault(row["sobject"], {state: 0 for state in REGISTRY_STATES})[row["state"]] = row["total"]
+        return {
+            "org": self.org,
+            "by_sobject": counts,
+            "orphans": [
+                {"key": record.key, "sobject": record.sobject, "record_id": record.record_id, "owner": record.owner,
+                 "data": record.data}
+                for record in self.orphans()
+            ],
+        }
@@ -0,0 +1,50 @@
+"""
+Sink de eventos de API por teste: grava JSONL compacto à medida que os eventos chegam
+e guarda só as últimas `tail_size` entradas em memória (para o resumo do Allure).
+
+Substitui a lista em memória que era serializada duas vezes no teardown
+(arquivo em reports/api-logs/ + anexo do Allure).
+"""
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, TextIO
+
+
+class ApiEventSink:
+    def __init__(self, path: Path, tail_size: int = 50) -> None:
+        self.path = Path(path)
+        self.tail: Deque[Dict[str, Any]] = deque(maxlen=max(1, tail_size))
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def append(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                # Abre só no primeiro evento (teste sem chamadas não gera arquivo vazio);
+                # se já foi fechado por outro fixture do mesmo teste, continua o arquivo.
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a" if self.count else "w", encoding="utf-8")
+            self._file.write(line + "\n")
+            self.tail.append(event)
+            self.count += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self.tail))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,106 @@
+"""
+Lock entre processos baseado em arquivo (os.open com O_CREAT | O_EXCL), sem dependências.
+
+Serve para coordenar workers do pytest-xdist e execuções paralelas na mesma máquina:
+só quem cria o arquivo `<path>` segura o lock; os demais esperam em polling.
+Um lock mais velho que `stale_after` segundos (processo morto) é removido e disputado de novo.
+
+Remover o arquivo nunca é "olha e apaga": ele é renomeado para um nome único (atômico) e só é
+apagado se for mesmo o arquivo visto (mesmo inode); senão volta para `<path>`. Assim nem a quebra
+de lock velho nem o release() apagam o lock que outro processo acabou de criar.
+
+    with FileLock(Path(".auth/sf-token.json.lock")):
+        ...  # lê/escreve o arquivo protegido
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+
+class FileLockTimeout(TimeoutError):
+    """Outro processo segurou o lock por mais de `timeout` segundos."""
+
+
+class FileLock:
+    def __init__(
+        self,
+        path: Union[str, Path],
+        timeout: float = 60.0,
+        poll_interval: float = 0.05,
+        stale_after: float = 300.0,
+    ) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._fd: Optional[int] = None
+        self._identity: Optional[Tuple[int, int]] = None
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        if self._fd is not None:
+            raise RuntimeError(f"Lock {self.path} já adquirido por este objeto.")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                os.write(self._fd, f"{os.getpid()}\n".encode("ascii"))
+                self._identity = _identity(os.fstat(self._fd))
+                return
+            except FileExistsError:
+                self._break_if_stale()
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Timeout de {self.timeout:.0f}s esperando o lock {self.path}.")
+            time.sleep(self.poll_interval)
+
+    def _break_if_stale(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        if time.time() - stat.st_mtime > self.stale_after:
+            self._remove_if(_identity(stat))
+
+    def _remove_if(self, identity: Tuple[int, int]) -> bool:
+        """Apaga `<path>` só se ainda for o arquivo `identity`; devolve se apagou."""
+        moved = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.{time.time_ns()}")
+        try:
+            os.rename(self.path, moved)
+        except (FileNotFoundError, PermissionError):
+            # Já removido por outro processo, ou (Windows) ainda aberto pelo dono.
+            return False
+        if _identity(os.stat(moved)) == identity:
+            os.unlink(moved)
+            return True
+        # Pegamos o lock de outro: devolve, a não ser que já exista um mais novo no lugar.
+        try:
+            os.link(moved, self.path)
+        except FileExistsError:
+            pass
+        os.unlink(moved)
+        return False
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        identity, self._identity = self._identity, None
+        self._remove_if(identity)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def _identity(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_dev, stat.st_ino
@@ -0,0 +1,212 @@
+"""
+Modo carga: reexecuta um cenário (a função de um teste @pytest.mark.api com os fixtures
+já resolvidos) durante `duration` segundos.
+
+- closed loop (rps=0): `concurrency` workers; cada um inicia a próxima iteração assim que
+  a anterior termina. Mede a vazão máxima que a org (ou o stand-in) sustenta.
+- open loop (rps>0): iterações agendadas em ritmo fixo, independente das respostas, e
+  executadas por até `concurrency` workers. A latência conta a partir do horário agendado,
+  então fila do lado do cliente aparece no histograma (sem "coordinated omission").
+
+As iterações rodam sempre em threads de trabalho: steps do Allure sem teste ativo na thread
+são descartados, então o relatório não recebe milhares de steps repetidos.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from tests.utils.metrics import LatencyHistogram
+
+MAX_ERROR_SAMPLES = 5
+# Tempo extra para as iterações já agendadas terminarem depois de --load-duration (open loop).
+DRAIN_TIMEOUT_S = 5.0
+
+
+@dataclass
+class LoadConfig:
+    duration: float = 0.0
+    concurrency: int = 1
+    rps: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.duration > 0
+
+    @property
+    def mode(self) -> str:
+        return "open" if self.rps > 0 else "closed"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "duration_s": self.duration,
+            "concurrency": self.concurrency,
+            "target_rps": self.rps or None,
+        }
+
+
+@dataclass
+class LoadResult:
+    scenario: str
+    config: LoadConfig
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    iterations: int = 0
+    errors: int = 0
+    error_samples: List[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    scheduled: int = 0
+    dropped: int = 0
+    # Relógio de parede do início: junta cenários que rodaram em paralelo (workers do xdist).
+    started_at: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, latency_ms: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.iterations += 1
+            self.histogram.add(latency_ms)
+            if error is not None:
+                self.errors += 1
+                sample = f"{type(error).__name__}: {error}"[:300]
+                if len(self.error_samples) < MAX_ERROR_SAMPLES and sample not in self.error_samples:
+                    self.error_samples.append(sample)
+
+    def summary(self) -> Dict[str, Any]:
+        summary = {
+            "scenario": self.scenario,
+            **_totals(self.iterations, self.errors, self.elapsed_s, self.histogram),
+            "error_samples": self.error_samples,
+        }
+        if self.config.mode == "open":
+            summary["dropped"] = self.dropped
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.scenario,
+            "config": {"duration": self.config.duration, "concurrency": self.config.concurrency, "rps": self.config.rps},
+            "histogram": self.histogram.to_dict(),
+            "iterations": self.iterations,
+            "errors": self.errors,
+            "error_samples": self.error_samples,
+            "elapsed_s": self.elapsed_s,
+            "scheduled": self.scheduled,
+            "dropped": self.dropped,
+            "started_at": self.started_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LoadResult":
+        return cls(
+            scenario=data["scenario"],
+            config=LoadConfig(**data["config"]),
+            histogram=LatencyHistogram.from_dict(data["histogram"]),
+            iterations=data["iterations"],
+            errors=data["errors"],
+            error_samples=list(data["error_samples"]),
+            elapsed_s=data["elapsed_s"],
+            scheduled=data["scheduled"],
+            dropped=data["dropped"],
+            started_at=data["started_at"],
+        )
+
+
+def _totals(iterations: int, errors: int, elapsed_s: float, histogram: LatencyHistogram) -> Dict[str, Any]:
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "error_rate": round((errors / iterations) * 100, 2) if iterations else 0,
+        "throughput_rps": round(iterations / elapsed_s, 2) if elapsed_s else 0,
+        "latency": histogram.summary(),
+    }
+
+
+def _run_once(scenario: Callable[[], Any], result: LoadResult, started_at: float) -> None:
+    error: Optional[BaseException] = None
+    try:
+        scenario()
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException as exc:  # noqa: B902 - pytest.fail/skip herdam de BaseException
+        error = exc
+    result.add((time.perf_counter() - started_at) * 1000, error)
+
+
+def _closed_loop(scenario: Callable[[], Any], result: LoadResult, deadline: float) -> None:
+    def _worker() -> None:
+        while time.perf_counter() < deadline:
+            _run_once(scenario, result, time.perf_counter())
+
+    workers = [
+        threading.Thread(target=_worker, name=f"load-worker-{index}", daemon=True)
+        for index in range(max(1, result.config.concurrency))
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def _open_loop(scenario: Callable[[], Any], result: LoadResult, start: float, deadline: float) -> None:
+    interval = 1.0 / result.config.rps
+    pool = ThreadPoolExecutor(max_workers=max(1, result.config.concurrency), thread_name_prefix="load-worker")
+    pending: List[Future] = []
+    try:
+        while True:
+            scheduled = start + result.scheduled * interval
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pending.append(pool.submit(_run_once, scenario, result, scheduled))
+            result.scheduled += 1
+        wait(pending, timeout=DRAIN_TIMEOUT_S)
+    finally:
+        # O que ainda está na fila depois do dreno não roda: vira `dropped` (workers insuficientes).
+        pool.shutdown(wait=True, cancel_futures=True)
+    result.dropped = sum(1 for future in pending if future.cancelled())
+
+
+def run_load(scenario_name: str, scenario: Callable[[], Any], config: LoadConfig) -> LoadResult:
+    result = LoadResult(scenario=scenario_name, config=config, started_at=time.time())
+    start = time.perf_counter()
+    deadline = start + config.duration
+    if config.mode == "open":
+        _open_loop(scenario, result, start, deadline)
+    else:
+        _closed_loop(scenario, result, deadline)
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+def _wall_time(results: List[LoadResult]) -> float:
+    """Tempo de parede coberto pelos cenários: soma se rodaram em sequência, união se em paralelo."""
+    total, end = 0.0, None
+    for start, stop in sorted((r.started_at, r.started_at + r.elapsed_s) for r in results):
+        if end is None or start >= end:
+            total += stop - start
+            end = stop
+        elif stop > end:
+            total += stop - end
+            end = stop
+    return total
+
+
+def summarize(results: List[LoadResult]) -> Dict[str, Any]:
+    """Seção `load` do api-metrics.json: totais de todos os cenários + detalhe por cenário."""
+    merged = LatencyHistogram()
+    for result in results:
+        merged.merge(result.histogram)
+    iterations = sum(result.iterations for result in results)
+    errors = sum(result.errors for result in results)
+    elapsed_s = _wall_time(results)
+    summary = {
+        **results[0].config.as_dict(),
+        **_totals(iterations, errors, elapsed_s, merged),
+        "scenarios": [result.summary() for result in results],
+    }
+    if results[0].config.mode == "open":
+        summary["dropped"] = sum(result.dropped for result in results)
+    return summary
@@ -6,6 +6,8 @@ from typing import Any, Dict, List, Optional
 
 import allure
 
+from tests.utils.sanitizer import Sanitizer
+
 LEVELS = ["debug", "info", "warn", "error"]
 MASK_KEYS = {"password", "passwd", "token", "authorization", "cookie", "set-cookie", "sf_token", "session"}
 MAX_PREVIEW_CHARS = int(os.environ.get("LOG_MAX_PREVIEW", "4000"))
@@ -15,18 +17,12 @@ def _iso_now() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
 
 
+# Mesmo motor do conftest; aqui a string inteira vira *** se mencionar uma chave sensível.
+_SANITIZER = Sanitizer(MASK_KEYS, redaction="***", max_chars=MAX_PREVIEW_CHARS, redact_strings_with_keys=True)
+
+
 def _mask(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, dict):
-        return {k: ("***" if k.lower() in MASK_KEYS else _mask(v)) for k, v in value.items()}
-    if isinstance(value, (list, tuple)):
-        return [_mask(v) for v in value]
-    if isinstance(value, str):
-        if len(value) > 3 and any(k in value.lower() for k in MASK_KEYS):
-            return "***"
-        return value[:MAX_PREVIEW_CHARS]
-    return value
+    return _SANITIZER.sanitize(value)
 
 
 class TestLogger:
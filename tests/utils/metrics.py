@@ -0,0 +1,257 @@
+"""
+Métricas de API com memória fixa, independente do número de requisições.
+
+LatencyHistogram é um histograma de buckets logarítmicos (mesma ideia do HDR
+Histogram/DDSketch): cada bucket cobre uma faixa com erro relativo máximo de
+`relative_accuracy`, então p50/p90/p95/p99 saem sem guardar as amostras e dois
+histogramas podem ser somados (merge) sem perder precisão.
+
+MetricStore guarda uma linha por (endpoint, classe de status) em colunas
+array('Q') e um histograma por linha.
+"""
+import math
+import re
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+QUANTILES = (("p50_ms", 0.50), ("p90_ms", 0.90), ("p95_ms", 0.95), ("p99_ms", 0.99))
+# IDs Salesforce (15/18 chars com ao menos um dígito) viram {id} para não criar uma linha por registro.
+_RECORD_ID = re.compile(r"(?<=/)(?=[A-Za-z0-9]*\d)[A-Za-z0-9]{15}(?:[A-Za-z0-9]{3})?(?=/|$)")
+
+
+def normalize_endpoint(path: str) -> str:
+    return _RECORD_ID.sub("{id}", path)
+
+
+def status_class(status: int) -> str:
+    return f"{status // 100}xx" if status else "error"
+
+
+class LatencyHistogram:
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 0.001, max_value: float = 3_600_000.0) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.floor(math.log(min_value) / self._log_gamma)
+        size = math.ceil(math.log(max_value) / self._log_gamma) - self._offset + 1
+        self.buckets = array("Q", [0]) * size
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+        return min(max(index, 0), len(self.buckets) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        upper = self._gamma ** (index + self._offset)
+        return 2 * upper / (self._gamma + 1)
+
+    def add(self, value: float) -> None:
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            self.buckets[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        # Nearest-rank: posição (base 0) da amostra que cobre a fração q.
+        rank = max(math.ceil(q * self.count) - 1, 0)
+        seen = self.zero_count
+        if rank < seen:
+            return self.min
+        for index, bucket_count in enumerate(self.buckets):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if rank < seen:
+                # Nunca devolve algo fora do intervalo realmente observado.
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if len(other.buckets) != len(self.buckets) or other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Histogramas com parâmetros diferentes não podem ser combinados.")
+        for index, bucket_count in enumerate(other.buckets):
+            if bucket_count:
+                self.buckets[index] += bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def summary(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2) if self.count else 0,
+        }
+        for name, q in QUANTILES:
+            data[name] = round(self.quantile(q) or 0, 2)
+        data["min_ms"] = round(self.min or 0, 2)
+        data["max_ms"] = round(self.max or 0, 2)
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(i): c for i, c in enumerate(self.buckets) if c},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        hist = cls(data["relative_accuracy"], data["min_value"], data["max_value"])
+        for index, bucket_count in data["buckets"].items():
+            hist.buckets[int(index)] = bucket_count
+        hist.zero_count = data["zero_count"]
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
+
+
+class MetricStore:
+    """
+    Uma linha por (endpoint, classe de status), com colunas contíguas:
+    count, success, size_bytes (array('Q')) e um LatencyHistogram.
+    Contadores livres (ex.: cache hit/miss) e histogramas auxiliares (ex.: esperas) ficam à parte.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self.count = array("Q")
+        self.success = array("Q")
+        self.size_bytes = array("Q")
+        self.histograms: List[LatencyHistogram] = []
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.observations: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _row(self, endpoint: str, klass: str) -> int:
+        key = (endpoint, klass)
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.histograms)
+            self._rows[key] = row
+            self.count.append(0)
+            self.success.append(0)
+            self.size_bytes.append(0)
+            self.histograms.append(LatencyHistogram())
+        return row
+
+    def record(self, method: str, path: str, status: int, elapsed_ms: float, size_bytes: int = 0) -> None:
+        endpoint = f"{method} {normalize_endpoint(path)}"
+        with self._lock:
+            row = self._row(endpoint, status_class(status))
+            self.count[row] += 1
+            if 200 <= status < 400:
+                self.success[row] += 1
+            self.size_bytes[row] += size_bytes
+            self.histograms[row].add(elapsed_ms)
+
+    def increment(self, counter: str, label: str, amount: int = 1) -> None:
+        with self._lock:
+            bucket = self.counters.setdefault(counter, {})
+            bucket[label] = bucket.get(label, 0) + amount
+
+    def observe(self, name: str, value_ms: float) -> None:
+        with self._lock:
+            self.observations.setdefault(name, LatencyHistogram()).add(value_ms)
+
+    def __len__(self) -> int:
+        return sum(self.count)
+
+    def merge(self, other: "MetricStore") -> None:
+        with self._lock:
+            for (endpoint, klass), other_row in other._rows.items():
+                row = self._row(endpoint, klass)
+                self.count[row] += other.count[other_row]
+                self.success[row] += other.success[other_row]
+                self.size_bytes[row] += other.size_bytes[other_row]
+                self.histograms[row].merge(other.histograms[other_row])
+            for counter, labels in other.counters.items():
+                bucket = self.counters.setdefault(counter, {})
+                for label, amount in labels.items():
+                    bucket[label] = bucket.get(label, 0) + amount
+            for name, hist in other.observations.items():
+                self.observations.setdefault(name, LatencyHistogram()).merge(hist)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": [
+                {
+                    "endpoint": endpoint,
+                    "status_class": klass,
+                    "count": self.count[row],
+                    "success": self.success[row],
+                    "size_bytes": self.size_bytes[row],
+                    "histogram": self.histograms[row].to_dict(),
+                }
+                for (endpoint, klass), row in self._rows.items()
+            ],
+            "counters": self.counters,
+            "observations": {name: hist.to_dict() for name, hist in self.observations.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricStore":
+        store = cls()
+        for item in data.get("rows", []):
+            row = store._row(item["endpoint"], item["status_class"])
+            store.count[row] = item["count"]
+            store.success[row] = item["success"]
+            store.size_bytes[row] = item["size_bytes"]
+            store.histograms[row] = LatencyHistogram.from_dict(item["histogram"])
+        store.counters = {name: dict(labels) for name, labels in data.get("counters", {}).items()}
+        store.observations = {
+            name: LatencyHistogram.from_dict(hist) for name, hist in data.get("observations", {}).items()
+        }
+        return store
+
+    def _endpoints(self) -> Iterable[Tuple[str, Dict[str, int]]]:
+        grouped: Dict[str, Dict[str, int]] = {}
+        for (endpoint, klass), row in self._rows.items():
+            grouped.setdefault(endpoint, {})[klass] = row
+        return grouped.items()
+
+    def summary(self) -> Dict[str, Any]:
+        total = len(self)
+        success = sum(self.success)
+        by_endpoint = []
+        for endpoint, rows in self._endpoints():
+            merged = LatencyHistogram()
+            by_status_class = {}
+            for klass, row in sorted(rows.items()):
+                merged.merge(self.histograms[row])
+                by_status_class[klass] = self.histograms[row].summary()
+            by_endpoint.append({"endpoint": endpoint, **merged.summary(), "by_status_class": by_status_class})
+
+        summary: Dict[str, Any] = {
+            "total_requests": total,
+            "success": success,
+            "failed": total - success,
+            "success_rate": round((success / total) * 100, 2) if total else 0,
+            "by_endpoint": by_endpoint,
+        }
+        if self.observations:
+            summary["observations"] = {name: hist.summary() for name, hist in self.observations.items()}
+        return summary
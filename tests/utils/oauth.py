@@ -0,0 +1,231 @@
+"""
+Access token OAuth do Salesforce compartilhado entre processos (workers do xdist, execuções paralelas).
+
+Fluxos suportados no endpoint /services/oauth2/token:
+  - client_credentials: client_id + client_secret do Connected App (usuário "Run As" na org);
+  - jwt: JWT bearer assinado com a chave privada do Connected App (precisa de `pyjwt[crypto]`).
+
+TokenProvider guarda token + instance_url + expiração em disco (JSON, permissão 600).
+Cada processo lê o arquivo; só quem segura o FileLock vai ao endpoint de token quando ele
+está perto de expirar, e os outros reaproveitam o que foi gravado. Uma thread em segundo plano
+renova antes do vencimento, então os testes não esbarram em INVALID_SESSION_ID no meio da execução.
+
+O Salesforce não devolve `expires_in`: a validade vem de `ttl` (o timeout de sessão da org).
+"""
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Optional, Set
+
+import httpx
+
+from tests.utils.filelock import FileLock
+
+log = logging.getLogger(__name__)
+# Espera entre tentativas de renovação que falharam: dobra a cada falha seguida.
+REFRESH_RETRY_BASE = 5.0
+REFRESH_RETRY_MAX = 300.0
+
+JWT_BEARER_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+TOKEN_PATH = "/services/oauth2/token"
+
+
+def jwt_available() -> bool:
+    return importlib.util.find_spec("jwt") is not None
+
+
+class OAuthError(RuntimeError):
+    """Endpoint de token recusou as credenciais (error/error_description do Salesforce)."""
+
+
+@dataclass
+class OAuthToken:
+    access_token: str
+    instance_url: str
+    expires_at: float
+    token_type: str = "Bearer"
+
+    def remaining(self, now: float) -> float:
+        return self.expires_at - now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OAuthToken":
+        return cls(
+            access_token=data["access_token"],
+            instance_url=data["instance_url"],
+            expires_at=float(data["expires_at"]),
+            token_type=data.get("token_type", "Bearer"),
+        )
+
+
+def client_credentials_form(client_id: str, client_secret: str) -> Dict[str, str]:
+    return {"grant_type": "client_credentials", "client_id": client_id, "client_secret": client_secret}
+
+
+def jwt_bearer_form(client_id: str, username: str, audience: str, private_key: str, lifetime: int = 180) -> Dict[str, str]:
+    if not jwt_available():
+        raise OAuthError("SF_OAUTH_FLOW=jwt precisa do pacote opcional pyjwt (pip install 'pyjwt[crypto]').")
+    import jwt
+
+    claims = {"iss": client_id, "sub": username, "aud": audience, "exp": int(time.time()) + lifetime}
+    return {"grant_type": JWT_BEARER_GRANT, "assertion": jwt.encode(claims, private_key, algorithm="RS256")}
+
+
+def fetch_token(
+    token_url: str,
+    form: Callable[[], Dict[str, str]],
+    ttl: float = 7200.0,
+    timeout: float = 30.0,
+    transport: Optional[httpx.BaseTransport] = None,
+) -> OAuthToken:
+    """POST no endpoint de token; a assinatura do JWT é gerada a cada chamada (`form`)."""
+    with httpx.Client(timeout=timeout, transport=transport) as client:
+        response = client.post(token_url, data=form())
+    try:
+        payload = response.json()
+    except ValueError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    if response.status_code != 200 or "access_token" not in payload:
+        raise OAuthError(
+            f"Falha ao obter token em {token_url} (HTTP {response.status_code}): "
+            f"{payload.get('error', 'sem corpo JSON')} - {payload.get('error_description', '')}".rstrip(" -")
+        )
+    # issued_at vem em milissegundos; expires_in só aparece em alguns fluxos.
+    issued_at = float(payload.get("issued_at", time.time() * 1000)) / 1000
+    lifetime = float(payload.get("expires_in", ttl))
+    return OAuthToken(
+        access_token=payload["access_token"],
+        instance_url=payload["instance_url"],
+        expires_at=issued_at + lifetime,
+        token_type=payload.get("token_type", "Bearer"),
+    )
+
+
+class TokenProvider:
+    def __init__(
+        self,
+        fetch: Callable[[], OAuthToken],
+        cache_path: Path,
+        refresh_margin: float = 300.0,
+        lock_timeout: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.fetch = fetch
+        self.cache_path = Path(cache_path)
+        self.lock_path = self.cache_path.with_name(self.cache_path.name + ".lock")
+        self.refresh_margin = refresh_margin
+        self.lock_timeout = lock_timeout
+        self.fetches = 0
+        self._clock = clock
+        self._token: Optional[OAuthToken] = None
+        self._rejected: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _usable(self, token: Optional[OAuthToken], margin: float) -> bool:
+        return (
+            token is not None
+            and token.access_token not in self._rejected
+            and token.remaining(self._clock()) > margin
+        )
+
+    def token(self) -> OAuthToken:
+        token = self._token
+        if self._usable(token, self.refresh_margin):
+            return token
+        return self._ensure(self.refresh_margin)
+
+    def invalidate(self, access_token: str) -> None:
+        """Token recusado pela org (401): o próximo token() busca outro e regrava o cache em disco."""
+        with self._lock:
+            self._rejected.add(access_token)
+
+    def _ensure(self, margin: float) -> OAuthToken:
+        with self._lock:
+            if self._usable(self._token, margin):
+                return self._token
+            cached = self._read_cache()
+            if not self._usable(cached, margin):
+                with FileLock(self.lock_path, timeout=self.lock_timeout):
+                    # Outro processo pode ter renovado enquanto esperávamos o lock.
+                    cached = self._read_cache()
+                    if not self._usable(cached, margin):
+                        cached = self.fetch()
+                        self.fetches += 1
+                        self._write_cache(cached)
+            self._token = cached
+            return cached
+
+    def _read_cache(self) -> Optional[OAuthToken]:
+        try:
+            return OAuthToken.from_dict(json.loads(self.cache_path.read_text(encoding="utf-8")))
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self, token: OAuthToken) -> None:
+        # Escrita atômica: leitores sem lock nunca veem o arquivo pela metade.
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(token.to_dict(), file)
+        os.replace(tmp_path, self.cache_path)
+
+    # --- renovação em segundo plano ------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="oauth-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self) -> None:
+        # Renova com o dobro da margem: os testes nunca chegam a esperar pelo endpoint de token.
+        ahead = self.refresh_margin * 2
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                token = self._ensure(ahead)
+                delay = max(1.0, token.remaining(self._clock()) - ahead)
+                failures = 0
+            except Exception:
+                # Qualquer erro: a thread não pode morrer, senão os testes voltam a esperar pelo token.
+                failures += 1
+                delay = min(REFRESH_RETRY_MAX, REFRESH_RETRY_BASE * 2 ** (failures - 1))
+                log.warning("Falha ao renovar o token OAuth (%d seguidas); nova tentativa em %.0fs", failures, delay,
+                            exc_info=True)
+            self._stop.wait(delay)
+
+
+class OAuthAuth(httpx.Auth):
+    """Bearer do TokenProvider; num 401 descarta o token, renova e repete a requisição uma vez."""
+
+    def __init__(self, provider: TokenProvider) -> None:
+        self.provider = provider
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        token = self.provider.token()
+        request.headers["Authorization"] = f"{token.token_type} {token.access_token}"
+        response = yield request
+        if response.status_code == 401:
+            self.provider.invalidate(token.access_token)
+            token = self.provider.token()
+            request.headers["Authorization"] = f"{token.token_type} {token.access_token}"
+            yield request
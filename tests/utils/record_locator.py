@@ -0,0 +1,62 @@
+"""
+Localiza registros pela API para o teste UI abrir a página do registro direto.
+
+Em vez de rolar a list view ou digitar na busca dela, uma consulta SOQL resolve o nome para o Id:
+    locator = RecordLocator(api_client, "v61.0", cache={})
+    record_id = locator.find_id("Contact", "Ana Souza")   # None se não achar ou a API falhar
+    goto_lightning(page, RecordLocator.record_url(base, "Contact", record_id))
+
+Os Ids encontrados ficam em cache (o dict é da sessão, compartilhado entre testes); não encontrado
+não entra no cache, porque o registro pode ser criado depois. Depois de excluir o registro, chame
+forget(record_id).
+"""
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+CacheKey = Tuple[str, str, str]
+
+
+def soql_literal(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+class RecordLocator:
+    def __init__(self, client: httpx.Client, api_version: str, cache: Optional[Dict[CacheKey, str]] = None) -> None:
+        self.client = client
+        self.api_version = api_version
+        self.cache: Dict[CacheKey, str] = {} if cache is None else cache
+
+    @property
+    def base_path(self) -> str:
+        return f"/services/data/{self.api_version}"
+
+    @staticmethod
+    def record_url(lightning_base: str, sobject: str, record_id: str, action: str = "view") -> str:
+        return f"{lightning_base.rstrip('/')}/lightning/r/{sobject}/{record_id}/{action}"
+
+    def find_id(self, sobject: str, value: str, field: str = "Name") -> Optional[str]:
+        """Id do registro mais recente com `field` igual a `value`; None se não houver ou a consulta falhar."""
+        key = (sobject, field, value)
+        if key in self.cache:
+            return self.cache[key]
+        soql = (
+            f"SELECT Id FROM {sobject} WHERE {field} = {soql_literal(value)} "
+            "ORDER BY LastModifiedDate DESC LIMIT 1"
+        )
+        try:
+            response = self.client.get(f"{self.base_path}/query", params={"q": soql})
+        except httpx.HTTPError:
+            return None
+        if response.status_code != 200:
+            return None
+        records = response.json().get("records") or []
+        if not records:
+            return None
+        self.cache[key] = records[0]["Id"]
+        return self.cache[key]
+
+    def forget(self, record_id: str) -> None:
+        for key in [key for key, cached in self.cache.items() if cached == record_id]:
+            del self.cache[key]
@@ -0,0 +1,284 @@
+"""
+Retentativas com backoff exponencial (full jitter) e circuit breaker por endpoint.
+
+Quando retenta:
+  - falha de rede/timeout: GET/HEAD/OPTIONS/PUT/DELETE sempre; POST/PATCH só se a conexão
+    nem chegou a ser aberta (ConnectError/ConnectTimeout/PoolTimeout), pois a org pode ter
+    processado a requisição;
+  - 429/503 (a org não processou) em qualquer método, respeitando Retry-After;
+  - 502/504 só em métodos idempotentes;
+  - erro UNABLE_TO_LOCK_ROW (a DML foi revertida) em qualquer método.
+
+O circuit breaker abre depois de `failure_threshold` falhas seguidas no mesmo endpoint
+(método + path normalizado; só rede/timeout e BREAKER_FAILURE_STATUSES contam) e passa a falhar na hora com CircuitOpenError; depois de
+`reset_timeout` segundos deixa uma requisição de teste passar (half-open).
+
+Cada tentativa que vai ser repetida é informada ao callback em
+request.extensions["api_attempt_hook"] (o fixture api_client grava no log do teste e em
+API_METRICS); a resposta final leva response.extensions["api_attempts"].
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from tests.utils.metrics import normalize_endpoint
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+ALWAYS_RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_RETRY_STATUSES = frozenset({502, 504})
+RETRY_ERROR_CODES = frozenset({"UNABLE_TO_LOCK_ROW"})
+BREAKER_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+# Falhas em que a requisição certamente não saiu do cliente.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Endpoint com o circuito aberto: falha imediata, sem ir à rede."""
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    rng: random.Random = field(default_factory=random.Random)
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: espalha as retentativas de vários workers em vez de sincronizá-las.
+        return self.rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def should_retry_error(self, request: httpx.Request, error: Exception) -> bool:
+        if not isinstance(error, _RETRYABLE_ERRORS):
+            return False
+        return request.method in IDEMPOTENT_METHODS or isinstance(error, _NOT_SENT_ERRORS)
+
+    def should_retry_response(self, request: httpx.Request, response: httpx.Response) -> bool:
+        status = response.status_code
+        if status in ALWAYS_RETRY_STATUSES:
+            return True
+        if status in IDEMPOTENT_RETRY_STATUSES:
+            return request.method in IDEMPOTENT_METHODS
+        if status in (400, 409, 500):
+            return _error_code(response) in RETRY_ERROR_CODES
+        return False
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_code(response: httpx.Response) -> Optional[str]:
+    # Erros da API REST vêm como [{"errorCode": ..., "message": ...}].
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, list) and body and isinstance(body[0], dict):
+        return body[0].get("errorCode")
+    if isinstance(body, dict):
+        return body.get("errorCode")
+    return None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        # endpoint -> (falhas seguidas, aberto desde, probe em andamento)
+        self._state: Dict[str, Tuple[int, Optional[float], bool]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        return f"{request.method} {request.url.host}{normalize_endpoint(request.url.path)}"
+
+    def before(self, key: str) -> bool:
+        """Falha na hora se o circuito estiver aberto; True se esta requisição é o probe do half-open."""
+        with self._lock:
+            failures, opened_at, probing = self._state.get(key, (0, None, False))
+            if opened_at is None:
+                return False
+            if probing or self._clock() - opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuito aberto para {key} após {failures} falhas seguidas; "
+                    f"nova tentativa em até {self.reset_timeout:.0f}s."
+                )
+            # Half-open: só esta requisição passa até sabermos se o endpoint voltou.
+            self._state[key] = (failures, opened_at, True)
+            return True
+
+    def cancel_probe(self, key: str) -> None:
+        """Probe que não chegou à org (recusa local, exceção): a próxima requisição tenta de novo."""
+        with self._lock:
+            failures, opened_at, probing = self._state.get(key, (0, None, False))
+            if probing:
+                self._state[key] = (failures, opened_at, False)
+
+    def record(self, key: str, failed: bool) -> None:
+        with self._lock:
+            if not failed:
+                self._state.pop(key, None)
+                return
+            failures, opened_at, probing = self._state.get(key, (0, None, False))
+            failures += 1
+            if probing or failures >= self.failure_threshold:
+                self._state[key] = (failures, self._clock(), False)
+            else:
+                self._state[key] = (failures, None, False)
+
+    def is_open(self, key: str) -> bool:
+        with self._lock:
+            return self._state.get(key, (0, None, False))[1] is not None
+
+
+def _notify(request: httpx.Request, **attempt) -> None:
+    hook = request.extensions.get("api_attempt_hook")
+    if hook is not None:
+        hook(request, **attempt)
+
+
+class _RetryLogic:
+    def __init__(self, policy: RetryPolicy, breaker: Optional[CircuitBreaker]) -> None:
+        self.policy = policy
+        self.breaker = breaker
+
+    def before(self, key: str) -> bool:
+        return self.breaker.before(key) if self.breaker is not None else False
+
+    def after(self, key: str, response: Optional[httpx.Response], error: Optional[Exception]) -> bool:
+        """Registra o resultado no circuit breaker; False se a tentativa não diz nada sobre o endpoint."""
+        if self.breaker is None:
+            return False
+        if error is not None:
+            # Recusa local (ApiBudgetExhausted, CassetteMissError...) não diz nada sobre o endpoint.
+            if not isinstance(error, _RETRYABLE_ERRORS):
+                return False
+            self.breaker.record(key, True)
+            return True
+        self.breaker.record(key, response.status_code in BREAKER_FAILURE_STATUSES)
+        return True
+
+    def cancel_probe(self, key: str) -> None:
+        if self.breaker is not None:
+            self.breaker.cancel_probe(key)
+
+    def decide(self, request: httpx.Request, attempt: int, response: Optional[httpx.Response], error: Optional[Exception]) -> Optional[float]:
+        """Segundos de espera antes da próxima tentativa, ou None para parar."""
+        if attempt >= self.policy.max_attempts:
+            return None
+        if error is not None:
+            return self.policy.backoff(attempt) if self.policy.should_retry_error(request, error) else None
+        if self.policy.should_retry_response(request, response):
+            return self.policy.backoff(attempt, response)
+        return None
+
+
+class RetryTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, policy: RetryPolicy, breaker: Optional[CircuitBreaker] = None) -> None:
+        self.inner = inner
+        self.logic = _RetryLogic(policy, breaker)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = CircuitBreaker.key_for(request)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.logic.before(key)
+            settled = False
+            start = time.perf_counter()
+            response: Optional[httpx.Response] = None
+            error: Optional[Exception] = None
+            try:
+                try:
+                    response = self.inner.handle_request(request)
+                    if response.status_code >= 400:
+                        response.read()
+                except httpx.TransportError as exc:
+                    error = exc
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                settled = self.logic.after(key, response, error)
+            finally:
+                if probe and not settled:
+                    self.logic.cancel_probe(key)
+
+            delay = self.logic.decide(request, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                response.extensions["api_attempts"] = attempt
+                return response
+
+            _notify(request, attempt=attempt, response=response, error=error, elapsed_ms=elapsed_ms, retry_in_ms=delay * 1000)
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Mesma política para o async_api_client (pode compartilhar o circuit breaker)."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, policy: RetryPolicy, breaker: Optional[CircuitBreaker] = None) -> None:
+        self.inner = inner
+        self.logic = _RetryLogic(policy, breaker)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = CircuitBreaker.key_for(request)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.logic.before(key)
+            settled = False
+            start = time.perf_counter()
+            response: Optional[httpx.Response] = None
+            error: Optional[Exception] = None
+            try:
+                try:
+                    response = await self.inner.handle_async_request(request)
+                    if response.status_code >= 400:
+                        await response.aread()
+                except httpx.TransportError as exc:
+                    error = exc
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                settled = self.logic.after(key, response, error)
+            finally:
+                if probe and not settled:
+                    self.logic.cancel_probe(key)
+
+            delay = self.logic.decide(request, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                response.extensions["api_attempts"] = attempt
+                return response
+
+            _notify(request, attempt=attempt, response=response, error=error, elapsed_ms=elapsed_ms, retry_in_ms=delay * 1000)
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
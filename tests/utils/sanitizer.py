@@ -0,0 +1,138 @@
+"""
+Motor único de sanitização para logs de API, cassettes e o TestLogger.
+
+- Um só regex pré-compilado (alternância nomeada) mascara e-mail/CPF/telefone numa passada.
+- Strings são cortadas antes de mascarar: um body de 5 MB não é varrido inteiro para
+  guardar 4 KB. O corte deixa uma folga (`MASK_MARGIN`) para não partir um e-mail ao meio
+  e vazar o pedaço; o resultado final respeita `max_chars`.
+- Estruturas aninhadas são percorridas com pilha explícita (sem recursão) até `max_depth`.
+- A checagem de chave sensível é memoizada (as mesmas chaves se repetem em todo body).
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Pattern
+
+PII_PATTERNS = {
+    "email": re.compile(r"[\w\.-]+@[\w\.-]+\.\w+", re.IGNORECASE),
+    "phone": re.compile(r"\+?\d{0,3}\s*\(?\d{2}\)?[\s-]?\d{4,5}[\s-]?\d{4}"),
+    "cpf": re.compile(r"\b\d{3}\.?\d{3}\.?\d{3}-?\d{2}\b"),
+}
+MASK_MARGIN = 64
+DEPTH_MARKER = "[max-depth]"
+_CONTAINERS = (dict, list, tuple)
+_PII_HINT = re.compile(r"[@\d]")
+
+
+def _combined_pattern(patterns: Mapping[str, Pattern[str]], secret_words: Iterable[str] = ()) -> Pattern[str]:
+    parts = []
+    for name, pattern in patterns.items():
+        source = f"(?i:{pattern.pattern})" if pattern.flags & re.IGNORECASE else pattern.pattern
+        parts.append(f"(?P<{name}>{source})")
+    words = sorted(secret_words, key=len, reverse=True)
+    if words:
+        parts.append("(?P<secret>(?i:" + "|".join(re.escape(word) for word in words) + "))")
+    return re.compile("|".join(parts))
+
+
+class Sanitizer:
+    """
+    sensitive_keys: chaves de dict (e headers) cujo valor vira `redaction`.
+    redact_strings_with_keys: se a string contém uma dessas palavras (ex.: "token=..."),
+    a string inteira vira `redaction` (comportamento do TestLogger).
+    """
+
+    def __init__(
+        self,
+        sensitive_keys: Iterable[str],
+        sensitive_headers: Optional[Iterable[str]] = None,
+        patterns: Mapping[str, Pattern[str]] = PII_PATTERNS,
+        redaction: str = "[redacted]",
+        max_chars: int = 4000,
+        max_depth: int = 32,
+        redact_strings_with_keys: bool = False,
+    ) -> None:
+        self.sensitive_keys = frozenset(key.lower() for key in sensitive_keys)
+        self.sensitive_headers = frozenset(h.lower() for h in (sensitive_headers or self.sensitive_keys))
+        self.redaction = redaction
+        self.max_chars = max_chars
+        self.max_depth = max_depth
+        self.redact_strings_with_keys = redact_strings_with_keys
+        self.pattern = _combined_pattern(patterns, self.sensitive_keys if redact_strings_with_keys else ())
+        self.is_sensitive_key = lru_cache(maxsize=2048)(self._is_sensitive_key)
+        self.is_sensitive_header = lru_cache(maxsize=512)(self._is_sensitive_header)
+
+    def _is_sensitive_key(self, key: Any) -> bool:
+        return str(key).lower() in self.sensitive_keys
+
+    def _is_sensitive_header(self, key: Any) -> bool:
+        return str(key).lower() in self.sensitive_headers
+
+    def mask_text(self, value: str) -> str:
+        text = value[: self.max_chars + MASK_MARGIN]
+        if not self.redact_strings_with_keys:
+            # Sem dígito nem "@" nenhum padrão de PII casa; a maioria dos campos cai aqui.
+            if _PII_HINT.search(text) is None:
+                return text[: self.max_chars]
+            # Substituição por string literal: sem callback Python por ocorrência.
+            return self.pattern.sub(self.redaction, text)[: self.max_chars]
+
+        found_secret = False
+
+        def _replace(match: "re.Match[str]") -> str:
+            nonlocal found_secret
+            if match.lastgroup == "secret":
+                found_secret = True
+                return match.group(0)
+            return self.redaction
+
+        masked = self.pattern.sub(_replace, text)
+        if found_secret:
+            return self.redaction
+        return masked[: self.max_chars]
+
+    def _scalar(self, value: Any) -> Any:
+        if isinstance(value, bytes):
+            value = value[: (self.max_chars + MASK_MARGIN) * 4].decode("utf-8", errors="replace")
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        return self.mask_text(value if isinstance(value, str) else str(value))
+
+    def sanitize(self, data: Any) -> Any:
+        if not isinstance(data, _CONTAINERS):
+            return self._scalar(data)
+
+        root: List[Any] = [None]
+        stack: List[Any] = [(data, root, 0, 0)]
+        while stack:
+            value, parent, slot, depth = stack.pop()
+            if depth >= self.max_depth:
+                parent[slot] = DEPTH_MARKER
+                continue
+            if isinstance(value, dict):
+                clean: Dict[Any, Any] = {}
+                for key, item in value.items():
+                    if self.is_sensitive_key(key):
+                        clean[key] = self.redaction
+                    elif isinstance(item, _CONTAINERS):
+                        # Reserva a posição agora para manter a ordem original das chaves.
+                        clean[key] = None
+                        stack.append((item, clean, key, depth + 1))
+                    else:
+                        clean[key] = self._scalar(item)
+                parent[slot] = clean
+            else:
+                items: List[Any] = []
+                for index, item in enumerate(value):
+                    if isinstance(item, _CONTAINERS):
+                        items.append(None)
+                        stack.append((item, items, index, depth + 1))
+                    else:
+                        items.append(self._scalar(item))
+                parent[slot] = items
+        return root[0]
+
+    def sanitize_headers(self, headers: Any) -> Dict[str, str]:
+        return {
+            str(key): self.redaction if self.is_sensitive_header(key) else self.mask_text(str(value))
+            for key, value in headers.items()
+        }
@@ -0,0 +1,136 @@
+"""
+Screenshots dos testes UI sem travar o teste em codificação e sem anexos repetidos.
+
+capture() tira o screenshot na thread do teste, porque a API síncrona do Playwright não é thread-safe.
+Com SCREENSHOT_FORMAT=jpeg a imagem já sai em JPEG do browser, bem menor que o PNG.
+
+O resto roda numa thread de fundo:
+  - hash do conteúdo, descartando quadros idênticos a um já capturado no mesmo teste;
+  - redução de largura e conversão para WebP, só com Pillow instalado (pip install Pillow);
+  - gravação em test-results/screenshots/.
+
+flush() anexa no Allure, na ordem de captura e na thread do teste, porque o allure-pytest guarda o
+teste corrente por thread.
+"""
+import hashlib
+import importlib
+import importlib.util
+import io
+import threading
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import allure
+
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+# (attachment_type, extensão) do Allure; WebP não tem AttachmentType, vai pelo mime.
+_ATTACHMENT_TYPES = {
+    "png": (allure.attachment_type.PNG, None),
+    "jpeg": (allure.attachment_type.JPG, None),
+    "webp": ("image/webp", "webp"),
+}
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+@dataclass
+class ScreenshotStats:
+    captured: int = 0
+    attached: int = 0
+    duplicates: int = 0
+    raw_bytes: int = 0
+    attached_bytes: int = 0
+    capture_ms: float = 0.0
+    flush_wait_ms: float = 0.0
+
+
+class ScreenshotService:
+    def __init__(
+        self,
+        out_dir: Path,
+        executor: Executor,
+        image_format: str = "jpeg",
+        quality: int = 70,
+        max_width: int = 0,
+        prefix: str = "",
+    ) -> None:
+        if image_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"SCREENSHOT_FORMAT={image_format!r} inválido; use um de {', '.join(SCREENSHOT_FORMATS)}.")
+        # Sem Pillow não há como gerar WebP nem reduzir: fica no JPEG do próprio browser.
+        if not pillow_available():
+            image_format = "jpeg" if image_format == "webp" else image_format
+            max_width = 0
+        self.out_dir = out_dir
+        self.executor = executor
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.prefix = prefix
+        self.stats = ScreenshotStats()
+        self._pending: List[Tuple[str, Future]] = []
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _capture_options(self) -> Dict[str, Any]:
+        # WebP e redução partem de um PNG sem perdas; JPEG sem redução já sai pronto do browser.
+        if self.image_format == "jpeg" and not self.max_width:
+            return {"type": "jpeg", "quality": self.quality}
+        return {"type": "png"}
+
+    def capture(self, page, name: str, full_page: bool = True) -> None:
+        start = time.perf_counter()
+        data = page.screenshot(full_page=full_page, **self._capture_options())
+        self.stats.capture_ms += (time.perf_counter() - start) * 1000
+        self.stats.captured += 1
+        self.stats.raw_bytes += len(data)
+        self._pending.append((name, self.executor.submit(self._process, data)))
+
+    def _encode(self, data: bytes) -> bytes:
+        if self.image_format != "webp" and not self.max_width:
+            return data
+        image_module = importlib.import_module("PIL.Image")
+        image = image_module.open(io.BytesIO(data))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), image_module.LANCZOS)
+        output = io.BytesIO()
+        if self.image_format == "png":
+            image.save(output, format="PNG", optimize=True)
+        else:
+            # JPEG não tem canal alfa.
+            image.convert("RGB").save(output, format=self.image_format.upper(), quality=self.quality)
+        return output.getvalue()
+
+    def _process(self, data: bytes) -> Optional[Path]:
+        # A mesma tela gera os mesmos bytes: repetido nem passa pelo encode nem vai para o disco.
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            if digest in self._seen:
+                return None
+            self._seen.add(digest)
+        extension = "jpg" if self.image_format == "jpeg" else self.image_format
+        path = self.out_dir / f"{self.prefix}{digest[:12]}.{extension}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self._encode(data))
+        return path
+
+    def flush(self) -> ScreenshotStats:
+        """Espera o processamento pendente e anexa no Allure (chamar na thread do teste)."""
+        pending, self._pending = self._pending, []
+        attachment_type, extension = _ATTACHMENT_TYPES[self.image_format]
+        for name, future in pending:
+            start = time.perf_counter()
+            path = future.result()
+            self.stats.flush_wait_ms += (time.perf_counter() - start) * 1000
+            if path is None:
+                self.stats.duplicates += 1
+                continue
+            allure.attach.file(str(path), name=name, attachment_type=attachment_type, extension=extension)
+            self.stats.attached += 1
+            self.stats.attached_bytes += path.stat().st_size
+        return self.stats
@@ -0,0 +1,457 @@
+"""
+Servidor local que imita os endpoints REST do Salesforce usados pela suíte.
+Serve para testes unitários e benchmarks sem depender de uma org real,
+tanto como servidor HTTP local (SalesforceStubServer) quanto como app ASGI (SalesforceStubApp).
+
+Também emite tokens em /services/oauth2/token (client_credentials com stub-client/stub-secret
+ou JWT bearer sem checar assinatura) e devolve 401 para tokens em `revoked_tokens`.
+
+Uso como servidor avulso (ex.: modo carga no CI):
+    python -m tests.utils.sf_stub --port 8765 --daily-limit 1000000
+"""
+import argparse
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+StubResult = Tuple[int, Dict[str, str], Any]
+StubRoute = Callable[["SalesforceStub", "re.Match", Dict[str, Any]], StubResult]
+
+DEFAULT_LIMITS = {
+    "DailyApiRequests": {"Max": 15000, "Remaining": 14990},
+    "DataStorageMB": {"Max": 5, "Remaining": 5},
+    "FileStorageMB": {"Max": 20, "Remaining": 20},
+}
+
+
+KEY_PREFIXES = {"Account": "001", "Contact": "003", "Opportunity": "006", "Lead": "00Q", "Case": "500"}
+REQUIRED_FIELDS = {
+    "Account": ("Name",),
+    "Contact": ("LastName",),
+    "Opportunity": ("Name", "StageName", "CloseDate"),
+}
+# Campos servidos no describe/object-info: (nome, tipo, obrigatório, valores da picklist).
+METADATA_FIELDS = {
+    "Account": (
+        ("Id", "id", False, ()),
+        ("Name", "string", True, ()),
+        ("Industry", "picklist", False, ("Agriculture", "Banking", "Technology")),
+    ),
+    "Contact": (
+        ("Id", "id", False, ()),
+        ("Salutation", "picklist", False, ("Mr.", "Ms.", "Mrs.", "Dr.", "Prof.")),
+        ("FirstName", "string", False, ()),
+        ("LastName", "string", True, ()),
+        ("Email", "email", False, ()),
+        ("LeadSource", "picklist", False, ("Web", "Phone Inquiry", "Other")),
+    ),
+}
+_METADATA_EPOCH = 1704067200
+_REFERENCE = re.compile(r"@\{([^.}]+)\.id\}")
+# Só o formato que a suíte usa: SELECT ... FROM <Objeto> WHERE <Campo> = '<valor>' [... LIMIT n].
+_SOQL_EQUALS = re.compile(
+    r"SELECT\s+.+?\s+FROM\s+(\w+)\s+WHERE\s+(\w+)\s*=\s*'((?:[^'\\]|\\.)*)'(?:.*?\bLIMIT\s+(\d+))?",
+    re.IGNORECASE | re.DOTALL,
+)
+OAUTH_TOKEN_PATH = "/services/oauth2/token"
+JWT_BEARER_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+
+
+def _limits_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    return 200, {}, server.limits
+
+
+def _composite_graph_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    graphs = []
+    for graph in (request["body"] or {}).get("graphs", []):
+        created: Dict[str, str] = {}
+        responses: List[Dict[str, Any]] = []
+        failed = False
+        for node in graph.get("compositeRequest", []):
+            ref = node.get("referenceId")
+            if failed:
+                responses.append(
+                    {"referenceId": ref, "httpStatusCode": 400, "httpHeaders": {},
+                     "body": [{"errorCode": "PROCESSING_HALTED", "message": "The transaction was rolled back"}]}
+                )
+                continue
+            sobject = node["url"].rstrip("/").rsplit("/", 1)[-1]
+            fields = {
+                key: _REFERENCE.sub(lambda m: created.get(m.group(1), m.group(0)), value) if isinstance(value, str) else value
+                for key, value in (node.get("body") or {}).items()
+            }
+            missing = [name for name in REQUIRED_FIELDS.get(sobject, ()) if not fields.get(name)]
+            if missing:
+                failed = True
+                responses.append(
+                    {"referenceId": ref, "httpStatusCode": 400, "httpHeaders": {},
+                     "body": [{"errorCode": "REQUIRED_FIELD_MISSING", "message": f"Required fields are missing: {missing}", "fields": missing}]}
+                )
+                continue
+            record_id = server.create_record(sobject, fields)
+            created[ref] = record_id
+            responses.append(
+                {"referenceId": ref, "httpStatusCode": 201,
+                 "httpHeaders": {"Location": f"{node['url'].rstrip('/')}/{record_id}"},
+                 "body": {"id": record_id, "success": True, "errors": []}}
+            )
+        if failed:
+            # Composite Graph é tudo-ou-nada: desfaz o que o grafo criou.
+            for record_id in created.values():
+                server.records.pop(record_id, None)
+        graphs.append(
+            {"graphId": graph.get("graphId"), "isSuccessful": not failed,
+             "graphResponse": {"compositeResponse": responses}}
+        )
+    return 200, {}, {"graphs": graphs}
+
+
+def _composite_delete_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    ids = [value for value in parse_qs(request["query"]).get("ids", [""])[0].split(",") if value]
+    results = []
+    for record_id in ids:
+        if server.records.pop(record_id, None) is not None:
+            results.append({"id": record_id, "success": True, "errors": []})
+        else:
+            results.append({"id": record_id, "success": False,
+                            "errors": [{"statusCode": "ENTITY_IS_DELETED", "message": "entity is deleted"}]})
+    return 200, {}, results
+
+
+def _sobjects_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    sobjects = [{"name": name, "keyPrefix": prefix, "queryable": True} for name, prefix in KEY_PREFIXES.items()]
+    return 200, {}, {"encoding": "UTF-8", "maxBatchSize": 200, "sobjects": sobjects}
+
+
+def _oauth_token_route(server: "SalesforceStub", match: Optional["re.Match"], request: Dict[str, Any]) -> StubResult:
+    form = {key: values[0] for key, values in parse_qs(request["body"] or "").items()}
+    grant = form.get("grant_type")
+    if grant == "client_credentials":
+        valid = server.oauth_clients.get(form.get("client_id")) == form.get("client_secret")
+    elif grant == JWT_BEARER_GRANT:
+        # A assinatura não é verificada: basta um JWT bem formado de um client conhecido.
+        valid = form.get("assertion", "").count(".") == 2
+    else:
+        return 400, {}, {"error": "unsupported_grant_type", "error_description": "grant type not supported"}
+    if not valid:
+        return 400, {}, {"error": "invalid_client", "error_description": "invalid client credentials"}
+    with server._lock:
+        server.tokens_issued += 1
+        access_token = f"00Dstub!{server.tokens_issued:08d}"
+    host = request["headers"].get("host", "127.0.0.1")
+    return 200, {}, {
+        "access_token": access_token,
+        "instance_url": f"http://{host}",
+        "id": f"http://{host}/id/00Dstub/005stub",
+        "token_type": "Bearer",
+        "issued_at": str(int(time.time() * 1000)),
+    }
+
+
+def _field_value(record: Dict[str, Any], field: str) -> Any:
+    # Name de Contact/Lead é composto no Salesforce.
+    if field == "Name" and "Name" not in record:
+        return " ".join(part for part in (record.get("FirstName"), record.get("LastName")) if part)
+    return record.get(field)
+
+
+def _query_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    soql = parse_qs(request["query"]).get("q", [""])[0]
+    parsed = _SOQL_EQUALS.fullmatch(soql.strip())
+    if parsed is None:
+        return 400, {}, [{"errorCode": "MALFORMED_QUERY", "message": "stub só entende WHERE <campo> = '<valor>'"}]
+    sobject, field, raw_value, limit = parsed.groups()
+    value = re.sub(r"\\(.)", r"\1", raw_value)
+    # Mais recentes primeiro, como o ORDER BY LastModifiedDate DESC que a suíte usa.
+    records = [
+        {"attributes": {"type": sobject, "url": f"{match.group(1)}/sobjects/{sobject}/{record['Id']}"}, "Id": record["Id"]}
+        for record in reversed(list(server.records.values()))
+        if record["attributes"]["type"] == sobject and _field_value(record, field) == value
+    ]
+    if limit:
+        records = records[:int(limit)]
+    return 200, {}, {"totalSize": len(records), "done": True, "records": records}
+
+
+def _metadata_fields(sobject: str):
+    fields = METADATA_FIELDS.get(sobject)
+    if fields is None and sobject in KEY_PREFIXES:
+        fields = (("Id", "id", False, ()),) + tuple((name, "string", True, ()) for name in REQUIRED_FIELDS.get(sobject, ()))
+    return fields
+
+
+def _describe_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    fields = _metadata_fields(match.group(1))
+    if fields is None:
+        return 404, {}, [{"errorCode": "NOT_FOUND", "message": "The requested resource does not exist"}]
+    # O describe responde 304 a If-Modified-Since quando o objeto não mudou desde então.
+    last_modified = formatdate(_METADATA_EPOCH + server.metadata_version * 60, usegmt=True)
+    if request["headers"].get("if-modified-since") == last_modified:
+        return 304, {"Last-Modified": last_modified}, None
+    payload = {
+        "name": match.group(1),
+        "fields": [
+            {
+                "name": name, "label": name, "type": kind, "nillable": not required, "createable": kind != "id",
+                "defaultedOnCreate": False,
+                "picklistValues": [{"value": value, "label": value, "active": True} for value in values],
+            }
+            for name, kind, required, values in fields
+        ],
+    }
+    return 200, {"Last-Modified": last_modified}, payload
+
+
+def _object_info_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    fields = _metadata_fields(match.group(1))
+    if fields is None:
+        return 404, {}, [{"errorCode": "NOT_FOUND", "message": "The requested resource does not exist"}]
+    # A UI API revalida por ETag (If-None-Match).
+    etag = f'"{match.group(1)}-{server.metadata_version}"'
+    if request["headers"].get("if-none-match") == etag:
+        return 304, {"ETag": etag}, None
+    payload = {
+        "apiName": match.group(1),
+        "fields": {
+            name: {"apiName": name, "label": name, "dataType": kind.capitalize(), "required": required,
+                   "createable": kind != "id"}
+            for name, kind, required, _ in fields
+        },
+    }
+    return 200, {"ETag": etag}, payload
+
+
+def _recent_route(server: "SalesforceStub", match: "re.Match", request: Dict[str, Any]) -> StubResult:
+    return 200, {}, [{**record["attributes"], "Id": record["Id"]} for record in list(server.records.values())[-200:]]
+
+
+class SalesforceStub:
+    """Rotas registráveis e registro das requisições, independente do transporte."""
+
+    def __init__(self, max_recorded_requests: int = 10000) -> None:
+        self.limits: Dict[str, Any] = json.loads(json.dumps(DEFAULT_LIMITS))
+        self.routes: List[Tuple[str, "re.Pattern", StubRoute]] = []
+        # Só as últimas requisições, para não crescer sem limite em execuções longas.
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=max_recorded_requests)
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._id_counter = 0
+        self._lock = threading.Lock()
+        # OAuth: client_id -> client_secret aceitos; tokens revogados respondem 401 INVALID_SESSION_ID.
+        self.oauth_clients: Dict[str, str] = {"stub-client": "stub-secret"}
+        self.tokens_issued = 0
+        self.revoked_tokens: Set[str] = set()
+        # Incrementar simula uma alteração de metadados na org (novo Last-Modified/ETag).
+        self.metadata_version = 1
+        self.add_route("GET", r"/services/data/[^/]+/limits/?", _limits_route)
+        self.add_route("GET", r"/services/data/[^/]+/(tooling/)?sobjects/?", _sobjects_route)
+        self.add_route("GET", r"/services/data/[^/]+/recent/?", _recent_route)
+        self.add_route("GET", r"/services/data/[^/]+/sobjects/(\w+)/describe/?", _describe_route)
+        self.add_route("GET", r"/services/data/[^/]+/ui-api/object-info/(\w+)/?", _object_info_route)
+        self.add_route("GET", r"(/services/data/[^/]+)/query/?", _query_route)
+        self.add_route("POST", r"/services/data/[^/]+/composite/graph/?", _composite_graph_route)
+        self.add_route("DELETE", r"/services/data/[^/]+/composite/sobjects/?", _composite_delete_route)
+
+    def create_record(self, sobject: str, fields: Dict[str, Any]) -> str:
+        with self._lock:
+            self._id_counter += 1
+            counter = self._id_counter
+        prefix = KEY_PREFIXES.get(sobject, "a00")
+        record_id = f"{prefix}{counter:012d}AAA"
+        self.records[record_id] = {"attributes": {"type": sobject}, "Id": record_id, **fields}
+        return record_id
+
+    def add_route(self, method: str, pattern: str, handler: StubRoute) -> None:
+        # Rotas registradas depois têm prioridade (permite sobrescrever as padrões).
+        self.routes.insert(0, (method.upper(), re.compile(pattern), handler))
+
+    def resolve(self, method: str, path: str) -> Optional[Tuple[StubRoute, "re.Match"]]:
+        for route_method, pattern, handler in self.routes:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match:
+                return handler, match
+        return None
+
+    def dispatch(self, method: str, path: str, query: str, headers: Dict[str, str], raw: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = raw.decode("utf-8", errors="replace")
+
+        request = {"method": method, "path": path, "query": query, "headers": headers, "body": body}
+        if path == OAUTH_TOKEN_PATH:
+            # Login não consome DailyApiRequests.
+            with self._lock:
+                self.requests.append(request)
+            status, extra, payload = _oauth_token_route(self, None, request)
+            return status, {"Content-Type": "application/json;charset=UTF-8", **extra}, json.dumps(payload).encode("utf-8")
+
+        daily = self.limits["DailyApiRequests"]
+        with self._lock:
+            self.requests.append(request)
+            # Como a org: cada chamada consome o orçamento diário e a resposta informa o uso.
+            exhausted = daily["Remaining"] <= 0
+            if not exhausted:
+                daily["Remaining"] -= 1
+            limit_info = f"api-usage={daily['Max'] - daily['Remaining']}/{daily['Max']}"
+
+        resolved = self.resolve(method, path)
+        bearer = headers.get("authorization", "").partition(" ")[2]
+        if bearer and bearer in self.revoked_tokens:
+            status, extra, payload = 401, {}, [{"errorCode": "INVALID_SESSION_ID", "message": "Session expired or invalid"}]
+        elif exhausted:
+            status, extra, payload = 403, {}, [{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "TotalRequests Limit exceeded."}]
+        elif resolved is None:
+            status, extra, payload = 404, {}, [{"errorCode": "NOT_FOUND", "message": "The requested resource does not exist"}]
+        else:
+            handler, match = resolved
+            status, extra, payload = handler(self, match, request)
+
+        response_headers = {"Content-Type": "application/json;charset=UTF-8"} if payload is not None else {}
+        response_headers["Sforce-Limit-Info"] = limit_info
+        response_headers.update(extra)
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        return status, response_headers, data
+
+
+class SalesforceStubServer(SalesforceStub, ThreadingHTTPServer):
+    """
+    Stand-in HTTP real (loopback) com contador de conexões aceitas.
+    `handshake_delay_ms` simula o custo de TLS a cada nova conexão aceita.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, handshake_delay_ms: float = 0.0, port: int = 0) -> None:
+        SalesforceStub.__init__(self)
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", port), _StubHandler)
+        self.handshake_delay_ms = handshake_delay_ms
+        self.connections = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_request(self):
+        conn = super().get_request()
+        with self._lock:
+            self.connections += 1
+        if self.handshake_delay_ms:
+            time.sleep(self.handshake_delay_ms / 1000)
+        return conn
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: SalesforceStubServer
+
+    def _handle(self) -> None:
+        path, _, query = self.path.partition("?")
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        headers = {k.lower(): v for k, v in self.headers.items()}
+
+        status, response_headers, data = self.server.dispatch(self.command, path, query, headers, raw)
+
+        self.send_response(status)
+        for key, value in response_headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data and self.command != "HEAD":
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class SalesforceStubApp(SalesforceStub):
+    """
+    Mesmo stand-in como aplicação ASGI, para httpx.AsyncClient(transport=httpx.ASGITransport(app)).
+    `latency_ms` simula o tempo de resposta da org sem bloquear o event loop.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            return
+        raw = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            raw += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency_ms:
+                await asyncio.sleep(self.latency_ms / 1000)
+            headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+            status, response_headers, data = self.dispatch(
+                scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"), headers, raw
+            )
+        finally:
+            self.in_flight -= 1
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response_headers.items()],
+            }
+        )
+        await send({"type": "http.response.body", "body": data})
+
+
+@contextmanager
+def run_stub_server(handshake_delay_ms: float = 0.0) -> Iterator[SalesforceStubServer]:
+    server = SalesforceStubServer(handshake_delay_ms=handshake_delay_ms)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stand-in local da API REST do Salesforce.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--handshake-delay-ms", type=float, default=0.0)
+    parser.add_argument("--daily-limit", type=int, default=DEFAULT_LIMITS["DailyApiRequests"]["Max"],
+                        help="DailyApiRequests.Max simulado (cada chamada consome 1)")
+    args = parser.parse_args()
+
+    server = SalesforceStubServer(handshake_delay_ms=args.handshake_delay_ms, port=args.port)
+    server.limits["DailyApiRequests"] = {"Max": args.daily_limit, "Remaining": args.daily_limit}
+    print(f"Stand-in Salesforce em {server.base_url} (SF_API_BASE_URL)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
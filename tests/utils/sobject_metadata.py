@@ -0,0 +1,162 @@
+"""
+Metadados de sObject (describe e UI API object-info) em cache no disco, por org e versão da API.
+
+    metadata = SObjectMetadata(api_client, "v61.0", Path(".cache/sobject-metadata"), memory={})
+    metadata.form_fields("Contact")                      # [{apiName, label}] dos campos criáveis
+    metadata.picklist_values("Contact", "LeadSource")    # valores ativos da picklist
+    metadata.required_fields("Contact")                  # obrigatórios segundo a UI API
+
+Nada é baixado antes do primeiro uso de cada objeto. Com cópia em disco, a requisição vai condicional
+(If-None-Match com o ETag, If-Modified-Since com o Last-Modified gravados): um 304 reaproveita o arquivo
+sem baixar de novo o payload, que no describe do Contact passa de centenas de KB. Cada objeto é
+revalidado uma vez por sessão (`memory` é o dict da sessão). Se a org não responder, vale a cópia
+em disco mesmo sem revalidar.
+"""
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from tests.utils.filelock import FileLock
+
+METADATA_SOURCES = {
+    "describe": "sobjects/{sobject}/describe",
+    "object-info": "ui-api/object-info/{sobject}",
+}
+
+MemoryKey = Tuple[str, str, str, str]
+
+
+class MetadataError(RuntimeError):
+    """A org não devolveu o metadado e não há cópia em disco para usar no lugar."""
+
+
+@dataclass
+class MetadataStats:
+    downloaded: int = 0
+    revalidated: int = 0
+    memory: int = 0
+    stale: int = 0
+    bytes_downloaded: int = 0
+    bytes_reused: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "downloaded": self.downloaded,
+            "revalidated": self.revalidated,
+            "memory": self.memory,
+            "stale": self.stale,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_reused": self.bytes_reused,
+        }
+
+
+class SObjectMetadata:
+    def __init__(
+        self,
+        client: httpx.Client,
+        api_version: str,
+        cache_dir: Path,
+        memory: Optional[Dict[MemoryKey, Dict[str, Any]]] = None,
+        lock_timeout: float = 30.0,
+    ) -> None:
+        self.client = client
+        self.api_version = api_version
+        self.cache_dir = Path(cache_dir)
+        self.memory: Dict[MemoryKey, Dict[str, Any]] = {} if memory is None else memory
+        self.lock_timeout = lock_timeout
+        self.stats = MetadataStats()
+
+    @property
+    def org(self) -> str:
+        return self.client.base_url.host or "org"
+
+    def _path(self, source: str, sobject: str) -> Path:
+        return self.cache_dir / self.org / self.api_version / f"{sobject}.{source}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return stored if isinstance(stored, dict) and "body" in stored else None
+
+    def _write(self, path: Path, stored: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(path.with_name(f"{path.name}.lock"), timeout=self.lock_timeout):
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(stored, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+    def load(self, source: str, sobject: str) -> Dict[str, Any]:
+        """Payload de `source` ("describe" ou "object-info") para o objeto, revalidado uma vez por sessão."""
+        key = (self.org, self.api_version, source, sobject)
+        if key in self.memory:
+            self.stats.memory += 1
+            return self.memory[key]
+
+        path = self._path(source, sobject)
+        stored = self._read(path)
+        headers = {}
+        if stored and stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        if stored and stored.get("last_modified"):
+            headers["If-Modified-Since"] = stored["last_modified"]
+
+        url = f"/services/data/{self.api_version}/{METADATA_SOURCES[source].format(sobject=sobject)}"
+        try:
+            response: Optional[httpx.Response] = self.client.get(url, headers=headers)
+        except httpx.HTTPError:
+            response = None
+
+        if stored and response is not None and response.status_code == 304:
+            self.stats.revalidated += 1
+            self.stats.bytes_reused += stored.get("size", 0)
+            body = stored["body"]
+        elif response is not None and response.status_code == 200:
+            body = response.json()
+            self.stats.downloaded += 1
+            self.stats.bytes_downloaded += len(response.content)
+            self._write(path, {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "size": len(response.content),
+                "body": body,
+            })
+        elif stored:
+            self.stats.stale += 1
+            body = stored["body"]
+        else:
+            status = "sem resposta" if response is None else f"HTTP {response.status_code}"
+            raise MetadataError(f"Falha ao obter {source} de {sobject} ({status}) e não há cópia em {path}.")
+
+        self.memory[key] = body
+        return body
+
+    def describe(self, sobject: str) -> Dict[str, Any]:
+        return self.load("describe", sobject)
+
+    def object_info(self, sobject: str) -> Dict[str, Any]:
+        return self.load("object-info", sobject)
+
+    def fields(self, sobject: str) -> Dict[str, Dict[str, Any]]:
+        return {item["name"]: item for item in self.describe(sobject).get("fields", [])}
+
+    def form_fields(self, sobject: str) -> List[Dict[str, str]]:
+        """Campos criáveis no formato de extractCreateContactFields: [{apiName, label}]."""
+        return [
+            {"apiName": item["name"], "label": item.get("label", "")}
+            for item in self.describe(sobject).get("fields", [])
+            if item.get("createable")
+        ]
+
+    def picklist_values(self, sobject: str, field: str) -> List[str]:
+        entries = self.fields(sobject).get(field, {}).get("picklistValues") or []
+        return [entry["value"] for entry in entries if entry.get("active", True)]
+
+    def required_fields(self, sobject: str) -> List[str]:
+        return sorted(name for name, item in self.object_info(sobject).get("fields", {}).items() if item.get("required"))
@@ -0,0 +1,265 @@
+"""
+Throttle adaptativo guiado pelo orçamento diário da org (DailyApiRequests).
+
+O uso vem do header `Sforce-Limit-Info: api-usage=<usado>/<máximo>` de cada resposta
+e, quando o dado fica velho (ou ainda não existe), de um GET em /limits.
+
+Enquanto o uso está abaixo de `soft_limit` nada é limitado (a não ser `max_rps`, se definido).
+Entre `soft_limit` e `hard_limit` a taxa e a concorrência caem linearmente até o piso.
+A partir de `hard_limit` novas chamadas falham com ApiBudgetExhausted: a reserva que sobra
+fica para as integrações da org, em vez de a suíte estourar REQUEST_LIMIT_EXCEEDED.
+
+O tempo que cada requisição ficou esperando vai em response.extensions["throttle_wait_ms"].
+"""
+import asyncio
+import math
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+_API_USAGE = re.compile(r"(?:^|[;,\s])api-usage=(\d+)/(\d+)")
+
+
+class ApiBudgetExhausted(httpx.TransportError):
+    """Uso da API da org passou do hard_limit configurado."""
+
+
+def parse_limit_info(value: str) -> Optional[Tuple[int, int]]:
+    match = _API_USAGE.search(value or "")
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class AdaptiveThrottle:
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        max_rps: float = 0.0,
+        soft_limit: float = 0.8,
+        hard_limit: float = 0.95,
+        degraded_rps: float = 10.0,
+        refresh_interval: float = 60.0,
+        clock=time.monotonic,
+    ) -> None:
+        if not 0 < soft_limit < hard_limit <= 1:
+            raise ValueError("Use 0 < API_THROTTLE_SOFT_LIMIT < API_THROTTLE_HARD_LIMIT <= 1.")
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_rps = max_rps
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.degraded_rps = degraded_rps
+        self.refresh_interval = refresh_interval
+        self.used: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.updated_at: Optional[float] = None
+        self._clock = clock
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._refreshing = False
+        self._cond = threading.Condition()
+
+    # --- orçamento ---------------------------------------------------------
+    def update(self, used: int, limit: int) -> None:
+        if limit <= 0:
+            return
+        with self._cond:
+            self.used, self.limit = used, limit
+            self.updated_at = self._clock()
+            # A concorrência permitida pode ter mudado (para cima ou para baixo).
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: httpx.Headers) -> bool:
+        usage = parse_limit_info(headers.get("sforce-limit-info", ""))
+        if usage is None:
+            return False
+        self.update(*usage)
+        return True
+
+    def update_from_limits(self, payload: Dict[str, Any]) -> None:
+        daily = payload.get("DailyApiRequests") or {}
+        if "Max" in daily and "Remaining" in daily:
+            self.update(daily["Max"] - daily["Remaining"], daily["Max"])
+
+    def mark_exhausted(self) -> None:
+        self.update(self.limit or 1, self.limit or 1)
+
+    @property
+    def usage(self) -> Optional[float]:
+        if self.used is None or not self.limit:
+            return None
+        return self.used / self.limit
+
+    def factor(self) -> float:
+        usage = self.usage
+        if usage is None or usage < self.soft_limit:
+            return 1.0
+        return max(0.0, (self.hard_limit - usage) / (self.hard_limit - self.soft_limit))
+
+    def concurrency_limit(self) -> int:
+        return max(1, math.ceil(round(self.max_concurrency * self.factor(), 6)))
+
+    def rate(self) -> float:
+        """Requisições por segundo permitidas agora (0 = sem limite)."""
+        factor = self.factor()
+        if factor >= 1.0:
+            return self.max_rps
+        base = self.max_rps or self.degraded_rps
+        return max(base * factor, 0.2)
+
+    def check_budget(self) -> None:
+        usage = self.usage
+        if usage is not None and usage >= self.hard_limit:
+            raise ApiBudgetExhausted(
+                f"Uso da API em {self.used}/{self.limit} ({usage:.0%}), acima de "
+                f"API_THROTTLE_HARD_LIMIT={self.hard_limit:.0%}; chamadas suspensas para preservar a reserva da org."
+            )
+
+    def begin_refresh(self) -> bool:
+        """True para uma única thread quando o orçamento está velho (ela busca /limits)."""
+        with self._cond:
+            stale = self.updated_at is None or (self._clock() - self.updated_at) >= self.refresh_interval
+            if not stale or self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def end_refresh(self) -> None:
+        with self._cond:
+            self._refreshing = False
+            if self.updated_at is None:
+                # /limits indisponível: não tenta de novo a cada requisição.
+                self.updated_at = self._clock()
+
+    # --- ritmo e concorrência ----------------------------------------------
+    def reserve(self) -> float:
+        """Reserva o próximo horário livre (token bucket sem rajada) e devolve a espera em segundos."""
+        with self._cond:
+            rate = self.rate()
+            if not rate:
+                return 0.0
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / rate
+            return slot - now
+
+    def try_enter(self) -> bool:
+        with self._cond:
+            if self._in_flight >= self.concurrency_limit():
+                return False
+            self._in_flight += 1
+            return True
+
+    def enter(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.concurrency_limit():
+                self._cond.wait(timeout=1.0)
+            self._in_flight += 1
+
+    def leave(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def observe(self, response: httpx.Response) -> None:
+        self.update_from_headers(response.headers)
+        if response.status_code == 403:
+            if b"REQUEST_LIMIT_EXCEEDED" in response.read():
+                self.mark_exhausted()
+
+
+def _limits_request(request: httpx.Request, limits_path: str) -> httpx.Request:
+    headers = {"Accept": "application/json"}
+    if "authorization" in request.headers:
+        headers["Authorization"] = request.headers["authorization"]
+    return httpx.Request("GET", request.url.copy_with(path=limits_path, query=None), headers=headers)
+
+
+class ThrottleTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, throttle: AdaptiveThrottle, limits_path: str) -> None:
+        self.inner = inner
+        self.throttle = throttle
+        self.limits_path = limits_path
+
+    def _refresh(self, request: httpx.Request) -> None:
+        if request.url.path == self.limits_path or not self.throttle.begin_refresh():
+            return
+        try:
+            response = self.inner.handle_request(_limits_request(request, self.limits_path))
+            response.read()
+            if response.status_code == 200:
+                self.throttle.update_from_limits(response.json())
+            response.close()
+        except (httpx.HTTPError, ValueError):
+            pass
+        finally:
+            self.throttle.end_refresh()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._refresh(request)
+        self.throttle.check_budget()
+        start = time.perf_counter()
+        delay = self.throttle.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        self.throttle.enter()
+        waited_ms = (time.perf_counter() - start) * 1000
+        try:
+            response = self.inner.handle_request(request)
+        finally:
+            self.throttle.leave()
+        self.throttle.observe(response)
+        response.extensions["throttle_wait_ms"] = round(waited_ms, 3)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class AsyncThrottleTransport(httpx.AsyncBaseTransport):
+    """Mesmo throttle (estado compartilhado) para o async_api_client, sem bloquear o event loop."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, throttle: AdaptiveThrottle, limits_path: str) -> None:
+        self.inner = inner
+        self.throttle = throttle
+        self.limits_path = limits_path
+
+    async def _refresh(self, request: httpx.Request) -> None:
+        if request.url.path == self.limits_path or not self.throttle.begin_refresh():
+            return
+        try:
+            response = await self.inner.handle_async_request(_limits_request(request, self.limits_path))
+            await response.aread()
+            if response.status_code == 200:
+                self.throttle.update_from_limits(response.json())
+            await response.aclose()
+        except (httpx.HTTPError, ValueError):
+            pass
+        finally:
+            self.throttle.end_refresh()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._refresh(request)
+        self.throttle.check_budget()
+        start = time.perf_counter()
+        delay = self.throttle.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        while not self.throttle.try_enter():
+            await asyncio.sleep(0.01)
+        waited_ms = (time.perf_counter() - start) * 1000
+        try:
+            response = await self.inner.handle_async_request(request)
+        finally:
+            self.throttle.leave()
+        if response.status_code == 403:
+            await response.aread()
+        self.throttle.observe(response)
+        response.extensions["throttle_wait_ms"] = round(waited_ms, 3)
+        return response
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()